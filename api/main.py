@@ -593,6 +593,7 @@ def _comment_to_dict(
         "created_at": (getattr(c, "created_at", None).isoformat() if getattr(c, "created_at", None) else None),
         "likes_count": getattr(c, "likes_count", 0) or 0,
         "dislikes_count": getattr(c, "dislikes_count", 0) or 0,
+        "replies_count": getattr(c, "replies_count", 0) or 0,
         "replies": replies or [],
     }
 
@@ -642,6 +643,7 @@ async def get_document_comments(
                 Comment.created_at.label("created_at"),
                 Comment.likes_count.label("likes_count"),
                 Comment.dislikes_count.label("dislikes_count"),
+                Comment.replies_count.label("replies_count"),
             )
             .filter(Comment.target_type == "document")
             .filter(Comment.document_id == document_id)
@@ -651,7 +653,8 @@ async def get_document_comments(
             q = q.filter(Comment.page_number == page_number)
 
         top = q.order_by(Comment.created_at.desc()).offset(offset).limit(limit).all()
-        top_ids = [r.id for r in top]
+        # Only comments that actually have replies need the second query.
+        top_ids = [r.id for r in top if r.replies_count]
 
         replies_by_parent: Dict[str, List[Dict[str, Any]]] = {}
         if top_ids:
@@ -717,6 +720,7 @@ async def get_document_comments(
                     "created_at": c.created_at.isoformat() if c.created_at else None,
                     "likes_count": c.likes_count or 0,
                     "dislikes_count": c.dislikes_count or 0,
+                    "replies_count": c.replies_count or 0,
                     "replies": replies_with_avatars,
                 }
             )
@@ -758,6 +762,7 @@ async def get_image_comments(
                 Comment.created_at.label("created_at"),
                 Comment.likes_count.label("likes_count"),
                 Comment.dislikes_count.label("dislikes_count"),
+                Comment.replies_count.label("replies_count"),
             )
             .filter(Comment.target_type == "image")
             .filter(Comment.image_page_id == image_page_id)
@@ -767,7 +772,8 @@ async def get_image_comments(
             .limit(limit)
             .all()
         )
-        top_ids = [r.id for r in top]
+        # Only comments that actually have replies need the second query.
+        top_ids = [r.id for r in top if r.replies_count]
 
         replies_by_parent: Dict[str, List[Dict[str, Any]]] = {}
         if top_ids:
@@ -832,6 +838,7 @@ async def get_image_comments(
                     "created_at": c.created_at.isoformat() if c.created_at else None,
                     "likes_count": c.likes_count or 0,
                     "dislikes_count": c.dislikes_count or 0,
+                    "replies_count": c.replies_count or 0,
                     "replies": replies_with_avatars,
                 }
             )
@@ -974,6 +981,10 @@ async def post_reply(comment_id: str, req: ReplyCreateRequest, request: Request)
             ip_hash=_ip_hash(request),
         )
         db.add(r)
+        # Atomic increment in the same transaction as the insert.
+        db.query(Comment).filter(Comment.id == parent.id).update(
+            {Comment.replies_count: Comment.replies_count + 1}, synchronize_session=False
+        )
         db.flush()
         return {"reply": _comment_to_dict(c=r, avatar_url=avatar_url, replies=[])}
 
@@ -1134,6 +1145,10 @@ async def post_image_reply(image_page_id: str, comment_id: str, req: ReplyCreate
             ip_hash=_ip_hash(request),
         )
         db.add(r)
+        # Atomic increment in the same transaction as the insert.
+        db.query(Comment).filter(Comment.id == parent.id).update(
+            {Comment.replies_count: Comment.replies_count + 1}, synchronize_session=False
+        )
         db.flush()
         return {"reply": _comment_to_dict(c=r, avatar_url=avatar_url, replies=[])}
 
@@ -1174,6 +1189,10 @@ async def post_document_reply(document_id: str, comment_id: str, req: ReplyCreat
             ip_hash=_ip_hash(request),
         )
         db.add(r)
+        # Atomic increment in the same transaction as the insert.
+        db.query(Comment).filter(Comment.id == parent.id).update(
+            {Comment.replies_count: Comment.replies_count + 1}, synchronize_session=False
+        )
         db.flush()
         return {"reply": _comment_to_dict(c=r, avatar_url=avatar_url, replies=[])}
 
@@ -1863,8 +1882,6 @@ async def process_labels(
     This runs label detection on unprocessed image pages.
     Requires AWS credentials to be configured.
     """
-    from database import get_db
-    from models import ImagePage, ImageLabel
     from ocr.rekognition import RekognitionProcessor
     
     processor = RekognitionProcessor()
@@ -1875,30 +1892,13 @@ async def process_labels(
             detail="AWS Rekognition not configured. Set AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY."
         )
     
-    # Find pages without labels
-    with get_db() as db:
-        # Get pages that don't have any labels yet
-        processed_page_ids = db.query(ImageLabel.image_page_id).distinct().subquery()
-        
-        unprocessed = db.query(ImagePage.id).filter(
-            ~ImagePage.id.in_(processed_page_ids)
-        ).limit(limit).all()
-        
-        page_ids = [row[0] for row in unprocessed]
-    
-    # Process pages
-    total_labels = 0
-    processed = 0
-    
-    for page_id in page_ids:
-        labels_added = processor.process_image_page(page_id)
-        total_labels += labels_added
-        processed += 1
+    # Pages without labels, several in flight at once (bounded by REKOGNITION_MAX_TPS)
+    stats = processor.process_all_for_labels(limit=limit)
     
     return {
-        "pages_processed": processed,
-        "labels_added": total_labels,
-        "remaining": len(page_ids) - processed if len(page_ids) > processed else 0
+        "pages_processed": stats['processed'],
+        "labels_added": stats['labels_added'],
+        "remaining": stats['remaining']
     }
 
 
@@ -1955,7 +1955,9 @@ def _serve_image_by_id(page_id: str):
         image_path = Path(page.image_path)
 
     if image_path.exists():
-        # Let FileResponse infer the correct type from the file; default to png for consistency.
+        # Page images are PNG or (for newer PDF conversions) JPEG.
+        if image_path.suffix.lower() in (".jpg", ".jpeg"):
+            return FileResponse(path=image_path, media_type="image/jpeg", filename=f"{page_id}.jpg")
         return FileResponse(path=image_path, media_type="image/png", filename=f"{page_id}.png")
 
     if Config.S3_BUCKET:
@@ -2513,7 +2515,7 @@ async def search_files(
     """
     from database import get_db
     from models import Document, ImagePage, OCRText
-    from sqlalchemy import func, or_
+    from sqlalchemy import exists, func, or_
     
     try:
         with get_db() as db:
@@ -2552,11 +2554,11 @@ async def search_files(
             
             # Filter by has_text if specified
             if has_text is not None:
-                docs_with_text = db.query(OCRText.document_id).distinct().subquery()
+                has_ocr_text = exists().where(OCRText.document_id == Document.id)
                 if has_text:
-                    query = query.filter(Document.id.in_(docs_with_text))
+                    query = query.filter(has_ocr_text)
                 else:
-                    query = query.filter(~Document.id.in_(docs_with_text))
+                    query = query.filter(~has_ocr_text)
             
             # Filter by collection if specified
             if collection is not None:
@@ -3086,38 +3088,19 @@ async def process_celebrities(
     
     processor = RekognitionProcessor()
     
-    if not processor.enabled:
+    if not processor.celebrities_enabled:
         raise HTTPException(
             status_code=400,
             detail="AWS Rekognition not configured. Set AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY."
         )
     
-    # Process pages for celebrities
-    from database import get_db
-    from models import ImagePage, Celebrity
-    
-    with get_db() as db:
-        # Find pages not yet processed for celebrities
-        processed_page_ids = db.query(Celebrity.image_page_id).distinct().subquery()
-        
-        unprocessed = db.query(ImagePage.id).filter(
-            ~ImagePage.id.in_(processed_page_ids)
-        ).limit(limit).all()
-        
-        page_ids = [row[0] for row in unprocessed]
-    
-    total_celebrities = 0
-    processed = 0
-    
-    for page_id in page_ids:
-        celebrities_found = processor.process_celebrities(page_id, min_confidence)
-        total_celebrities += celebrities_found
-        processed += 1
+    # Process pages for celebrities, several in flight at once (bounded by REKOGNITION_MAX_TPS)
+    stats = processor.process_all_for_celebrities(limit=limit, min_confidence=min_confidence)
     
     return {
-        "pages_processed": processed,
-        "celebrities_found": total_celebrities,
-        "remaining": len(page_ids) - processed if len(page_ids) > processed else 0
+        "pages_processed": stats['processed'],
+        "celebrities_found": stats['celebrities_found'],
+        "remaining": stats['remaining']
     }
 
 
@@ -3131,6 +3114,35 @@ async def process_celebrities(
 _doj_ingestion_task = None
 _doj_pause_event = None
 
+# DOJ ingestion services, built on first run and reused by later runs (per ECS task).
+# TextractEngine() in particular does an STS round-trip when constructed.
+_DOJ_SERVICES: Dict[str, Any] = {}
+
+
+def _get_doj_services() -> Dict[str, Any]:
+    if not _DOJ_SERVICES:
+        from ingestion.storage import DocumentStorage
+        from ocr.processor import OCRProcessor
+        from ocr.textract import TextractEngine
+        from processing.text_processor import TextProcessor
+        from search.indexer import SearchIndexer
+
+        # Force AWS Textract for DOJ ingestion (no silent fallback to Paddle/EasyOCR).
+        textract = TextractEngine()
+        if not getattr(textract, "enabled", False):
+            raise RuntimeError(
+                "AWS Textract is not configured/enabled. "
+                "Set AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY (and AWS_DEFAULT_REGION if needed), "
+                "and ensure OCR_ENGINE=textract."
+            )
+        _DOJ_SERVICES.update(
+            storage=DocumentStorage(),
+            ocr_processor=OCRProcessor(ocr_engine=textract),
+            text_processor=TextProcessor(),
+            indexer=SearchIndexer(),
+        )
+    return _DOJ_SERVICES
+
 class DOJIngestionResponse(BaseModel):
     """Response for DOJ file ingestion."""
     status: str
@@ -3160,20 +3172,11 @@ async def ingest_doj_files(
     Note: This can take a while depending on how many files are available.
     Set background=true to run asynchronously.
     """
-    import asyncio
-    from pathlib import Path
     from ingestion.doj_crawler import DOJEpsteinCrawler
-    from ingestion.storage import DocumentStorage
-    from ingestion.pdf_converter import pdf_to_images, is_pdf
-    from ocr.processor import OCRProcessor
-    from ocr.textract import TextractEngine
-    from processing.text_processor import TextProcessor
-    from search.indexer import SearchIndexer
+    from ingestion.pdf_converter import iter_pdf_page_bytes, is_pdf
     from PIL import Image
     from database import get_db
     import asyncio as _asyncio
-    import hashlib
-    import re
     global _doj_ingestion_task
     global _doj_pause_event
 
@@ -3186,18 +3189,11 @@ async def ingest_doj_files(
         import shutil
         from pathlib import Path as _Path
 
-        storage = DocumentStorage()
-        # Force AWS Textract for DOJ ingestion (no silent fallback to Paddle/EasyOCR).
-        textract = TextractEngine()
-        if not getattr(textract, "enabled", False):
-            raise RuntimeError(
-                "AWS Textract is not configured/enabled. "
-                "Set AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY (and AWS_DEFAULT_REGION if needed), "
-                "and ensure OCR_ENGINE=textract."
-            )
-        ocr_processor = OCRProcessor(ocr_engine=textract)
-        text_processor = TextProcessor()
-        indexer = SearchIndexer()
+        services = _get_doj_services()
+        storage = services["storage"]
+        ocr_processor = services["ocr_processor"]
+        text_processor = services["text_processor"]
+        indexer = services["indexer"]
         
         temp_dir = Config.STORAGE_PATH / "doj_temp"
         temp_dir.mkdir(parents=True, exist_ok=True)
@@ -3221,32 +3217,31 @@ async def ingest_doj_files(
             # Step 1: Discover files (do NOT download everything up-front; allows pause/stop)
             logger.info("Starting DOJ file ingestion...")
             
+            # One crawler/session for discovery and downloads so the Akamai cookies and
+            # keep-alive connections obtained during discovery are reused.
             async with DOJEpsteinCrawler() as crawler:
                 files = await crawler.discover_files()
 
                 if limit is not None:
                     files = files[: max(int(limit), 0)]
             
-            if not files:
-                return {
-                    "status": "completed",
-                    "files_discovered": 0,
-                    "files_downloaded": 0,
-                    "files_processed": 0,
-                    "message": "No files discovered from DOJ website",
-                    "errors": ["No files found at justice.gov/epstein"]
-                }
+                if not files:
+                    return {
+                        "status": "completed",
+                        "files_discovered": 0,
+                        "files_downloaded": 0,
+                        "files_processed": 0,
+                        "message": "No files discovered from DOJ website",
+                        "errors": ["No files found at justice.gov/epstein"]
+                    }
             
-            # Step 2-7: Download + process each file (pauseable)
-            async with DOJEpsteinCrawler() as crawler:
+                # Step 2-7: Download + process each file (pauseable)
                 for file_info in files:
                     # Pause support (takes effect between files)
                     await _doj_pause_event.wait()
 
                     # Download (skip if already on disk)
-                    url_hash = hashlib.sha256(file_info["url"].encode("utf-8")).hexdigest()[:16]
-                    safe_basename = re.sub(r"[^\w\-_\.]", "_", file_info["filename"])
-                    download_path = temp_dir / f"{url_hash}_{safe_basename}"
+                    download_path = temp_dir / crawler.local_filename(file_info)
                     if not download_path.exists() or download_path.stat().st_size == 0:
                         ok = await crawler.fetch_file(file_info["url"], download_path)
                         if not ok:
@@ -3271,30 +3266,29 @@ async def ingest_doj_files(
                                 pass
                             continue
                     
-                        # Convert PDFs to images if needed
                         file_path = Path(file_info['local_path'])
-                        image_paths = []
                     
                         if is_pdf(file_path):
-                            logger.info(f"Converting PDF: {file_path.name}")
-                            images_dir = temp_dir / f"{doc_id}_images"
-                            image_paths = pdf_to_images(file_path, images_dir)
+                            # Render each page in memory and hand the JPEG bytes straight to storage
+                            # and Textract; no intermediate page files are written or re-read.
+                            # Textract's internal resolution is ~200 DPI; rendering at 300 only adds bytes.
+                            logger.info(f"Converting PDF and processing OCR for document {doc_id} with AWS Textract")
+                            pages_processed = 0
+                            for page_num, image_bytes, width, height in iter_pdf_page_bytes(file_path, dpi=200):
+                                page_id = storage.store_image_page(
+                                    doc_id, page_num, None, width, height, image_bytes=image_bytes
+                                )
+                                if ocr_processor.process_image_page(page_id, image_bytes=image_bytes):
+                                    pages_processed += 1
                         else:
                             # Single image file
-                            image_paths = [file_path]
-                    
-                        # Store image pages
-                        for page_num, image_path in enumerate(image_paths, start=1):
-                            img = Image.open(image_path)
+                            img = Image.open(file_path)
                             width, height = img.size
-                            
-                            page_id = storage.store_image_page(
-                                doc_id, page_num, image_path, width, height
-                            )
+                            storage.store_image_page(doc_id, 1, file_path, width, height)
                     
-                        # Process OCR using AWS Textract
-                        logger.info(f"Processing OCR for document {doc_id} with AWS Textract")
-                        pages_processed = ocr_processor.process_document(doc_id)
+                            # Process OCR using AWS Textract
+                            logger.info(f"Processing OCR for document {doc_id} with AWS Textract")
+                            pages_processed = ocr_processor.process_document(doc_id)
                     
                         # Process text (normalize, detect entities)
                         from models import OCRText
@@ -3324,14 +3318,9 @@ async def ingest_doj_files(
                         except Exception:
                             pass
                         try:
-                            # Remove temporary PDF->image conversions
-                            if "images_dir" in locals() and isinstance(images_dir, _Path):
-                                shutil.rmtree(images_dir, ignore_errors=True)
-                        except Exception:
-                            pass
-                        try:
-                            # Remove cached page images for this doc (they've already been uploaded to S3)
-                            for p in _Path(Config.IMAGES_PATH).glob(f"{doc_id}_page_*.png"):
+                            # Remove cached page images for this doc once their background uploads have finished
+                            storage.flush()
+                            for p in _Path(Config.IMAGES_PATH).glob(f"{doc_id}_page_*"):
                                 p.unlink(missing_ok=True)
                         except Exception as e:
                             logger.warning(f"Failed to cleanup local images for {doc_id}: {e}")
@@ -36,9 +36,30 @@ class Config:
     OCR_DESKEW: bool = os.getenv("OCR_DESKEW", "true").lower() == "true"
     # Comma-separated list of scales to try for OCR (e.g. "1,2")
     OCR_SCALES: list = [float(x) for x in os.getenv("OCR_SCALES", "1,2").split(",") if x.strip()]
+    # Denoising for preprocessing variants: "fast" (bilateral filter) or "high" (non-local means, much slower)
+    OCR_DENOISE_QUALITY: str = os.getenv("OCR_DENOISE_QUALITY", "fast").lower()
+    # Stop trying further variants once one yields this much text at this mean confidence (0 chars = never)
+    OCR_EARLY_EXIT_MIN_CHARS: int = int(os.getenv("OCR_EARLY_EXIT_MIN_CHARS", "200"))
+    OCR_EARLY_EXIT_MIN_CONF: float = float(os.getenv("OCR_EARLY_EXIT_MIN_CONF", "0.92"))
+    # Concurrent OCR passes per page (PaddleOCR variants, ensemble engines). Each extra concurrent
+    # PaddleOCR pass loads another model instance, so raise this on multicore CPUs, not a shared GPU.
+    OCR_VARIANT_WORKERS: int = int(os.getenv("OCR_VARIANT_WORKERS", "1"))
+    # Pages OCR'd concurrently per document by engines without local page streaming (Textract);
+    # bounded by the service's request rate limit
+    OCR_CONCURRENCY: int = int(os.getenv("OCR_CONCURRENCY", "4"))
+    # Pages decoded + preprocessed ahead of inference when OCR'ing a document (< 2 = one page at a time)
+    OCR_BATCH_SIZE: int = int(os.getenv("OCR_BATCH_SIZE", "2"))
+    # OpenCV worker threads for preprocessing kernels (0 = one per CPU). Set 1 when many pages
+    # are preprocessed concurrently, to avoid oversubscribing the cores.
+    OCV_THREADS: int = int(os.getenv("OCV_THREADS", "0"))
+    # Content-addressed cache of OCR results (image bytes + OCR settings), for re-runs over the same pages
+    OCR_CACHE: bool = os.getenv("OCR_CACHE", "false").lower() == "true"
+    OCR_CACHE_DIR: Path = BASE_DIR / os.getenv("OCR_CACHE_DIR", "./data/ocr_cache")
     
     # PaddleOCR Configuration (PP-OCRv4 models - state of the art)
     PADDLE_USE_ANGLE_CLS: bool = os.getenv("PADDLE_USE_ANGLE_CLS", "true").lower() == "true"
+    # Skip the angle classifier for the rest of a page once a probe pass shows only horizontal text
+    PADDLE_ADAPTIVE_ANGLE_CLS: bool = os.getenv("PADDLE_ADAPTIVE_ANGLE_CLS", "true").lower() == "true"
     PADDLE_DET_MODEL_DIR: str = os.getenv("PADDLE_DET_MODEL_DIR", "")  # Empty = auto-download
     PADDLE_REC_MODEL_DIR: str = os.getenv("PADDLE_REC_MODEL_DIR", "")
     PADDLE_CLS_MODEL_DIR: str = os.getenv("PADDLE_CLS_MODEL_DIR", "")
@@ -52,6 +73,14 @@ class Config:
     PADDLE_DROP_SCORE: float = float(os.getenv("PADDLE_DROP_SCORE", "0.3"))
     # Use server-grade models for better accuracy (slower but more accurate)
     PADDLE_USE_SERVER_MODEL: bool = os.getenv("PADDLE_USE_SERVER_MODEL", "false").lower() == "true"
+    # Accelerated inference: TensorRT (GPU) / MKL-DNN or the chosen HPI backend (CPU), reduced precision.
+    # Opt-in because TensorRT needs the TRT runtime and a one-time engine build.
+    PADDLE_ENABLE_HPI: bool = os.getenv("PADDLE_ENABLE_HPI", "false").lower() == "true"
+    PADDLE_PRECISION: str = os.getenv("PADDLE_PRECISION", "")  # "" = fp16 on GPU, fp32 on CPU
+    PADDLE_HPI_BACKEND: str = os.getenv("PADDLE_HPI_BACKEND", "auto")  # auto|tensorrt|openvino|onnxruntime
+    # Persistent per-GPU-arch model dirs for TensorRT runs (holds the tuned dynamic-shape ranges so
+    # later processes skip shape collection); see scripts/warmup_ocr.py
+    OCR_TRT_CACHE_DIR: Path = BASE_DIR / os.getenv("OCR_TRT_CACHE_DIR", "./data/trt_cache")
     
     # EasyOCR tuning (more aggressive defaults for low-quality scans)
     EASYOCR_TEXT_THRESHOLD: float = float(os.getenv("EASYOCR_TEXT_THRESHOLD", "0.6"))
@@ -59,8 +88,12 @@ class Config:
     EASYOCR_LINK_THRESHOLD: float = float(os.getenv("EASYOCR_LINK_THRESHOLD", "0.4"))
     EASYOCR_CANVAS_SIZE: int = int(os.getenv("EASYOCR_CANVAS_SIZE", "2560"))
     EASYOCR_MAG_RATIO: float = float(os.getenv("EASYOCR_MAG_RATIO", "2.0"))
+    # Boxes greedy-decoded below this confidence are re-decoded with beam search (0 = never)
+    EASYOCR_BEAM_THRESHOLD: float = float(os.getenv("EASYOCR_BEAM_THRESHOLD", "0.7"))
     # Tesseract tuning
     TESSERACT_PSM: str = os.getenv("TESSERACT_PSM", "6")  # 6=block of text, 11=sparse
+    # Per-call limit for the tesseract subprocess, in seconds (0 = no limit)
+    TESSERACT_TIMEOUT: int = int(os.getenv("TESSERACT_TIMEOUT", "120"))
     
     # Entity Detection
     ENABLE_NAME_DETECTION: bool = os.getenv("ENABLE_NAME_DETECTION", "true").lower() == "true"
@@ -78,6 +111,12 @@ class Config:
         "https://epstein-files.rhys-669.workers.dev"
     )
     
+    # DOJ crawler: number of file downloads kept in flight at once
+    DOJ_DOWNLOAD_CONCURRENCY: int = int(os.getenv("DOJ_DOWNLOAD_CONCURRENCY", "6"))
+    
+    # PDF rasterization: worker processes used for large PDFs (0 = one per CPU)
+    PDF_RENDER_WORKERS: int = int(os.getenv("PDF_RENDER_WORKERS", "0"))
+    
     # Logging
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
 
@@ -88,6 +127,32 @@ class Config:
     S3_FILES_PREFIX: str = os.getenv("S3_FILES_PREFIX", "files")
     S3_IMAGES_PREFIX: str = os.getenv("S3_IMAGES_PREFIX", "images")
     S3_PRESIGN_EXPIRES_SECONDS: int = int(os.getenv("S3_PRESIGN_EXPIRES_SECONDS", "3600"))
+    # Stream ingested files straight to S3 without keeping a local copy in STORAGE_PATH/IMAGES_PATH
+    # (files are fetched back on demand). Leave off for hybrid deployments that serve from local disk.
+    S3_PRIMARY_STORAGE: bool = os.getenv("S3_PRIMARY_STORAGE", "false").lower() == "true"
+    # Background threads uploading stored documents/pages to S3 during ingestion
+    S3_UPLOAD_WORKERS: int = int(os.getenv("S3_UPLOAD_WORKERS", "8"))
+    
+    # AWS Rekognition: pages in flight for bulk runs, and a client-side cap on API calls per second
+    # (kept under the account's per-API TPS quota; throttled calls are retried with backoff)
+    REKOGNITION_CONCURRENCY: int = int(os.getenv("REKOGNITION_CONCURRENCY", "8"))
+    REKOGNITION_MAX_TPS: float = float(os.getenv("REKOGNITION_MAX_TPS", "40"))
+    # Decode Textract/Rekognition JSON responses with orjson (when installed). This patches
+    # botocore's JSON parser, so it applies to every JSON-protocol client in the process.
+    AWS_ORJSON_PARSER: bool = os.getenv("AWS_ORJSON_PARSER", "false").lower() == "true"
+
+    # Celebrity recognition backend: "rekognition" (AWS) or "local" (InsightFace ArcFace embeddings
+    # matched against FACE_GALLERY_PATH; uncertain matches fall back to Rekognition when configured)
+    CELEBRITY_BACKEND: str = os.getenv("CELEBRITY_BACKEND", "rekognition").lower()
+    FACE_GALLERY_PATH: Path = BASE_DIR / os.getenv("FACE_GALLERY_PATH", "./data/face_gallery.npz")
+    FACE_MODEL: str = os.getenv("FACE_MODEL", "buffalo_l")  # InsightFace model pack
+    FACE_GPU: bool = os.getenv("FACE_GPU", "false").lower() == "true"
+    FACE_DET_SIZE: int = int(os.getenv("FACE_DET_SIZE", "640"))
+    # Faces embedded per inference call
+    FACE_BATCH_SIZE: int = int(os.getenv("FACE_BATCH_SIZE", "64"))
+    # Cosine similarity for a confident gallery match, and the lower bound of the "ask Rekognition" band
+    FACE_MATCH_THRESHOLD: float = float(os.getenv("FACE_MATCH_THRESHOLD", "0.5"))
+    FACE_FALLBACK_THRESHOLD: float = float(os.getenv("FACE_FALLBACK_THRESHOLD", "0.35"))
     
     @classmethod
     def ensure_directories(cls):
@@ -1,7 +1,8 @@
 """Database connection and session management."""
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import sessionmaker, Session
 from contextlib import contextmanager
+from typing import Dict, List
 from config import Config
 from models import Base
 import logging
@@ -15,6 +16,22 @@ engine = create_engine(
     echo=False
 )
 
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine, "connect")
+    def _sqlite_pragmas(dbapi_connection, connection_record):
+        """
+        WAL + synchronous=NORMAL: commits append to the WAL without an fsync each, and readers
+        (the API) no longer block behind an ingesting writer.
+        """
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-262144")  # 256 MiB
+        cursor.execute("PRAGMA mmap_size=1073741824")  # 1 GiB
+        cursor.execute("PRAGMA busy_timeout=5000")
+        cursor.close()
+
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -46,6 +63,27 @@ def ensure_db_indexes():
             conn.execute(text("CREATE INDEX IF NOT EXISTS idx_normalized_text ON ocr_text(normalized_text)"))
             conn.execute(text("CREATE INDEX IF NOT EXISTS idx_searchable_text ON search_index(searchable_text)"))
 
+        # Partial indexes for top-level comment listings (declared on Comment; create_all skips existing tables).
+        if dialect in ("postgresql", "sqlite"):
+            conn.execute(
+                text(
+                    "CREATE INDEX IF NOT EXISTS idx_comments_toplevel_doc "
+                    "ON comments (target_type, document_id, page_number, created_at) WHERE parent_id IS NULL"
+                )
+            )
+            conn.execute(
+                text(
+                    "CREATE INDEX IF NOT EXISTS idx_comments_toplevel_doc_all "
+                    "ON comments (target_type, document_id, created_at) WHERE parent_id IS NULL"
+                )
+            )
+            conn.execute(
+                text(
+                    "CREATE INDEX IF NOT EXISTS idx_comments_toplevel_image "
+                    "ON comments (target_type, image_page_id, created_at) WHERE parent_id IS NULL"
+                )
+            )
+
 
 def init_db():
     """Initialize database tables."""
@@ -125,6 +163,90 @@ def init_db():
     except Exception as e:
         logger.warning(f"Comments reaction columns migration skipped/failed: {e}")
     
+    # Add replies_count to comments table (backfilled once, when the column is first added)
+    try:
+        dialect = engine.dialect.name
+        with engine.begin() as conn:
+            if dialect == "sqlite":
+                cols = [r[1] for r in conn.execute(text("PRAGMA table_info(comments)")).fetchall()]
+            else:
+                cols = [
+                    r[0]
+                    for r in conn.execute(
+                        text("SELECT column_name FROM information_schema.columns WHERE table_name = 'comments'")
+                    ).fetchall()
+                ]
+            if "replies_count" not in cols:
+                conn.execute(text("ALTER TABLE comments ADD COLUMN replies_count INTEGER DEFAULT 0 NOT NULL"))
+                conn.execute(
+                    text(
+                        "UPDATE comments SET replies_count = "
+                        "(SELECT COUNT(*) FROM comments c2 WHERE c2.parent_id = comments.id) "
+                        "WHERE parent_id IS NULL"
+                    )
+                )
+    except Exception as e:
+        logger.warning(f"Comments replies_count migration skipped/failed: {e}")
+    
+    # Add content_sha256 to image_pages (filled at ingest, or lazily when Rekognition first reads a page)
+    try:
+        dialect = engine.dialect.name
+        with engine.begin() as conn:
+            if dialect == "sqlite":
+                cols = [r[1] for r in conn.execute(text("PRAGMA table_info(image_pages)")).fetchall()]
+                if "content_sha256" not in cols:
+                    conn.execute(text("ALTER TABLE image_pages ADD COLUMN content_sha256 TEXT"))
+            else:
+                conn.execute(text("ALTER TABLE image_pages ADD COLUMN IF NOT EXISTS content_sha256 VARCHAR"))
+            conn.execute(
+                text("CREATE INDEX IF NOT EXISTS idx_image_pages_content_sha256 ON image_pages(content_sha256)")
+            )
+    except Exception as e:
+        logger.warning(f"Image page content hash migration skipped/failed: {e}")
+    
+    # Add celebrity_min_confidence to image_pages (threshold a page's celebrities were stored with)
+    try:
+        dialect = engine.dialect.name
+        with engine.begin() as conn:
+            if dialect == "sqlite":
+                cols = [r[1] for r in conn.execute(text("PRAGMA table_info(image_pages)")).fetchall()]
+                if "celebrity_min_confidence" not in cols:
+                    conn.execute(text("ALTER TABLE image_pages ADD COLUMN celebrity_min_confidence REAL"))
+            else:
+                conn.execute(text(
+                    "ALTER TABLE image_pages ADD COLUMN IF NOT EXISTS celebrity_min_confidence DOUBLE PRECISION"
+                ))
+    except Exception as e:
+        logger.warning(f"Image page celebrity threshold migration skipped/failed: {e}")
+    
+    # Postgres: convert JSON columns declared as JSONType to JSONB (one-time table rewrite per column)
+    if engine.dialect.name == "postgresql":
+        try:
+            with engine.begin() as conn:
+                for table, column in (
+                    ("documents", "doc_metadata"),
+                    ("ocr_text", "word_boxes"),
+                    ("search_index", "tokens"),
+                    ("image_labels", "parent_labels"),
+                    ("image_labels", "categories"),
+                ):
+                    data_type = conn.execute(
+                        text(
+                            "SELECT data_type FROM information_schema.columns "
+                            "WHERE table_name = :table AND column_name = :column"
+                        ),
+                        {"table": table, "column": column},
+                    ).scalar()
+                    if data_type == "json":
+                        conn.execute(
+                            text(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE JSONB USING {column}::jsonb")
+                        )
+                # Containment (@>) lookups over JSONB token lists and document metadata
+                conn.execute(text("CREATE INDEX IF NOT EXISTS idx_search_tokens_gin ON search_index USING gin (tokens)"))
+                conn.execute(text("CREATE INDEX IF NOT EXISTS idx_doc_metadata_gin ON documents USING gin (doc_metadata)"))
+        except Exception as e:
+            logger.warning(f"JSONB column migration skipped/failed: {e}")
+    
     ensure_db_indexes()
     # Seed tag taxonomy if needed
     try:
@@ -189,3 +311,40 @@ def get_db_session() -> Session:
     """Get a database session (use with get_db context manager)."""
     return SessionLocal()
 
+
+
+def bulk_store(db: Session, model, rows: List[Dict], batch_size: int = 500) -> int:
+    """
+    Insert plain row dicts for ``model`` in chunks within the caller's transaction.
+
+    Runs a Core INSERT executemany per chunk: no ORM instances, unit-of-work bookkeeping or
+    per-row flushes. Rows must carry their own primary keys. A Core executemany compiles its
+    column list from the first row, so rows are grouped by key set (e.g. labels with and
+    without bbox columns).
+    """
+    table = model.__table__
+    groups: Dict[frozenset, List[Dict]] = {}
+    for row in rows:
+        groups.setdefault(frozenset(row), []).append(row)
+    for group in groups.values():
+        for start in range(0, len(group), batch_size):
+            db.execute(table.insert(), group[start:start + batch_size])
+    return len(rows)
+
+
+def insert_ignore(model):
+    """
+    INSERT for ``model`` that silently skips rows whose primary key already exists.
+
+    ON CONFLICT DO NOTHING on SQLite/Postgres (result.rowcount tells whether the row was new);
+    other dialects get a plain INSERT.
+    """
+    dialect = engine.dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy import insert
+        return insert(model)
+    return insert(model).on_conflict_do_nothing(index_elements=[c.name for c in model.__table__.primary_key])
@@ -1,18 +1,85 @@
 """Specialized crawler for Department of Justice Epstein files (justice.gov/epstein)."""
 
+import aiofiles
 import aiohttp
 import asyncio
+import functools
 import hashlib
+import json
 import logging
+import os
+import random
 import re
 from pathlib import Path
 from typing import Dict, List, Optional
 from urllib.parse import urljoin, urlparse
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
+
+from config import Config
 
 logger = logging.getLogger(__name__)
 
+# Exclusion patterns for "DOJ Disclosures" -> "Epstein Files Transparency Act" items.
+_DOJ_DISCLOSURES_RE = re.compile(r"doj disclosure|department of justice disclosure", re.IGNORECASE)
+_EFTA_SECTION_RE = re.compile(r"epstein files transparency act", re.IGNORECASE)
+_TRANSPARENCY_RE = re.compile(r"transparency act|efta", re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=4096)
+def _should_exclude_cached(section_name: str, link_text: str, href: str) -> bool:
+    # Every exclusion requires a DOJ Disclosures section, so test that first.
+    if not _DOJ_DISCLOSURES_RE.search(section_name):
+        return False
+
+    # If we're in a subsection explicitly titled "Epstein Files Transparency Act" under DOJ Disclosures,
+    # exclude everything in it.
+    if _EFTA_SECTION_RE.search(section_name):
+        return True
+
+    return "transparency-act" in href.lower() or bool(_TRANSPARENCY_RE.search(link_text))
+
+
+_DOC_EXTENSIONS = (".pdf", ".jpg", ".jpeg", ".png", ".tiff", ".tif", ".doc", ".docx")
+_NON_HTTP_PREFIXES = ("mailto:", "javascript:", "tel:")
+
+
+def _is_document_href(href: str) -> bool:
+    """Cheap pre-filter: most anchors are nav/footer links that can be rejected before any URL parsing."""
+    if not href or href[0] == "#" or href.startswith(_NON_HTTP_PREFIXES):
+        return False
+    path = href.split("?", 1)[0].split("#", 1)[0].rstrip().lower()
+    return path.endswith(_DOC_EXTENSIONS)
+
+
+# DOJ pages are Drupal and vary; any of these containers marks a titled block of links.
+_SECTION_TAGS = ("div", "section", "article")
+_SECTION_CLASS_RE = re.compile(r"(content|document|file|download|view|field|block)", re.IGNORECASE)
+_HEADING_TAGS = ("h1", "h2", "h3", "h4", "h5")
+_CONTENT_RANGE_RE = re.compile(r"bytes\s+(\d+)-\d+/(\d+|\*)", re.IGNORECASE)
+
+
+def _subtree_end(tag: Tag):
+    """First node that follows ``tag``'s subtree in document order (None at end of document)."""
+    node = tag
+    while node is not None:
+        if node.next_sibling is not None:
+            return node.next_sibling
+        node = node.parent
+    return None
+
+
+def _url_name_and_ext(url: str) -> tuple[str, str]:
+    """Return (filename, lowercase extension) of an absolute URL's path without building urlparse tuples."""
+    path = url.split("#", 1)[0].split("?", 1)[0]
+    scheme_end = path.find("://")
+    if scheme_end != -1:
+        slash = path.find("/", scheme_end + 3)
+        path = path[slash:] if slash != -1 else ""
+    name = path.rpartition("/")[2]
+    stem, dot, ext = name.rpartition(".")
+    return name, ("." + ext.lower() if dot and stem else "")
+
 
 class DOJEpsteinCrawler:
     """
@@ -23,9 +90,18 @@ class DOJEpsteinCrawler:
     - Exclude items under "DOJ Disclosures" → "Epstein Files Transparency Act"
     """
 
-    def __init__(self, base_url: str = "https://www.justice.gov/epstein"):
+    def __init__(
+        self,
+        base_url: str = "https://www.justice.gov/epstein",
+        download_concurrency: Optional[int] = None,
+    ):
         self.base_url = base_url
+        # Origin used to resolve root-relative hrefs without a urljoin per anchor.
+        parsed_base = urlparse(base_url)
+        self._base_origin = f"{parsed_base.scheme}://{parsed_base.netloc}"
         self.session: Optional[aiohttp.ClientSession] = None
+        # Downloads are RTT/bandwidth-bound; keep a handful in flight instead of one at a time.
+        self.download_concurrency = max(int(download_concurrency or Config.DOJ_DOWNLOAD_CONCURRENCY), 1)
 
         # IMPORTANT: justice.gov/epstein is protected by Akamai.
         # We reliably get an interstitial challenge with a curl-like UA, but often get
@@ -39,9 +115,19 @@ class DOJEpsteinCrawler:
 
     async def __aenter__(self):
         # Cookie jar is critical: interstitial verification sets cookies.
+        # Keep-alive connector so discovery and downloads reuse the same TLS connections.
+        connector = aiohttp.TCPConnector(
+            limit=16,
+            limit_per_host=6,
+            enable_cleanup_closed=True,
+            ttl_dns_cache=600,
+            keepalive_timeout=75,
+        )
         self.session = aiohttp.ClientSession(
             headers=self.default_headers,
             cookie_jar=aiohttp.CookieJar(),
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=None, sock_connect=15, sock_read=120),
         )
         return self
 
@@ -49,39 +135,20 @@ class DOJEpsteinCrawler:
         if self.session:
             await self.session.close()
 
+    def _resolve_url(self, href: str) -> str:
+        """Resolve an href against base_url, with fast paths for absolute and root-relative links."""
+        if href.startswith(("https://", "http://")):
+            return href
+        if href.startswith("/") and not href.startswith("//"):
+            return self._base_origin + href
+        return urljoin(self.base_url, href)
+
     def _should_exclude(self, section_name: str, link_text: str, href: str) -> bool:
         """
         Exclude items under "DOJ Disclosures" that are part of the "Epstein Files Transparency Act".
         """
-        section_lower = (section_name or "").lower()
-        link_lower = (link_text or "").lower()
-        href_lower = (href or "").lower()
-
-        is_doj_disclosures = any(
-            s in section_lower
-            for s in (
-                "doj disclosures",
-                "doj disclosure",
-                "department of justice disclosures",
-                "department of justice disclosure",
-            )
-        )
-
-        # If we're in a subsection explicitly titled "Epstein Files Transparency Act" under DOJ Disclosures,
-        # exclude everything in it.
-        if is_doj_disclosures and "epstein files transparency act" in section_lower:
-            return True
-
-        is_transparency_act = any(
-            t in link_lower
-            for t in (
-                "epstein files transparency act",
-                "transparency act",
-                "efta",
-            )
-        ) or ("transparency-act" in href_lower)
-
-        return bool(is_doj_disclosures and is_transparency_act)
+        # Anchors on a page mostly share a section, so results are memoized on the argument tuple.
+        return _should_exclude_cached(section_name or "", link_text or "", href or "")
 
     async def _fetch_html(self, url: str) -> str:
         """
@@ -149,7 +216,7 @@ class DOJEpsteinCrawler:
                 href = (a.get("href") or "").strip()
                 if not href.startswith("/epstein/"):
                     continue
-                full = urljoin(self.base_url, href)
+                full = self._resolve_url(href)
                 label = href.split("/epstein/", 1)[1].replace("-", " ").strip() or "Epstein"
                 label = " ".join(w.capitalize() for w in label.split())
                 pages.append((full, label))
@@ -161,14 +228,14 @@ class DOJEpsteinCrawler:
             found_urls: set[str] = set()
 
             def _maybe_add(href: str, link_text: str, section_name: str, description: str):
-                if not href:
+                if not _is_document_href(href):
                     return
-                full_url = urljoin(self.base_url, href)
+                full_url = self._resolve_url(href)
                 if full_url in found_urls:
                     return
 
-                ext = Path(urlparse(full_url).path).suffix.lower()
-                if ext not in [".pdf", ".jpg", ".jpeg", ".png", ".tiff", ".tif", ".doc", ".docx"]:
+                filename, ext = _url_name_and_ext(full_url)
+                if ext not in _DOC_EXTENSIONS:
                     return
 
                 if self._should_exclude(section_name, link_text, href):
@@ -178,7 +245,11 @@ class DOJEpsteinCrawler:
                 files.append(
                     {
                         "url": full_url,
-                        "filename": Path(urlparse(full_url).path).name,
+                        # IMPORTANT: many DOJ subpages reuse the same basenames (e.g. 001.pdf) in different
+                        # folders. A stable URL hash prefix avoids collisions on disk; computed once here
+                        # and reused by every downloader.
+                        "url_hash": hashlib.sha256(full_url.encode("utf-8")).hexdigest()[:16],
+                        "filename": filename,
                         "file_type": ext[1:] if ext else "unknown",
                         "section": section_name or "General",
                         "description": (description or link_text or "")[:200],
@@ -191,32 +262,38 @@ class DOJEpsteinCrawler:
                 html_content = await self._fetch_html(page_url)
                 soup = BeautifulSoup(html_content, "html.parser")
 
-                # Collect sections by containers; DOJ pages are Drupal and can vary.
-                sections = soup.find_all(
-                    ["div", "section", "article"],
-                    class_=re.compile(r"(content|document|file|download|view|field|block)", re.IGNORECASE),
-                )
-
-                # Parse within sections to capture context
-                for section in sections:
-                    subsection = ""
-                    header = section.find(["h1", "h2", "h3", "h4", "h5"])
-                    if header:
-                        subsection = header.get_text(strip=True)
-                    section_name = page_label if not subsection else f"{page_label} - {subsection}"
-
-                    for a in section.find_all("a", href=True):
-                        href = a.get("href") or ""
-                        link_text = a.get_text(strip=True) or ""
-                        parent = a.parent
-                        desc = parent.get_text(strip=True) if parent and parent.name in ["li", "p", "div"] else link_text
+                # One document-order walk: links inside a section container are attributed to the
+                # container's most recent heading, everything else to the page itself.
+                container = None
+                container_end = None
+                section_name = page_label
+                for el in soup.descendants:
+                    if container is not None and el is container_end:
+                        container = None
+                        section_name = page_label
+                    if not isinstance(el, Tag):
+                        continue
+
+                    if el.name == "a":
+                        href = el.get("href") or ""
+                        # Reject non-document links before paying for get_text() on them.
+                        if not _is_document_href(href):
+                            continue
+                        link_text = el.get_text(strip=True) or ""
+                        desc = link_text
+                        if container is not None:
+                            parent = el.parent
+                            if parent and parent.name in ["li", "p", "div"]:
+                                desc = parent.get_text(strip=True)
                         _maybe_add(href, link_text, section_name, desc)
-
-                # Also scan entire page for direct links (some pages don't wrap in consistent blocks)
-                for a in soup.find_all("a", href=True):
-                    href = a.get("href") or ""
-                    link_text = a.get_text(strip=True) or ""
-                    _maybe_add(href, link_text, page_label, link_text)
+                    elif container is None:
+                        if el.name in _SECTION_TAGS and _SECTION_CLASS_RE.search(" ".join(el.get("class") or [])):
+                            container = el
+                            container_end = _subtree_end(el)
+                    elif el.name in _HEADING_TAGS:
+                        subsection = el.get_text(strip=True)
+                        if subsection:
+                            section_name = f"{page_label} - {subsection}"
 
             logger.info(f"Discovered {len(files)} DOJ Epstein files (excluding Transparency Act)")
             return files
@@ -225,23 +302,165 @@ class DOJEpsteinCrawler:
             logger.exception(f"Error discovering files from DOJ: {e}")
             return files
 
-    async def fetch_file(self, url: str, save_path: Path) -> bool:
-        """Fetch a file and save it to disk."""
+    @staticmethod
+    def local_filename(file_info: Dict) -> str:
+        """Collision-free on-disk name for a discovered file: "<url_hash>_<sanitized basename>"."""
+        url_hash = file_info.get("url_hash") or hashlib.sha256(file_info["url"].encode("utf-8")).hexdigest()[:16]
+        safe_basename = re.sub(r"[^\w\-_\.]", "_", file_info["filename"])
+        return f"{url_hash}_{safe_basename}"
+
+    @staticmethod
+    def _meta_path(save_path: Path) -> Path:
+        """Sidecar file holding the HTTP validators of a downloaded file."""
+        return save_path.with_suffix(save_path.suffix + ".meta.json")
+
+    @staticmethod
+    def _write_meta(meta_path: Path, resp_headers, **extra) -> None:
+        """Record a response's ETag/Last-Modified (plus any extra fields) in a sidecar file."""
+        meta = {
+            "etag": resp_headers.get("ETag"),
+            "last_modified": resp_headers.get("Last-Modified"),
+            **extra,
+        }
+        try:
+            meta_path.parent.mkdir(parents=True, exist_ok=True)
+            meta_path.write_text(json.dumps(meta))
+        except OSError as e:
+            logger.debug(f"Could not write download metadata {meta_path.name}: {e}")
+
+    @staticmethod
+    def _if_range(part_meta_path: Path) -> Optional[str]:
+        """If-Range value for resuming a partial download: its strong ETag, else its Last-Modified."""
+        try:
+            meta = json.loads(part_meta_path.read_text())
+        except (OSError, ValueError):
+            return None
+        etag = meta.get("etag")
+        # Weak ETags aren't allowed in If-Range (RFC 9110 13.1.5)
+        if etag and not etag.startswith("W/"):
+            return etag
+        return meta.get("last_modified")
+
+    @staticmethod
+    def _parse_content_range(value: Optional[str]) -> tuple[Optional[int], Optional[int]]:
+        """(first byte, complete length) from a "bytes first-last/complete" Content-Range header."""
+        match = _CONTENT_RANGE_RE.match(value or "")
+        if not match:
+            return None, None
+        total = match.group(2)
+        return int(match.group(1)), (int(total) if total != "*" else None)
+
+    async def _head_content_length(self, url: str) -> Optional[int]:
+        """Return the remote Content-Length via HEAD, or None if unavailable."""
         if not self.session:
             raise RuntimeError("Session not initialized")
 
         try:
-            async with self.session.get(url, allow_redirects=True) as resp:
+            async with self.session.head(url, allow_redirects=True) as resp:
                 if resp.status != 200:
+                    return None
+                size = int(resp.headers.get("Content-Length") or 0)
+                return size or None
+        except Exception as e:
+            logger.debug(f"HEAD failed for {url}: {e}")
+            return None
+
+    async def fetch_file(self, url: str, save_path: Path, expected_size: Optional[int] = None) -> bool:
+        """
+        Fetch a file and save it to disk.
+
+        If a copy is already on disk, is the one the sidecar describes, and matches expected_size
+        (when given), the request is made conditional on the stored ETag/Last-Modified so an
+        unchanged file costs a 304, not a download.
+        """
+        if not self.session:
+            raise RuntimeError("Session not initialized")
+
+        meta_path = self._meta_path(save_path)
+        headers: Dict[str, str] = {}
+        local_size = save_path.stat().st_size if save_path.exists() else None
+        if local_size and (expected_size is None or local_size == expected_size):
+            try:
+                meta = json.loads(meta_path.read_text())
+            except (OSError, ValueError):
+                meta = {}
+            # The validators only vouch for the bytes they were recorded with
+            if meta.get("size") == local_size:
+                if meta.get("etag"):
+                    headers["If-None-Match"] = meta["etag"]
+                if meta.get("last_modified"):
+                    headers["If-Modified-Since"] = meta["last_modified"]
+
+        # Write to a sidecar ".part" file and rename on completion so a crash mid-download
+        # never leaves a truncated file that the "skip if exists" check would accept.
+        # A leftover ".part" from an interrupted run is resumed with an HTTP Range request, made
+        # conditional (If-Range) on the validators of the response that started it: if the remote
+        # file changed since, the server answers 200 with the whole new file instead of a splice.
+        part_path = save_path.with_suffix(save_path.suffix + ".part")
+        part_meta_path = self._meta_path(part_path)
+        start = part_path.stat().st_size if part_path.exists() else 0
+        if start > 0:
+            if_range = self._if_range(part_meta_path)
+            if if_range:
+                headers["Range"] = f"bytes={start}-"
+                headers["If-Range"] = if_range
+            else:
+                # Nothing to tell a changed file from the one we started; don't splice blindly
+                start = 0
+
+        try:
+            async with self.session.get(url, allow_redirects=True, headers=headers) as resp:
+                if resp.status == 304:
+                    logger.debug(f"{save_path.name} is already current (304)")
+                    return True
+
+                if resp.status == 416:
+                    # Partial file doesn't fit the remote object (changed or already complete); start over next time.
+                    logger.warning(f"Range not satisfiable for {url}; discarding partial download")
+                    part_path.unlink(missing_ok=True)
+                    part_meta_path.unlink(missing_ok=True)
+                    return False
+
+                if resp.status not in (200, 206):
                     logger.warning(f"Failed to fetch {url}: status {resp.status}")
                     return False
 
+                # 206 -> append to the partial file, but only if it continues exactly where ours
+                # stops; a full 200 means the file changed (If-Range failed) or the server ignored
+                # the Range header, so truncate and restart from byte 0.
+                if resp.status == 206:
+                    range_start, expected_total = self._parse_content_range(resp.headers.get("Content-Range"))
+                    if start == 0 or range_start != start:
+                        logger.warning(
+                            f"Unexpected Content-Range {resp.headers.get('Content-Range')!r} for {url} "
+                            f"(resuming from {start}); discarding partial download"
+                        )
+                        part_path.unlink(missing_ok=True)
+                        part_meta_path.unlink(missing_ok=True)
+                        return False
+                    mode = "ab"
+                    logger.info(f"Resuming {save_path.name} from {start / 1024:.1f} KB")
+                else:
+                    mode = "wb"
+                    start = 0
+                    # Content-Length counts encoded bytes, which aiohttp decompresses on the fly
+                    expected_total = None if resp.headers.get("Content-Encoding") else resp.content_length
+                    self._write_meta(part_meta_path, resp.headers)
+
                 save_path.parent.mkdir(parents=True, exist_ok=True)
-                total_size = 0
-                with open(save_path, "wb") as f:
-                    async for chunk in resp.content.iter_chunked(8192):
-                        f.write(chunk)
+                total_size = start
+                async with aiofiles.open(part_path, mode) as f:
+                    async for chunk in resp.content.iter_chunked(1 << 16):
+                        await f.write(chunk)
                         total_size += len(chunk)
+                if expected_total is not None and total_size != expected_total:
+                    # Connection dropped early; keep the ".part" so the next run resumes it
+                    logger.warning(f"Incomplete download of {url}: {total_size} of {expected_total} bytes")
+                    return False
+                os.replace(part_path, save_path)
+                part_meta_path.unlink(missing_ok=True)
+                self._write_meta(meta_path, resp.headers, size=total_size)
+
                 logger.info(f"Downloaded {save_path.name} ({total_size / 1024:.1f} KB)")
                 return True
 
@@ -261,29 +480,31 @@ class DOJEpsteinCrawler:
         if limit is not None:
             files = files[: max(int(limit), 0)]
 
-        fetched_files: List[Dict] = []
-        for file_info in files:
-            filename = file_info["filename"]
-            safe_basename = re.sub(r"[^\w\-_\.]", "_", filename)
-            # IMPORTANT: many DOJ subpages reuse the same basenames (e.g. 001.pdf) in different folders.
-            # Use a stable URL hash prefix to avoid collisions and to enable "skip if already downloaded".
-            url_hash = hashlib.sha256(file_info["url"].encode("utf-8")).hexdigest()[:16]
-            safe_filename = f"{url_hash}_{safe_basename}"
-            save_path = output_dir / safe_filename
-
-            # Skip download if already present on disk
-            if save_path.exists() and save_path.stat().st_size > 0:
-                file_info["local_path"] = str(save_path)
-                file_info["file_size"] = save_path.stat().st_size
-                fetched_files.append(file_info)
-                continue
-
-            if await self.fetch_file(file_info["url"], save_path):
-                file_info["local_path"] = str(save_path)
-                file_info["file_size"] = save_path.stat().st_size
-                fetched_files.append(file_info)
-
-            await asyncio.sleep(0.5)
+        sem = asyncio.Semaphore(self.download_concurrency)
+
+        async def _one(file_info: Dict) -> Optional[Dict]:
+            save_path = output_dir / self.local_filename(file_info)
+
+            async with sem:
+                # Skip download if the on-disk copy matches the remote size. If the server doesn't
+                # report a size, revalidate the copy with a conditional GET (a 304 when unchanged).
+                remote_size = await self._head_content_length(file_info["url"])
+                local_size = save_path.stat().st_size if save_path.exists() else 0
+                if local_size > 0 and remote_size == local_size:
+                    ok = True
+                else:
+                    ok = await self.fetch_file(file_info["url"], save_path, expected_size=remote_size)
+                    # Jittered pause so concurrent workers don't hit the origin in synchronized bursts.
+                    await asyncio.sleep(random.uniform(0.1, 0.4))
+
+            if not ok:
+                return None
+            file_info["local_path"] = str(save_path)
+            file_info["file_size"] = save_path.stat().st_size
+            return file_info
+
+        results = await asyncio.gather(*[_one(f) for f in files])
+        fetched_files: List[Dict] = [r for r in results if r is not None]
 
         logger.info(f"Successfully fetched {len(fetched_files)}/{len(files)} files")
         return fetched_files
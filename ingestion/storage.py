@@ -1,13 +1,23 @@
 """Storage management for documents and images."""
+import atexit
 import hashlib
+import os
 import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import BinaryIO, Dict, List, Optional, Tuple
 from datetime import datetime
 import shutil
+import sys
 import logging
+import threading
+import time
+from contextlib import contextmanager
+from PIL import Image
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import Session
 from config import Config
-from database import get_db
+from database import get_db, insert_ignore
 from models import Document, ImagePage
 
 logger = logging.getLogger(__name__)
@@ -15,11 +25,194 @@ logger = logging.getLogger(__name__)
 # S3 upload support
 try:
     import boto3
+    from boto3.s3.transfer import TransferConfig
+    from botocore.config import Config as BotoConfig
+    from botocore.exceptions import ClientError
     BOTO3_AVAILABLE = True
 except ImportError:
     BOTO3_AVAILABLE = False
     logger.warning("boto3 not available - S3 uploads will be skipped")
 
+_s3_client = None
+_s3_client_lock = threading.Lock()
+
+
+def _get_s3_client():
+    """Shared S3 client (thread-safe); reusing it keeps HTTPS connections alive across uploads."""
+    global _s3_client
+    if _s3_client is None:
+        with _s3_client_lock:
+            if _s3_client is None:
+                _s3_client = boto3.client(
+                    's3',
+                    region_name=Config.S3_REGION or 'us-east-1',
+                    # Default pool is 10; concurrent ingestion workers would serialize on it.
+                    config=BotoConfig(max_pool_connections=50, retries={'max_attempts': 3, 'mode': 'standard'}),
+                )
+    return _s3_client
+
+
+def _copy_large(src: Path, dst: Path, bufsize: int = 4 * 1024 * 1024):
+    """copy2 equivalent with a 4 MiB buffer (shutil's userspace loop reads 64-256 KiB at a time)."""
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        shutil.copyfileobj(fsrc, fdst, length=bufsize)
+    shutil.copystat(src, dst)
+
+
+def _fast_copy(src: Path, dst: Path):
+    """
+    Place src at dst without copying bytes when possible.
+
+    A hardlink is a metadata-only operation when both paths share a filesystem; the temp source
+    can still be deleted afterwards since dst keeps its own directory entry. Falls back to a real
+    copy across devices or where links aren't permitted.
+    """
+    try:
+        if os.path.lexists(dst):
+            os.unlink(dst)
+        os.link(src, dst)
+    except OSError:
+        if sys.platform.startswith("linux"):
+            # copy2 uses in-kernel sendfile here, which beats any userspace buffer size.
+            shutil.copy2(src, dst)
+        else:
+            _copy_large(src, dst)
+
+
+# Whole-upload attempts on top of botocore's per-request retries.
+_UPLOAD_ATTEMPTS = 3
+
+# Uploads queued per upload worker before _enqueue_upload blocks the ingesting thread; each one
+# holds a staged file on disk until it lands.
+_QUEUED_UPLOADS_PER_WORKER = 4
+
+# Stays under SQLite's 999 bound-parameter limit for the existence IN (...) query.
+_PAGE_BATCH_SIZE = 500
+
+# Large PDFs go up as parallel 8 MiB parts; small pages stay a single PUT.
+_MULTIPART_CHUNKSIZE = 8 * 1024 * 1024
+_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=_MULTIPART_CHUNKSIZE,
+    multipart_chunksize=_MULTIPART_CHUNKSIZE,
+    max_concurrency=10,
+    use_threads=True,
+) if BOTO3_AVAILABLE else None
+
+
+def stable_doc_id(source_url: str, filename: str) -> str:
+    """
+    Stable 16-hex-char document ID.
+
+    Stays SHA-256: IDs are persisted (rows, S3 keys, page IDs), so changing the hash would orphan
+    every ingested document, and hashing a ~100-byte string is nowhere near the ingestion hot path.
+    """
+    return hashlib.sha256(f"{source_url}:{filename}".encode()).hexdigest()[:16]
+
+
+def _digest_stream(fsrc: BinaryIO, fdst: Optional[BinaryIO] = None,
+                   bufsize: int = 4 * 1024 * 1024) -> Tuple[str, str, int]:
+    """
+    Hash fsrc in one pass, optionally writing the same bytes to fdst.
+
+    Returns (md5 hex, S3 ETag for an upload with _TRANSFER_CONFIG, size). Single-part uploads get
+    the hex MD5; multipart ones get MD5(concatenated part MD5s)-<parts>. bufsize must divide
+    _MULTIPART_CHUNKSIZE so part boundaries line up with reads.
+    """
+    part_digests = []
+    whole = hashlib.md5()
+    part = hashlib.md5()
+    part_len = 0
+    size = 0
+    buf = bytearray(bufsize)
+    view = memoryview(buf)
+    while True:
+        n = fsrc.readinto(buf)
+        if not n:
+            break
+        chunk = view[:n]
+        whole.update(chunk)
+        part.update(chunk)
+        if fdst is not None:
+            fdst.write(chunk)
+        part_len += n
+        size += n
+        if part_len >= _MULTIPART_CHUNKSIZE:
+            part_digests.append(part.digest())
+            part = hashlib.md5()
+            part_len = 0
+    if size < _MULTIPART_CHUNKSIZE:
+        return whole.hexdigest(), whole.hexdigest(), size
+    if part_len:
+        part_digests.append(part.digest())
+    return whole.hexdigest(), f"{hashlib.md5(b''.join(part_digests)).hexdigest()}-{len(part_digests)}", size
+
+
+def _copy_and_hash(src: Path, dst: Path) -> Tuple[str, str, int]:
+    """
+    _fast_copy that also returns _digest_stream()'s (md5, etag, size) for src.
+
+    A hardlink moves no data, so src is read once just to hash it; a real copy hashes while it
+    writes, instead of copying and then reading dst back.
+    """
+    try:
+        if os.path.lexists(dst):
+            os.unlink(dst)
+        os.link(src, dst)
+        with open(src, 'rb') as fsrc:
+            return _digest_stream(fsrc)
+    except OSError:
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            digest = _digest_stream(fsrc, fdst)
+        shutil.copystat(src, dst)
+        return digest
+
+
+def _s3_has_same_object(s3_key: str, fileobj: BinaryIO, digest: Optional[Tuple[str, str, int]] = None) -> bool:
+    """True if s3_key already holds exactly these bytes (e.g. a retry after a crash mid-ingest)."""
+    try:
+        head = _get_s3_client().head_object(Bucket=Config.S3_BUCKET, Key=s3_key)
+    except Exception:
+        return False
+    if digest is None:
+        digest = _digest_stream(fileobj)
+        fileobj.seek(0)
+    _, etag, size = digest
+    return head.get('ContentLength') == size and head.get('ETag', '').strip('"') == etag
+
+
+@contextmanager
+def _session(db: Optional[Session] = None):
+    """Use the caller's session as-is (they own the commit) or open a fresh get_db() one."""
+    if db is not None:
+        yield db
+    else:
+        with get_db() as owned:
+            yield owned
+
+
+def _run_after_commit_callbacks(session: Session):
+    session.info.pop("after_rollback_callbacks", None)
+    callbacks = session.info.pop("after_commit_callbacks", [])
+    for callback in callbacks:
+        callback()
+
+
+def _drop_after_commit_callbacks(session: Session):
+    session.info.pop("after_commit_callbacks", None)
+    for callback in session.info.pop("after_rollback_callbacks", []):
+        callback()
+
+
+def _after_commit(session: Session, callback, on_rollback=None):
+    """Run callback once the session's current transaction commits (on_rollback instead if it rolls back)."""
+    if not session.info.get("after_commit_hooked"):
+        event.listen(session, "after_commit", _run_after_commit_callbacks)
+        event.listen(session, "after_rollback", _drop_after_commit_callbacks)
+        session.info["after_commit_hooked"] = True
+    session.info.setdefault("after_commit_callbacks", []).append(callback)
+    if on_rollback is not None:
+        session.info.setdefault("after_rollback_callbacks", []).append(on_rollback)
+
 
 class DocumentStorage:
     """Manages storage of documents and images."""
@@ -29,55 +222,150 @@ class DocumentStorage:
         self.storage_dir = Config.STORAGE_PATH
         self.images_dir.mkdir(parents=True, exist_ok=True)
         self.storage_dir.mkdir(parents=True, exist_ok=True)
+        # S3-primary mode: files wait here (hardlinked when possible) until their upload lands
+        self.staging_dir = self.storage_dir / ".s3-staging"
+        # S3 uploads run in the background so ingestion doesn't wait on PUT latency.
+        self._upload_executor: Optional[ThreadPoolExecutor] = None
+        self._upload_slots: Optional[threading.BoundedSemaphore] = None
+        self._pending_uploads: List[Future] = []
+        self._uploads_lock = threading.Lock()
+        self._fetch_locks: Dict[str, threading.Lock] = {}
+        atexit.register(self.close)
+    
+    def _upload_to_s3(self, local_path: Path, s3_key: str, label: str, document_id: Optional[str] = None,
+                      staged_path: Optional[Path] = None, digest: Optional[Tuple[str, str, int]] = None):
+        """
+        Upload a stored file to S3 and free the local copy (runs on the upload executor).
+        
+        With staged_path (S3-primary mode) the bytes are read from the staging copy and nothing
+        exists at local_path unless the upload fails, in which case the staged file moves there.
+        """
+        source_path = staged_path or local_path
+        try:
+            # Opened here rather than at enqueue time, so queued uploads hold no file handles.
+            with open(source_path, 'rb') as source:
+                if _s3_has_same_object(s3_key, source, digest):
+                    logger.debug(f"{label} already in S3 with the same content, skipping upload")
+                else:
+                    for attempt in range(_UPLOAD_ATTEMPTS):
+                        try:
+                            _get_s3_client().upload_fileobj(source, Config.S3_BUCKET, s3_key, Config=_TRANSFER_CONFIG)
+                            break
+                        except ClientError as e:
+                            # botocore already retried throttling/5xx; this covers longer blips.
+                            if attempt == _UPLOAD_ATTEMPTS - 1:
+                                raise
+                            logger.debug(f"Retrying upload of {label} after error: {e}")
+                            time.sleep(2 ** attempt)
+                            source.seek(0)
+                    logger.debug(f"Uploaded {label} to S3: s3://{Config.S3_BUCKET}/{s3_key}")
+        except Exception as e:
+            logger.warning(f"Failed to upload {label} to S3: {e}")
+            if staged_path is not None:
+                try:
+                    os.replace(staged_path, local_path)
+                except OSError as move_error:
+                    logger.warning(f"Failed to keep local copy of {label}: {move_error}")
+            if document_id:
+                # The row was written assuming the upload would land; fall back to the local copy.
+                with get_db() as db:
+                    db.query(Document).filter(Document.id == document_id).update(
+                        {Document.s3_key_files: None}, synchronize_session=False
+                    )
+            return
+        # Free local disk after successful upload (ECS/Fargate ephemeral storage).
+        try:
+            source_path.unlink(missing_ok=True)
+        except Exception as e:
+            logger.warning(f"Failed to delete local cached file {source_path}: {e}")
+    
+    def _enqueue_upload(self, local_path: Path, s3_key: str, label: str, document_id: Optional[str] = None,
+                        staged_path: Optional[Path] = None,
+                        digest: Optional[Tuple[str, str, int]] = None) -> Future:
+        """
+        Schedule a background S3 upload; close() waits for everything scheduled here.
+        
+        Blocks while _QUEUED_UPLOADS_PER_WORKER uploads per worker are already pending, so a large
+        document can't queue thousands of staged files ahead of the uploaders.
+        """
+        with self._uploads_lock:
+            if self._upload_executor is None:
+                workers = max(Config.S3_UPLOAD_WORKERS, 1)
+                self._upload_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="s3-upload")
+                self._upload_slots = threading.BoundedSemaphore(workers * _QUEUED_UPLOADS_PER_WORKER)
+            executor, slots = self._upload_executor, self._upload_slots
+        slots.acquire()
+        try:
+            future = executor.submit(
+                self._upload_to_s3, local_path, s3_key, label, document_id, staged_path, digest
+            )
+        except BaseException:
+            slots.release()
+            raise
+        future.add_done_callback(lambda _: slots.release())
+        with self._uploads_lock:
+            self._pending_uploads = [f for f in self._pending_uploads if not f.done()]
+            self._pending_uploads.append(future)
+        return future
+    
+    def _staging_path(self, local_path: Path) -> Path:
+        self.staging_dir.mkdir(parents=True, exist_ok=True)
+        return self.staging_dir / local_path.name
+    
+    @staticmethod
+    def _s3_primary() -> bool:
+        return bool(Config.S3_PRIMARY_STORAGE and Config.S3_BUCKET and BOTO3_AVAILABLE)
+    
+    def flush(self):
+        """Wait for every S3 upload scheduled so far (e.g. before deleting local files or between batches)."""
+        with self._uploads_lock:
+            pending, self._pending_uploads = self._pending_uploads, []
+        for future in pending:
+            try:
+                future.result()
+            except Exception as e:
+                logger.warning(f"Background S3 upload failed: {e}")
+    
+    def close(self):
+        """Wait for outstanding S3 uploads to finish and stop the upload threads."""
+        self.flush()
+        with self._uploads_lock:
+            executor, self._upload_executor = self._upload_executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
     
     def generate_document_id(self, source_url: str, filename: str) -> str:
         """Generate a stable document ID."""
-        content = f"{source_url}:{filename}"
-        return hashlib.sha256(content.encode()).hexdigest()[:16]
+        return stable_doc_id(source_url, filename)
     
-    def store_document(self, file_info: Dict, collection: Optional[str] = None) -> Tuple[str, bool]:
+    def store_document(self, file_info: Dict, collection: Optional[str] = None,
+                       db: Optional[Session] = None) -> Tuple[str, bool]:
         """
         Store a document and create database entry.
         
         Args:
             file_info: Dict with url, filename, file_type, local_path, file_size
             collection: Optional collection name (e.g., "deleted", "main")
+            db: Optional open session to write through; the caller then owns the commit
             
         Returns:
             Tuple of (Document ID, is_new: bool)
         """
         doc_id = self.generate_document_id(file_info['url'], file_info['filename'])
         
-        # Check if document already exists
-        with get_db() as db:
-            existing = db.query(Document).filter(Document.id == doc_id).first()
-            if existing:
-                logger.debug(f"Document {doc_id} already exists, skipping storage")
-                return doc_id, False
-            
-            # Copy file to storage (local cache). In ECS/Fargate, this is ephemeral.
-            source_path = Path(file_info['local_path'])
-            stored_path = self.storage_dir / f"{doc_id}{source_path.suffix}"
-            shutil.copy2(source_path, stored_path)
-            
-            # Upload to S3 if configured (for ECS/Fargate persistence)
-            s3_key = None
-            if Config.S3_BUCKET and BOTO3_AVAILABLE:
-                try:
-                    s3_client = boto3.client('s3', region_name=Config.S3_REGION or 'us-east-1')
-                    s3_key = f"{Config.S3_FILES_PREFIX.rstrip('/')}/{doc_id}{source_path.suffix}"
-                    s3_client.upload_file(str(stored_path), Config.S3_BUCKET, s3_key)
-                    logger.info(f"Uploaded document {doc_id} to S3: s3://{Config.S3_BUCKET}/{s3_key}")
-                    # Free local disk after successful upload (we can serve from S3 in ECS).
-                    try:
-                        stored_path.unlink(missing_ok=True)
-                    except Exception as e:
-                        logger.warning(f"Failed to delete local cached document {stored_path}: {e}")
-                except Exception as e:
-                    logger.warning(f"Failed to upload document {doc_id} to S3: {e}")
-            
-            # Create document record
-            document = Document(
+        source_path = Path(file_info['local_path'])
+        stored_path = self.storage_dir / f"{doc_id}{source_path.suffix}"
+        
+        # Key is recorded up front; the upload itself happens after the commit below.
+        s3_key = None
+        if Config.S3_BUCKET and BOTO3_AVAILABLE:
+            s3_key = f"{Config.S3_FILES_PREFIX.rstrip('/')}/{doc_id}{source_path.suffix}"
+        
+        with _session(db) as session:
+            # Insert-or-ignore replaces SELECT-then-INSERT: one statement decides whether the
+            # document is new, and concurrent ingests of the same file can't collide on the PK.
+            # The md5 is filled in below, once the bytes have been read.
+            result = session.execute(insert_ignore(Document).values(
                 id=doc_id,
                 source_url=file_info['url'],
                 file_name=file_info['filename'],
@@ -86,72 +374,224 @@ class DocumentStorage:
                 doc_metadata=file_info,
                 collection=collection,
                 s3_key_files=s3_key  # Store S3 key so we can serve directly
+            ))
+            if result.rowcount == 0:
+                logger.debug(f"Document {doc_id} already exists, skipping storage")
+                return doc_id, False
+            
+            # Placed before the commit so a failed copy rolls the row back. Either way the file is
+            # read exactly once here, and that pass also yields the MD5/ETag the upload needs.
+            staged_path = None
+            if self._s3_primary():
+                # Staged (hardlinked when possible) so the caller may delete its temp file while
+                # the upload waits in the queue.
+                staged_path = self._staging_path(stored_path)
+                digest = _copy_and_hash(source_path, staged_path)
+            else:
+                # Copy file to storage (local cache). In ECS/Fargate, this is ephemeral.
+                digest = _copy_and_hash(source_path, stored_path)
+            
+            # Kept for content-level dedupe.
+            session.execute(
+                update(Document).where(Document.id == doc_id).values(doc_metadata={**file_info, "md5": digest[0]})
             )
             
-            db.add(document)
-            db.commit()
+            # Upload to S3 if configured (for ECS/Fargate persistence). Deferred until the row is
+            # committed so the write transaction never spans a network round-trip; a failed upload
+            # only clears s3_key_files, the local copy stays valid.
+            if s3_key:
+                _after_commit(
+                    session,
+                    lambda: self._enqueue_upload(
+                        stored_path, s3_key, f"document {doc_id}", document_id=doc_id, staged_path=staged_path,
+                        digest=digest,
+                    ),
+                    on_rollback=(lambda: staged_path.unlink(missing_ok=True)) if staged_path else None,
+                )
             
-            logger.info(f"Stored document {doc_id}: {file_info['filename']} (collection: {collection or 'default'})")
-            return doc_id, True
+            if db is None:
+                session.commit()
+        
+        logger.info(f"Stored document {doc_id}: {file_info['filename']} (collection: {collection or 'default'})")
+        return doc_id, True
     
     def store_image_page(self, document_id: str, page_number: int, 
-                        image_path: Path, width: int, height: int) -> str:
+                        image_path: Optional[Path], width: int, height: int,
+                        image_bytes: Optional[bytes] = None, db: Optional[Session] = None,
+                        img_format: str = "jpeg") -> str:
         """
         Store an image page and create database entry.
         
+        Either image_path (copied into the images directory) or already-encoded
+        image_bytes (written directly, no intermediate file) must be given; img_format
+        is the format the bytes were encoded in ("jpeg" or "png", as for iter_pdf_page_bytes).
+        
         Returns:
             Image page ID
         """
-        page_id = f"{document_id}_page_{page_number:04d}"
+        return self._store_pages(document_id, [{
+            "page_number": page_number,
+            "image_path": image_path,
+            "image_bytes": image_bytes,
+            "img_format": img_format,
+            "width": width,
+            "height": height,
+        }], db=db)[0]
+    
+    def store_image_pages(self, document_id: str, image_paths: List[Path],
+                          db: Optional[Session] = None) -> List[str]:
+        """
+        Store all pages of a document with batched existence queries and bulk INSERTs.
+        
+        Page numbers follow list order (1-based). Pages that already exist are skipped.
+        
+        Returns:
+            Image page IDs, in page order
+        """
+        return self._store_pages(document_id, [
+            {"page_number": n, "image_path": image_path}
+            for n, image_path in enumerate(image_paths, start=1)
+        ], db=db)
+    
+    def ingest_pdf(self, file_info: Dict, image_paths: List[Path],
+                   collection: Optional[str] = None) -> Tuple[str, bool, List[str]]:
+        """
+        Store a document and its already-rendered pages in one session with a single commit.
         
-        # Check if page already exists
+        Returns:
+            Tuple of (Document ID, is_new, image page IDs); pages are only stored for new documents
+        """
         with get_db() as db:
-            existing = db.query(ImagePage).filter(ImagePage.id == page_id).first()
-            if existing:
-                logger.debug(f"Image page {page_id} already exists, skipping")
-                return page_id
+            doc_id, is_new = self.store_document(file_info, collection, db=db)
+            if not is_new:
+                return doc_id, False, []
+            page_ids = self.store_image_pages(doc_id, image_paths, db=db)
+        return doc_id, True, page_ids
+    
+    def _store_pages(self, document_id: str, pages: List[Dict], db: Optional[Session] = None) -> List[str]:
+        """
+        Insert ImagePage rows for pages that don't exist yet, _PAGE_BATCH_SIZE at a time.
+        
+        Each page dict has page_number plus image_path or image_bytes (and their img_format);
+        width/height are read from the image header when not given.
+        """
+        page_ids = [f"{document_id}_page_{p['page_number']:04d}" for p in pages]
         
-        # Copy image to images directory
-        stored_image_path = self.images_dir / f"{page_id}.png"
-        shutil.copy2(image_path, stored_image_path)
+        for start in range(0, len(pages), _PAGE_BATCH_SIZE):
+            batch_ids = page_ids[start:start + _PAGE_BATCH_SIZE]
+            with _session(db) as session:
+                existing = {
+                    row[0] for row in session.query(ImagePage.id).filter(ImagePage.id.in_(batch_ids)).all()
+                }
+                
+                rows = []
+                for page_id, page in zip(batch_ids, pages[start:start + _PAGE_BATCH_SIZE]):
+                    if page_id in existing:
+                        logger.debug(f"Image page {page_id} already exists, skipping")
+                        continue
+                    width, height = page.get("width"), page.get("height")
+                    if width is None or height is None:
+                        # Header-only read; PIL doesn't decode pixel data to report the size.
+                        with Image.open(page["image_path"]) as img:
+                            width, height = img.size
+                    stored_image_path = self._store_page_file(
+                        session, page_id, page.get("image_path"), page.get("image_bytes"),
+                        page.get("img_format", "jpeg")
+                    )
+                    image_bytes = page.get("image_bytes")
+                    rows.append({
+                        "id": page_id,
+                        "document_id": document_id,
+                        "page_number": page["page_number"],
+                        "image_path": str(stored_image_path),
+                        "width": width,
+                        "height": height,
+                        # Cheap while the bytes are in memory; file-backed pages are hashed on first
+                        # Rekognition use instead of re-reading them here
+                        "content_sha256": hashlib.sha256(image_bytes).hexdigest() if image_bytes is not None else None,
+                    })
+                
+                if rows:
+                    # Core executemany: no ORM instances, one statement for the whole batch; a page that a
+                    # concurrent ingest inserted since the IN query is skipped rather than failing the batch.
+                    session.execute(insert_ignore(ImagePage), rows)
+                    logger.debug(f"Stored {len(rows)} image pages for {document_id}")
+        
+        return page_ids
+    
+    def _store_page_file(self, session: Session, page_id: str, image_path: Optional[Path],
+                         image_bytes: Optional[bytes] = None, img_format: str = "jpeg") -> Path:
+        """
+        Copy (or write) a page image into the images directory and upload it to S3 if configured.
+        
+        As for documents, the upload waits for `session` (which inserts the page row) to commit;
+        the uploader deletes the file it sends, so an earlier upload could outlive a rolled-back row.
+        """
+        # Copy image to images directory (keep JPEG pages as .jpg; everything else is stored as .png)
+        if image_bytes is not None:
+            suffix = ".png" if img_format.lower() == "png" else ".jpg"
+        else:
+            suffix = ".jpg" if Path(image_path).suffix.lower() in (".jpg", ".jpeg") else ".png"
+        stored_image_path = self.images_dir / f"{page_id}{suffix}"
+        s3_key = f"{Config.S3_IMAGES_PREFIX.rstrip('/')}/{page_id}{suffix}"
+        
+        if self._s3_primary():
+            # Staged for the uploader, not kept in images_dir; get_image_path() pulls the file back
+            # from S3 when something needs it.
+            staged_path = self._staging_path(stored_image_path)
+            if image_bytes is not None:
+                staged_path.write_bytes(image_bytes)
+            else:
+                _fast_copy(image_path, staged_path)
+            _after_commit(
+                session,
+                lambda: self._enqueue_upload(
+                    stored_image_path, s3_key, f"image page {page_id}", staged_path=staged_path
+                ),
+                on_rollback=lambda: staged_path.unlink(missing_ok=True),
+            )
+            return stored_image_path
+        
+        if image_bytes is not None:
+            stored_image_path.write_bytes(image_bytes)
+        else:
+            _fast_copy(image_path, stored_image_path)
         
         # Upload to S3 if configured (for ECS/Fargate persistence)
         if Config.S3_BUCKET and BOTO3_AVAILABLE:
-            try:
-                s3_client = boto3.client('s3', region_name=Config.S3_REGION or 'us-east-1')
-                s3_key = f"{Config.S3_IMAGES_PREFIX.rstrip('/')}/{page_id}.png"
-                s3_client.upload_file(str(stored_image_path), Config.S3_BUCKET, s3_key)
-                logger.debug(f"Uploaded image page {page_id} to S3: s3://{Config.S3_BUCKET}/{s3_key}")
-                # Free local disk after successful upload (ECS/Fargate ephemeral storage).
-                try:
-                    stored_image_path.unlink(missing_ok=True)
-                except Exception as e:
-                    logger.warning(f"Failed to delete local cached image {stored_image_path}: {e}")
-            except Exception as e:
-                logger.warning(f"Failed to upload image page {page_id} to S3: {e}")
+            _after_commit(session, lambda: self._enqueue_upload(stored_image_path, s3_key, f"image page {page_id}"))
         
-        # Create image page record
-        with get_db() as db:
-            image_page = ImagePage(
-                id=page_id,
-                document_id=document_id,
-                page_number=page_number,
-                image_path=str(stored_image_path),
-                width=width,
-                height=height
-            )
-            
-            db.add(image_page)
-            db.commit()
-            
-            logger.debug(f"Stored image page {page_id}")
-            return page_id
+        return stored_image_path
+    
+    def _fetch_lock(self, key: str) -> threading.Lock:
+        """Per-key lock so concurrent requests for the same missing file trigger one S3 download."""
+        with self._uploads_lock:
+            return self._fetch_locks.setdefault(key, threading.Lock())
     
     def get_image_path(self, page_id: str) -> Optional[Path]:
-        """Get the file path for an image page."""
+        """Get the file path for an image page, downloading it from S3 if the local copy is gone."""
+        # Pages are stored as images_dir/<page_id>.<jpg|png>, so a local hit needs no DB lookup.
+        for suffix in (".jpg", ".png"):
+            candidate = self.images_dir / f"{page_id}{suffix}"
+            if candidate.exists():
+                return candidate
+        
         with get_db() as db:
-            page = db.query(ImagePage).filter(ImagePage.id == page_id).first()
-            if page:
-                return Path(page.image_path)
-        return None
-
+            # Column-only Core select: no ORM instance or identity-map bookkeeping for one string.
+            path = db.execute(select(ImagePage.image_path).where(ImagePage.id == page_id)).scalar_one_or_none()
+        if not path:
+            return None
+        image_path = Path(path)
+        
+        if not image_path.exists() and Config.S3_BUCKET and BOTO3_AVAILABLE:
+            with self._fetch_lock(page_id):
+                if not image_path.exists():
+                    s3_key = f"{Config.S3_IMAGES_PREFIX.rstrip('/')}/{image_path.name}"
+                    try:
+                        image_path.parent.mkdir(parents=True, exist_ok=True)
+                        _get_s3_client().download_file(
+                            Config.S3_BUCKET, s3_key, str(image_path), Config=_TRANSFER_CONFIG
+                        )
+                    except Exception as e:
+                        logger.warning(f"Failed to fetch image page {page_id} from S3: {e}")
+        return image_path
@@ -1,12 +1,41 @@
 """Database models for OCR RAG system."""
-from sqlalchemy import Column, Integer, String, Text, Float, DateTime, JSON, Index, Boolean
+from sqlalchemy import Column, Integer, String, Text, Float, DateTime, JSON, Index, Boolean, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 from datetime import datetime
-import uuid
+import os
+import time
 
 Base = declarative_base()
 
+def _uuid7_hex() -> str:
+    """
+    Time-ordered UUIDv7 as 32 hex chars (same shape as uuid4().hex).
+
+    The leading 48-bit millisecond timestamp makes new keys append to the right edge of the
+    B-tree instead of splitting random pages.
+    """
+    ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), "big")
+    value = (ms & ((1 << 48) - 1)) << 80
+    value |= 0x7 << 76  # version
+    value |= ((rand >> 62) & 0xFFF) << 64  # rand_a
+    value |= 0b10 << 62  # RFC 4122 variant
+    value |= rand & ((1 << 62) - 1)  # rand_b
+    return f"{value:032x}"
+
+
+# JSONB on Postgres: parsed once on write (not on every read) and GIN-indexable; plain JSON elsewhere.
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+
+def _lowercase_of(column_name: str):
+    """INSERT default deriving a lowercase search column from another column of the same row."""
+    def _default(context):
+        return (context.get_current_parameters().get(column_name) or "").lower()
+    return _default
+
 
 class Document(Base):
     """Stored document metadata."""
@@ -19,7 +48,7 @@ class Document(Base):
     file_size = Column(Integer)
     page_count = Column(Integer, default=1)
     ingested_at = Column(DateTime, default=func.now())
-    doc_metadata = Column(JSON, default={})  # Renamed from 'metadata' (reserved in SQLAlchemy)
+    doc_metadata = Column(JSONType, default={})  # Renamed from 'metadata' (reserved in SQLAlchemy)
 
     # S3 acceleration fields (avoid per-open S3 head checks + enable stable caching)
     s3_key_files = Column(Text, nullable=True)  # e.g. "files/<document_id>.pdf"
@@ -48,10 +77,16 @@ class ImagePage(Base):
     height = Column(Integer)
     ocr_processed = Column(Boolean, default=False)
     ocr_processed_at = Column(DateTime)
+    # SHA-256 of the stored image file; pages with identical content reuse Rekognition results
+    content_sha256 = Column(String)
+    # min_confidence the page's celebrities were recognized with (its Celebrity rows are cut at it);
+    # set even when nothing was found, so identical pages can reuse that result too
+    celebrity_min_confidence = Column(Float)
     
     __table_args__ = (
         # Index names must be unique across the whole SQLite database (not just per-table)
         Index('idx_image_pages_document_page', 'document_id', 'page_number'),
+        Index('idx_image_pages_content_sha256', 'content_sha256'),
     )
 
 
@@ -69,7 +104,7 @@ class OCRText(Base):
     normalized_text = Column(Text, nullable=False)
     
     # Positional data
-    word_boxes = Column(JSON)  # List of {text, x, y, width, height, confidence}
+    word_boxes = Column(JSONType)  # List of {text, x, y, width, height, confidence}
     bbox_x = Column(Float)  # Overall bounding box
     bbox_y = Column(Float)
     bbox_width = Column(Float)
@@ -125,7 +160,7 @@ class SearchIndex(Base):
     
     # Searchable text (normalized, tokenized)
     searchable_text = Column(Text, nullable=False)
-    tokens = Column(JSON)  # List of tokens for fuzzy matching
+    tokens = Column(JSONType)  # List of tokens for fuzzy matching
     
     __table_args__ = ()
 
@@ -140,11 +175,11 @@ class ImageLabel(Base):
     
     # Label info
     label_name = Column(String, nullable=False)  # e.g., "Floor", "Person", "Car"
-    label_name_lower = Column(String, nullable=False, index=True)  # lowercase for search
+    label_name_lower = Column(String, nullable=False, index=True, default=_lowercase_of("label_name"))  # lowercase for search
     confidence = Column(Float, nullable=False)
     
     # Parent labels (hierarchy)
-    parent_labels = Column(JSON)  # e.g., ["Furniture", "Indoors"]
+    parent_labels = Column(JSONType)  # e.g., ["Furniture", "Indoors"]
     
     # Bounding box (if object has specific location)
     has_bbox = Column(Boolean, default=False)
@@ -154,7 +189,7 @@ class ImageLabel(Base):
     bbox_height = Column(Float)
     
     # Categories from Rekognition
-    categories = Column(JSON)  # e.g., ["Home and Garden", "Interior"]
+    categories = Column(JSONType)  # e.g., ["Home and Garden", "Interior"]
     
     detected_at = Column(DateTime, default=func.now())
     
@@ -175,7 +210,7 @@ class Celebrity(Base):
     
     # Celebrity info
     name = Column(String, nullable=False)
-    name_lower = Column(String, nullable=False, index=True)  # lowercase for search
+    name_lower = Column(String, nullable=False, index=True, default=_lowercase_of("name"))  # lowercase for search
     confidence = Column(Float, nullable=False)
     
     # Reference URLs (Wikipedia, IMDB, etc.)
@@ -243,7 +278,7 @@ class Comment(Base):
     """Anonymous comments on documents (optionally per page) or image pages, with one-level replies."""
     __tablename__ = "comments"
 
-    id = Column(String, primary_key=True, default=lambda: uuid.uuid4().hex)
+    id = Column(String, primary_key=True, default=_uuid7_hex)
     target_type = Column(String, nullable=False)  # "document" | "image"
 
     document_id = Column(String, nullable=True, index=True)
@@ -261,11 +296,26 @@ class Comment(Base):
     # Reaction counts (denormalized for fast reads)
     likes_count = Column(Integer, default=0, nullable=False)
     dislikes_count = Column(Integer, default=0, nullable=False)
+    # Replies on a top-level comment (denormalized so listings only fetch replies where they exist)
+    replies_count = Column(Integer, default=0, nullable=False)
 
     __table_args__ = (
         Index("idx_comments_target_doc", "target_type", "document_id", "page_number", "created_at"),
         Index("idx_comments_target_image", "target_type", "image_page_id", "created_at"),
         Index("idx_comments_parent", "parent_id", "created_at"),
+        # Top-level listings (parent_id IS NULL, newest first) read only these partial indexes, never replies.
+        Index(
+            "idx_comments_toplevel_doc", "target_type", "document_id", "page_number", "created_at",
+            postgresql_where=text("parent_id IS NULL"), sqlite_where=text("parent_id IS NULL"),
+        ),
+        Index(
+            "idx_comments_toplevel_doc_all", "target_type", "document_id", "created_at",
+            postgresql_where=text("parent_id IS NULL"), sqlite_where=text("parent_id IS NULL"),
+        ),
+        Index(
+            "idx_comments_toplevel_image", "target_type", "image_page_id", "created_at",
+            postgresql_where=text("parent_id IS NULL"), sqlite_where=text("parent_id IS NULL"),
+        ),
     )
 
 
@@ -273,7 +323,7 @@ class CommentReaction(Base):
     """Individual like/dislike reactions on comments (prevents duplicate reactions from same IP)."""
     __tablename__ = "comment_reactions"
 
-    id = Column(String, primary_key=True, default=lambda: uuid.uuid4().hex)
+    id = Column(String, primary_key=True, default=_uuid7_hex)
     comment_id = Column(String, nullable=False, index=True)
     reaction_type = Column(String, nullable=False)  # "like" | "dislike"
     ip_hash = Column(String, nullable=False, index=True)
@@ -9,13 +9,25 @@ All engines return word-level bounding boxes and confidence scores
 for downstream search and highlighting.
 """
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, wait
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator, List, Dict, Tuple, Optional
+import functools
+import itertools
 import logging
+import os
+import queue
+import threading
 from PIL import Image
+import cv2
 import numpy as np
 from config import Config
+from ocr import result_cache
+from ocr.result_cache import cached
 from ocr.preprocess import (
     build_ocr_variants, 
+    iter_ocr_variants, 
     enhance_for_ocr, 
     deskew_image,
     _ensure_rgb,
@@ -26,13 +38,165 @@ from ocr.preprocess import (
 logger = logging.getLogger(__name__)
 
 
+def _paddleocr_major_version() -> int:
+    try:
+        from importlib.metadata import version
+        return int(version("paddleocr").split(".")[0])
+    except Exception:
+        return 0
+
+
+def _gpu_arch() -> str:
+    """CUDA compute capability as e.g. "sm86" (TensorRT plans are only valid on the arch they were built for)."""
+    try:
+        import paddle
+        major, minor = paddle.device.cuda.get_device_capability()
+        return f"sm{major}{minor}"
+    except Exception:
+        return "gpu"
+
+
+def _horizontal_only(result: Dict) -> bool:
+    """A pass read confidently and found (almost) no taller-than-wide boxes, i.e. no rotated text."""
+    boxes = result.get('word_boxes') or []
+    if not boxes:
+        return False
+    tall = sum(1 for box in boxes if box['height'] > box['width'])
+    return tall / len(boxes) < 0.05 and result.get('confidence', 0.0) > 0.9
+
+
+def _order_variants(variants: List[OCRVariant]) -> List[OCRVariant]:
+    """Cheapest, usually-best variants first (1x before upscaled, "enhanced" leading) so early exit hits sooner."""
+    return sorted(variants, key=lambda v: (v.scale, v.name != "enhanced"))
+
+
+def _is_confident(text: str, confidence: float) -> bool:
+    """True when a pass is good enough that the remaining variants are not worth running."""
+    return (
+        Config.OCR_EARLY_EXIT_MIN_CHARS > 0
+        and len(text) >= Config.OCR_EARLY_EXIT_MIN_CHARS
+        and confidence >= Config.OCR_EARLY_EXIT_MIN_CONF
+    )
+
+
+def _score(text: str, conf: float, bias: float = 0.3) -> float:
+    """Candidate score: prefer longer text, with a boost for confidence (0-1)."""
+    return (len(text) + 1) * (bias + conf)
+
+
+class _BestTracker:
+    """Keeps the highest-scoring non-empty candidate seen across OCR passes."""
+
+    __slots__ = ("best", "score", "bias")
+
+    def __init__(self, engine: str, bias: float = 0.3):
+        self.best = {'text': '', 'word_boxes': [], 'confidence': 0.0, 'engine': engine, 'metadata': {}}
+        self.score = -1.0
+        self.bias = bias
+
+    def offer(self, result: Dict, conf: Optional[float] = None) -> bool:
+        """Keep `result` if it beats the current best; `conf` overrides result['confidence'] (0-1) for scoring."""
+        text = result['text']
+        if not text:
+            return False
+        score = _score(text, result['confidence'] if conf is None else conf, self.bias)
+        if score <= self.score:
+            return False
+        self.score = score
+        self.best = result
+        return True
+
+
+def _imap_unordered(fn: Callable, items: Iterable, workers: int) -> Iterator[Tuple]:
+    """
+    Yield (item, fn(item)) pairs, running up to `workers` calls concurrently (completion order).
+
+    The inference backends release the GIL, so threads overlap real work. Breaking out of the
+    loop cancels calls that haven't started yet. workers <= 1 runs inline, in order.
+    """
+    items = list(items)
+    workers = min(workers, len(items))
+    if workers <= 1:
+        for item in items:
+            yield item, fn(item)
+        return
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ocr")
+    futures = {executor.submit(fn, item): item for item in items}
+    try:
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def _prefetch(fn: Callable, items: Iterable, depth: int) -> Iterator[Tuple[object, Future]]:
+    """
+    Yield (item, future of fn(item)) in order, keeping up to `depth` calls running ahead on
+    background threads, so page decode/preprocessing overlaps inference on the previous page.
+    
+    Threads rather than processes: OpenCV releases the GIL in its kernels, and threads hand
+    the (large) variant arrays over without pickling or shared-memory copies.
+    """
+    workers = max(1, min(depth - 1, (os.cpu_count() or 2) // 2))
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ocr-prefetch")
+    it = iter(items)
+    pending = deque()
+    try:
+        for item in it:
+            pending.append((item, executor.submit(fn, item)))
+            if len(pending) >= depth:
+                break
+        while pending:
+            item, future = pending.popleft()
+            for nxt in it:
+                pending.append((nxt, executor.submit(fn, nxt)))
+                break
+            yield item, future
+    finally:
+        for _, future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def quad_array(word_box: Dict) -> Optional[np.ndarray]:
+    """A word box's stored 'quad' as a 4x2 float32 array of (x, y) corners (None if it has none)."""
+    quad = word_box.get('quad')
+    if quad is None:
+        return None
+    return np.asarray(quad, dtype=np.float32).reshape(4, 2)
+
+
+def _load_rgb(image_path: Path) -> np.ndarray:
+    """
+    Decode an image file to an RGB array (done once per page, shared across engines).
+    
+    OpenCV decodes straight to BGR in one pass (libjpeg-turbo/libpng), and the RGB
+    result is a channel-reversed view of it, so PaddleOCR's BGR view of an unmodified
+    variant is the decoded buffer itself. Formats OpenCV can't read go through PIL.
+    """
+    raw = np.fromfile(str(image_path), dtype=np.uint8)
+    # Ignore EXIF orientation, as PIL does, so boxes stay in stored-pixel coordinates.
+    bgr = cv2.imdecode(raw, cv2.IMREAD_COLOR | cv2.IMREAD_IGNORE_ORIENTATION)
+    if bgr is not None:
+        return bgr[..., ::-1]
+    with Image.open(image_path) as image:
+        return np.array(image.convert("RGB"))
+
+
 class OCREngine:
     """Base OCR engine interface."""
     
-    def extract_text(self, image_path: Path) -> Dict:
+    def extract_text(self, image_path: Path, base_img: Optional[np.ndarray] = None,
+                     variants: Optional[List[OCRVariant]] = None) -> Dict:
         """
         Extract text from image with bounding boxes.
         
+        `base_img` is the already-decoded RGB page, when the caller has one; engines
+        decode `image_path` themselves otherwise. `variants` are already-built
+        preprocessing variants (build_ocr_variants output) shared by several engines.
+        
         Returns:
             {
                 'text': str,
@@ -43,6 +207,54 @@ class OCREngine:
             }
         """
         raise NotImplementedError
+    
+    def extract_text_batch(self, image_paths: List[Path]) -> List[Dict]:
+        """Extract text from several pages; same result shape as extract_text, in input order."""
+        return [result for _, result in self.iter_extract_text(image_paths)]
+    
+    def iter_extract_text(self, image_paths: Iterable[Path]) -> Iterator[Tuple[Path, Dict]]:
+        """
+        Yield (image_path, result) per page, in order.
+        
+        Up to OCR_BATCH_SIZE upcoming pages are decoded (and preprocessed, where the
+        engine supports it) on background threads while the current page runs, so
+        inference never waits on OpenCV.
+        """
+        image_paths = list(image_paths)
+        if len(image_paths) < 2 or Config.OCR_BATCH_SIZE < 2:
+            for image_path in image_paths:
+                yield image_path, self.extract_text(image_path)
+            return
+        # Cache hits are answered directly; only misses are prefetched and run.
+        lookups = [result_cache.lookup(self, image_path) for image_path in image_paths]
+        misses = _prefetch(
+            self._prepare_page,
+            [image_path for image_path, (_, hit) in zip(image_paths, lookups) if hit is None],
+            Config.OCR_BATCH_SIZE,
+        )
+        for image_path, (key, hit) in zip(image_paths, lookups):
+            if hit is not None:
+                yield image_path, hit
+                continue
+            _, future = next(misses)
+            try:
+                prepared = future.result()
+            except Exception as e:
+                # Let the scalar path decode again and report the error in its usual shape.
+                logger.warning(f"Prefetch failed for {image_path}: {e}")
+                yield image_path, self.extract_text(image_path)
+                continue
+            result = self._extract_prepared(image_path, prepared)
+            result_cache.remember(key, result)
+            yield image_path, result
+    
+    def _prepare_page(self, image_path: Path):
+        """CPU-side work for one page that can run ahead of inference (decode by default)."""
+        return _load_rgb(image_path)
+    
+    def _extract_prepared(self, image_path: Path, prepared) -> Dict:
+        """Run OCR on the output of _prepare_page."""
+        return self.extract_text(image_path, base_img=prepared)
 
 
 class PaddleOCREngine(OCREngine):
@@ -58,6 +270,16 @@ class PaddleOCREngine(OCREngine):
     Best for: Maximum accuracy on scanned documents, forms, mixed layouts
     """
     
+    # Loaded models shared process-wide, keyed on (lang, use_gpu, use_angle_cls)
+    _models: Dict[Tuple, object] = {}
+    _models_lock = threading.Lock()
+    # Idle instances per key for concurrent passes (a PaddleOCR instance isn't thread-safe)
+    _idle_models: Dict[Tuple, "queue.LifoQueue"] = {}
+    # Set once if the installed PaddleOCR can't take a strided (channel-reversed) array view
+    _needs_contig = False
+    # Full det+rec passes are the expensive part; cap the variants tried per page
+    max_variants = 6
+    
     def __init__(self, 
                  languages: List[str] = None,
                  use_gpu: bool = False,
@@ -71,39 +293,129 @@ class PaddleOCREngine(OCREngine):
     def ocr(self):
         """Lazy load PaddleOCR instance."""
         if self._ocr is None:
-            try:
-                from paddleocr import PaddleOCR
-                
-                # Map language codes
-                lang = self._map_language(self.languages[0] if self.languages else 'en')
-                
-                logger.info(f"Initializing PaddleOCR with lang={lang}, GPU={self.use_gpu}, angle_cls={self.use_angle_cls}")
-                
-                # Initialize with accuracy-focused parameters
-                self._ocr = PaddleOCR(
-                    use_angle_cls=self.use_angle_cls,
-                    lang=lang,
-                    use_gpu=self.use_gpu,
-                    show_log=False,
-                    # Detection parameters for better accuracy
-                    det_db_thresh=Config.PADDLE_DET_DB_THRESH,
-                    det_db_box_thresh=Config.PADDLE_DET_DB_BOX_THRESH,
-                    det_db_unclip_ratio=Config.PADDLE_DET_DB_UNCLIP_RATIO,
-                    det_limit_side_len=Config.PADDLE_DET_LIMIT_SIDE_LEN,
-                    # Recognition parameters
-                    rec_batch_num=Config.PADDLE_REC_BATCH_NUM,
-                    drop_score=Config.PADDLE_DROP_SCORE,
-                    # Use PP-OCRv4 models (best accuracy)
-                    ocr_version='PP-OCRv4',
-                )
-                
-            except ImportError:
-                raise ImportError(
-                    "PaddleOCR not installed. Install with: "
-                    "pip install paddlepaddle paddleocr"
-                )
+            key = self._model_key()
+            with PaddleOCREngine._models_lock:
+                if key not in PaddleOCREngine._models:
+                    PaddleOCREngine._models[key] = self._load_model(key[0])
+                self._ocr = PaddleOCREngine._models[key]
         return self._ocr
     
+    def _model_key(self) -> Tuple:
+        # Map language codes
+        lang = self._map_language(self.languages[0] if self.languages else 'en')
+        return (lang, self.use_gpu, self.use_angle_cls)
+    
+    @contextmanager
+    def _checkout(self):
+        """Borrow a PaddleOCR instance exclusively; extra ones load only under concurrent use."""
+        primary = self.ocr
+        key = self._model_key()
+        with PaddleOCREngine._models_lock:
+            idle = PaddleOCREngine._idle_models.get(key)
+            if idle is None:
+                idle = PaddleOCREngine._idle_models[key] = queue.LifoQueue()
+                idle.put(primary)
+        try:
+            model = idle.get_nowait()
+        except queue.Empty:
+            logger.info(f"Loading additional PaddleOCR instance for concurrent passes ({key})")
+            model = self._load_model(key[0])
+        try:
+            yield model
+        finally:
+            idle.put(model)
+    
+    def _load_model(self, lang: str):
+        """Build a PaddleOCR instance (multi-second model load; callers cache it)."""
+        try:
+            from paddleocr import PaddleOCR
+            
+            accel = self._acceleration_kwargs()
+            logger.info(
+                f"Initializing PaddleOCR with lang={lang}, GPU={self.use_gpu}, "
+                f"angle_cls={self.use_angle_cls}, acceleration={accel or 'off'}"
+            )
+            
+            # Initialize with accuracy-focused parameters
+            params = dict(
+                use_angle_cls=self.use_angle_cls,
+                lang=lang,
+                use_gpu=self.use_gpu,
+                show_log=False,
+                # Detection parameters for better accuracy
+                det_db_thresh=Config.PADDLE_DET_DB_THRESH,
+                det_db_box_thresh=Config.PADDLE_DET_DB_BOX_THRESH,
+                det_db_unclip_ratio=Config.PADDLE_DET_DB_UNCLIP_RATIO,
+                det_limit_side_len=Config.PADDLE_DET_LIMIT_SIDE_LEN,
+                # Recognition parameters
+                rec_batch_num=Config.PADDLE_REC_BATCH_NUM,
+                drop_score=Config.PADDLE_DROP_SCORE,
+                # Use PP-OCRv4 models (best accuracy)
+                ocr_version='PP-OCRv4',
+                **self._model_dir_kwargs(lang, accel),
+            )
+            try:
+                return PaddleOCR(**params, **accel)
+            except TypeError as e:
+                if not accel:
+                    raise
+                # Installed PaddleOCR doesn't know these options; run un-accelerated.
+                logger.warning(f"PaddleOCR acceleration options rejected ({e}); falling back to defaults")
+                return PaddleOCR(**params)
+            
+        except ImportError:
+            raise ImportError(
+                "PaddleOCR not installed. Install with: "
+                "pip install paddlepaddle paddleocr"
+            )
+    
+    def _acceleration_kwargs(self) -> Dict:
+        """Inference-backend options for PaddleOCR(...), per installed major version."""
+        if not Config.PADDLE_ENABLE_HPI:
+            return {}
+        backend = (Config.PADDLE_HPI_BACKEND or "auto").lower()
+        # FP16 only pays off (and is only supported) on GPU.
+        precision = Config.PADDLE_PRECISION or ("fp16" if self.use_gpu else "fp32")
+        if _paddleocr_major_version() >= 3:
+            kwargs = {"enable_hpi": True, "precision": precision}
+            if backend != "auto":
+                kwargs["hpi_config"] = {"backend": backend}
+            elif not self.use_gpu:
+                # OpenVINO is the fastest HPI backend on Intel CPUs.
+                kwargs["hpi_config"] = {"backend": "openvino"}
+            return kwargs
+        # PaddleOCR 2.x: TensorRT subgraphs on GPU, MKL-DNN kernels + all cores on CPU.
+        kwargs = {"precision": precision}
+        if self.use_gpu:
+            kwargs["use_tensorrt"] = backend in ("auto", "tensorrt")
+        else:
+            kwargs["enable_mkldnn"] = True
+            kwargs["cpu_threads"] = os.cpu_count() or 1
+        return kwargs
+    
+    def _model_dir_kwargs(self, lang: str, accel: Dict) -> Dict:
+        """
+        det/rec/cls model dirs: the configured ones, else (TensorRT runs) per-arch dirs under
+        OCR_TRT_CACHE_DIR.
+        
+        PaddleOCR 2.x downloads missing models into these dirs and writes each model's
+        TensorRT dynamic-shape file next to it. Keeping them on a persistent, per-arch path
+        means only the first process on a given GPU type pays the shape-collection run.
+        """
+        dirs = {
+            'det_model_dir': Config.PADDLE_DET_MODEL_DIR,
+            'rec_model_dir': Config.PADDLE_REC_MODEL_DIR,
+            'cls_model_dir': Config.PADDLE_CLS_MODEL_DIR,
+        }
+        if accel.get('use_tensorrt'):
+            cache = Config.OCR_TRT_CACHE_DIR / f"{_gpu_arch()}_{accel.get('precision', 'fp32')}"
+            for key, value in dirs.items():
+                if not value:
+                    model_dir = cache / f"{key.split('_')[0]}_{lang}"
+                    model_dir.mkdir(parents=True, exist_ok=True)
+                    dirs[key] = str(model_dir)
+        return {key: value for key, value in dirs.items() if value}
+    
     def _map_language(self, lang: str) -> str:
         """Map language codes to PaddleOCR format."""
         # PaddleOCR uses specific language codes
@@ -135,7 +447,9 @@ class PaddleOCREngine(OCREngine):
         }
         return lang_map.get(lang.lower(), 'en')
     
-    def extract_text(self, image_path: Path) -> Dict:
+    @cached
+    def extract_text(self, image_path: Path, base_img: Optional[np.ndarray] = None,
+                     variants: Optional[List[OCRVariant]] = None) -> Dict:
         """
         Extract text using PaddleOCR with multi-pass preprocessing.
         
@@ -143,58 +457,13 @@ class PaddleOCREngine(OCREngine):
         to maximize text detection accuracy.
         """
         try:
+            if variants is not None:
+                # build_ocr_variants appends in a fixed order, so a prefix is what max_variants would give
+                return self._extract_prepared(image_path, variants[:self.max_variants])
             # Read and prepare image
-            image = Image.open(image_path).convert("RGB")
-            base_img = np.array(image)
-            
-            # Build preprocessing variants if enabled
-            if Config.OCR_PREPROCESS:
-                variants = build_ocr_variants(
-                    base_img, 
-                    scales=Config.OCR_SCALES,
-                    deskew=Config.OCR_DESKEW,
-                    max_variants=6
-                )
-            else:
-                # Just use original and enhanced
-                enhanced = enhance_for_ocr(base_img)
-                variants = [
-                    OCRVariant(name="original", image=base_img, scale=1.0),
-                    OCRVariant(name="enhanced", image=enhanced, scale=1.0),
-                ]
-            
-            best = {
-                'text': '',
-                'word_boxes': [],
-                'confidence': 0.0,
-                'engine': 'paddleocr',
-                'metadata': {}
-            }
-            best_score = -1.0
-            
-            # Try each variant
-            for v in variants:
-                try:
-                    result = self._run_ocr_pass(v.image, v.scale, v.name)
-                    
-                    # Score: prefer longer text with higher confidence
-                    text_len = len(result.get('text', ''))
-                    conf = result.get('confidence', 0.0)
-                    score = (text_len + 1) * (0.3 + conf)
-                    
-                    if text_len > 0 and score > best_score:
-                        best_score = score
-                        best = result
-                        best['metadata']['variant'] = v.name
-                        best['metadata']['scale'] = v.scale
-                        if v.rotation_angle != 0:
-                            best['metadata']['deskew_angle'] = v.rotation_angle
-                            
-                except Exception as e:
-                    logger.warning(f"PaddleOCR pass failed for variant {v.name}: {e}")
-                    continue
-            
-            return best
+            if base_img is None:
+                base_img = _load_rgb(image_path)
+            return self._extract_prepared(image_path, self._build_variants(base_img))
             
         except Exception as e:
             logger.exception(f"Error in PaddleOCR extraction for {image_path}: {e}")
@@ -206,57 +475,126 @@ class PaddleOCREngine(OCREngine):
                 'metadata': {'error': str(e)}
             }
     
-    def _run_ocr_pass(self, img: np.ndarray, scale: float, variant_name: str) -> Dict:
-        """Run a single OCR pass on an image."""
+    def _build_variants(self, base_img: np.ndarray) -> List[OCRVariant]:
+        # Build preprocessing variants if enabled
+        if Config.OCR_PREPROCESS:
+            return build_ocr_variants(
+                base_img, 
+                scales=Config.OCR_SCALES,
+                deskew=Config.OCR_DESKEW,
+                max_variants=self.max_variants,
+                denoise_quality=Config.OCR_DENOISE_QUALITY
+            )
+        # Just use original and enhanced
+        enhanced = enhance_for_ocr(base_img, denoise_quality=Config.OCR_DENOISE_QUALITY)
+        return [
+            OCRVariant(name="original", image=base_img, scale=1.0),
+            OCRVariant(name="enhanced", image=enhanced, scale=1.0),
+        ]
+    
+    def _prepare_page(self, image_path: Path) -> List[OCRVariant]:
+        # Preprocessing (denoise, CLAHE, deskew, upscaling) is the expensive CPU part; run it ahead too.
+        return self._build_variants(_load_rgb(image_path))
+    
+    def _extract_prepared(self, image_path: Path, variants: List[OCRVariant]) -> Dict:
+        """Score every variant pass and keep the best one."""
+        tracker = _BestTracker('paddleocr')
+        ordered = _order_variants(variants)
+        use_cls = self.use_angle_cls
+        
+        def _try_pass(v: OCRVariant) -> Optional[Dict]:
+            try:
+                return self._run_ocr_pass(v.image, v.scale, v.name, cls=use_cls)
+            except Exception as e:
+                logger.warning(f"PaddleOCR pass failed for variant {v.name}: {e}")
+                return None
+        
+        def _passes():
+            nonlocal use_cls
+            rest = ordered
+            if use_cls and Config.PADDLE_ADAPTIVE_ANGLE_CLS and ordered:
+                # Probe the first variant without the angle classifier; clean horizontal pages
+                # never need it, so the remaining variants skip it as well.
+                use_cls = False
+                probe = _try_pass(ordered[0])
+                if probe is not None and _horizontal_only(probe):
+                    yield ordered[0], probe
+                    rest = ordered[1:]
+                else:
+                    use_cls = True
+            # Try each variant (concurrently when OCR_VARIANT_WORKERS > 1)
+            yield from _imap_unordered(_try_pass, rest, Config.OCR_VARIANT_WORKERS)
+        
+        for v, result in _passes():
+            if result is None:
+                continue
+            
+            if tracker.offer(result):
+                result['metadata']['variant'] = v.name
+                result['metadata']['scale'] = v.scale
+                if v.rotation_angle != 0:
+                    result['metadata']['deskew_angle'] = v.rotation_angle
+            
+            if _is_confident(result['text'], result['confidence']):
+                break
+        
+        return tracker.best
+    
+    def _run_ocr_pass(self, img: np.ndarray, scale: float, variant_name: str,
+                      cls: Optional[bool] = None) -> Dict:
+        """Run a single OCR pass on an image (`cls` overrides use_angle_cls for this pass)."""
+        if cls is None:
+            cls = self.use_angle_cls
         # PaddleOCR expects BGR or path
         if img.ndim == 3 and img.shape[2] == 3:
-            # Convert RGB to BGR for PaddleOCR
-            import cv2
-            img_bgr = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
+            # Channel-reversed view instead of a cvtColor copy; PaddleOCR copies the page itself.
+            img_bgr = img[..., ::-1]
+            if PaddleOCREngine._needs_contig:
+                img_bgr = np.ascontiguousarray(img_bgr)
         else:
             img_bgr = img
         
         # Run OCR
-        results = self.ocr.ocr(img_bgr, cls=self.use_angle_cls)
+        with self._checkout() as ocr:
+            try:
+                results = ocr.ocr(img_bgr, cls=cls)
+            except Exception:
+                if img_bgr.flags.c_contiguous:
+                    raise
+                # This PaddleOCR/OpenCV build rejects negative-stride views; copy from now on.
+                logger.info("PaddleOCR needs contiguous input; disabling zero-copy BGR view")
+                PaddleOCREngine._needs_contig = True
+                results = ocr.ocr(np.ascontiguousarray(img_bgr), cls=cls)
         
         if not results or not results[0]:
             return {'text': '', 'word_boxes': [], 'confidence': 0.0, 'engine': 'paddleocr'}
         
-        # Parse results
-        word_boxes = []
-        texts = []
-        confidences = []
+        # Parse results: one array op per page instead of per-line min/max over point lists
+        lines = results[0]
+        texts = [line[1][0] for line in lines]
+        confidences = [float(line[1][1]) for line in lines]
+        inv_scale = 1.0 / float(scale)
+        quads = np.asarray([line[0] for line in lines], dtype=np.float64) * inv_scale  # N x 4 x [x, y]
+        mins = quads.min(axis=1)
+        sizes = quads.max(axis=1) - mins
         
-        for line in results[0]:
-            bbox_points = line[0]  # [[x1,y1], [x2,y2], [x3,y3], [x4,y4]]
-            text = line[1][0]
-            confidence = line[1][1]
-            
-            # Calculate bounding box from quadrilateral
-            x_coords = [p[0] for p in bbox_points]
-            y_coords = [p[1] for p in bbox_points]
-            
-            x = min(x_coords) / scale
-            y = min(y_coords) / scale
-            width = (max(x_coords) - min(x_coords)) / scale
-            height = (max(y_coords) - min(y_coords)) / scale
-            
-            word_boxes.append({
+        word_boxes = [
+            {
                 'text': text,
-                'x': float(x),
-                'y': float(y),
-                'width': float(width),
-                'height': float(height),
-                'confidence': float(confidence),
-                # Store original quadrilateral for precise highlighting
-                'quad': [[p[0]/scale, p[1]/scale] for p in bbox_points]
-            })
-            
-            texts.append(text)
-            confidences.append(confidence)
+                'x': x,
+                'y': y,
+                'width': width,
+                'height': height,
+                'confidence': confidence,
+                # Store original quadrilateral for precise highlighting (flat x1,y1..x4,y4; see quad_array)
+                'quad': quad,
+            }
+            for text, confidence, (x, y), (width, height), quad
+            in zip(texts, confidences, mins.tolist(), sizes.tolist(), quads.reshape(-1, 8).round(2).tolist())
+        ]
         
         combined_text = ' '.join(texts).strip()
-        avg_confidence = float(np.mean(confidences)) if confidences else 0.0
+        avg_confidence = sum(confidences) / len(confidences) if confidences else 0.0
         
         return {
             'text': combined_text,
@@ -270,6 +608,10 @@ class PaddleOCREngine(OCREngine):
 class EasyOCREngine(OCREngine):
     """EasyOCR-based OCR engine (good for handwritten text)."""
     
+    # Loaded readers shared process-wide, keyed on (languages, gpu)
+    _readers: Dict[Tuple, object] = {}
+    _readers_lock = threading.Lock()
+    
     def __init__(self, languages: List[str] = None, gpu: bool = False):
         self.languages = languages or ['en']
         self.gpu = gpu
@@ -279,90 +621,181 @@ class EasyOCREngine(OCREngine):
     def reader(self):
         """Lazy load EasyOCR reader."""
         if self._reader is None:
-            # Compatibility shim:
-            # Pillow>=10 removed Image.ANTIALIAS, but EasyOCR<=1.7.0 still references it.
-            # This restores the attribute so EasyOCR doesn't crash.
-            from PIL import Image as PILImage
-            if not hasattr(PILImage, "ANTIALIAS") and hasattr(PILImage, "Resampling"):
-                PILImage.ANTIALIAS = PILImage.Resampling.LANCZOS
-
-            import easyocr
-            logger.info(f"Initializing EasyOCR with languages: {self.languages}, GPU: {self.gpu}")
-            self._reader = easyocr.Reader(self.languages, gpu=self.gpu)
+            key = (tuple(self.languages), self.gpu)
+            with EasyOCREngine._readers_lock:
+                if key not in EasyOCREngine._readers:
+                    EasyOCREngine._readers[key] = self._load_reader()
+                self._reader = EasyOCREngine._readers[key]
         return self._reader
     
-    def extract_text(self, image_path: Path) -> Dict:
+    def _load_reader(self):
+        """Build an EasyOCR reader (loads detector + recognizer weights; callers cache it)."""
+        # Compatibility shim:
+        # Pillow>=10 removed Image.ANTIALIAS, but EasyOCR<=1.7.0 still references it.
+        # This restores the attribute so EasyOCR doesn't crash.
+        from PIL import Image as PILImage
+        if not hasattr(PILImage, "ANTIALIAS") and hasattr(PILImage, "Resampling"):
+            PILImage.ANTIALIAS = PILImage.Resampling.LANCZOS
+
+        import easyocr
+        logger.info(f"Initializing EasyOCR with languages: {self.languages}, GPU: {self.gpu}")
+        return easyocr.Reader(self.languages, gpu=self.gpu)
+    
+    def _readtext_variants(self, variants: List[OCRVariant]) -> List[list]:
+        """
+        Run readtext over every variant, returning results in variant order.
+
+        Variants rendered at the same scale share dimensions, so each such group goes
+        through CRAFT detection as one stacked batch via readtext_batched (older
+        EasyOCR without it falls back to one readtext call per variant).
+        
+        Recognition decodes greedily; only boxes below EASYOCR_BEAM_THRESHOLD are
+        re-decoded with beam search (see _beam_refine).
+        """
+        params = dict(
+            detail=1,
+            paragraph=False,
+            decoder="greedy",
+            text_threshold=Config.EASYOCR_TEXT_THRESHOLD,
+            low_text=Config.EASYOCR_LOW_TEXT,
+            link_threshold=Config.EASYOCR_LINK_THRESHOLD,
+            canvas_size=Config.EASYOCR_CANVAS_SIZE,
+            mag_ratio=Config.EASYOCR_MAG_RATIO,
+        )
+        if not hasattr(self.reader, "readtext_batched"):
+            return [self._beam_refine(v.image, self.reader.readtext(v.image, **params)) for v in variants]
+
+        groups: Dict[Tuple[int, ...], List[int]] = {}
+        for i, v in enumerate(variants):
+            groups.setdefault(v.image.shape, []).append(i)
+
+        results: List[list] = [[] for _ in variants]
+        for shape, indices in groups.items():
+            if len(indices) == 1:
+                results[indices[0]] = self.reader.readtext(variants[indices[0]].image, **params)
+                continue
+            n_h, n_w = shape[:2]
+            # A list rather than a stacked array: EasyOCR reads a 3-D array as one image, which
+            # a stack of single-channel variants would be.
+            batch = [variants[i].image for i in indices]
+            # Same-shape batch: no resize happens, so boxes stay in each variant's own coordinates.
+            for i, res in zip(indices, self.reader.readtext_batched(batch, n_width=n_w, n_height=n_h, **params)):
+                results[i] = res
+        return [self._beam_refine(v.image, res) for v, res in zip(variants, results)]
+    
+    def _beam_refine(self, image: np.ndarray, results: list) -> list:
+        """
+        Re-decode low-confidence boxes with beam search, keeping whichever reading scores higher.
+        
+        Beam search costs 2-3x greedy and rarely changes confident readings, so on clean
+        scans only a small fraction of boxes pay for it.
+        """
+        low = [i for i, (_, _, conf) in enumerate(results) if conf < Config.EASYOCR_BEAM_THRESHOLD]
+        if not low:
+            return results
+        
+        # recognize() takes axis-aligned boxes as [x_min, x_max, y_min, y_max] and anything
+        # else as a 4-point polygon, answering horizontal ones first, each in input order.
+        horizontal, free = [], []
+        for i in low:
+            pts = np.asarray(results[i][0])
+            xs, ys = pts[:, 0], pts[:, 1]
+            if pts[0][1] == pts[1][1] and pts[0][0] == pts[3][0]:
+                horizontal.append((i, [int(xs.min()), int(xs.max()), int(ys.min()), int(ys.max())]))
+            else:
+                free.append((i, pts.tolist()))
+        
+        refined = list(results)
+        for group, kwargs in (
+            (horizontal, lambda boxes: dict(horizontal_list=boxes, free_list=[])),
+            (free, lambda boxes: dict(horizontal_list=[], free_list=boxes)),
+        ):
+            if not group:
+                continue
+            redo = self.reader.recognize(
+                image,
+                decoder="beamsearch",
+                beamWidth=5,
+                detail=1,
+                paragraph=False,
+                **kwargs([box for _, box in group]),
+            )
+            if len(redo) != len(group):
+                continue
+            for (i, _), (_, text, conf) in zip(group, redo):
+                bbox, _, old_conf = refined[i]
+                if conf > old_conf:
+                    refined[i] = (bbox, text, conf)
+        return refined
+    
+    @cached
+    def extract_text(self, image_path: Path, base_img: Optional[np.ndarray] = None,
+                     variants: Optional[List[OCRVariant]] = None) -> Dict:
         """Extract text using EasyOCR."""
         try:
-            # Read image
-            image = Image.open(image_path).convert("RGB")
-            base_img = np.array(image)
-
-            variants = (
-                build_ocr_variants(base_img, scales=Config.OCR_SCALES, deskew=Config.OCR_DESKEW)
-                if Config.OCR_PREPROCESS
-                else [OCRVariant(name="rgb", image=base_img, scale=1.0)]
-            )
+            if variants is None:
+                # Read image
+                if base_img is None:
+                    base_img = _load_rgb(image_path)
+                # Built lazily (already in _order_variants order): upscales are only rendered
+                # if the 1x passes aren't confident.
+                variants = (
+                    iter_ocr_variants(base_img, scales=Config.OCR_SCALES, deskew=Config.OCR_DESKEW,
+                                      denoise_quality=Config.OCR_DENOISE_QUALITY)
+                    if Config.OCR_PREPROCESS
+                    else [OCRVariant(name="rgb", image=base_img, scale=1.0)]
+                )
+            else:
+                variants = _order_variants(variants)
 
-            best = {"text": "", "word_boxes": [], "confidence": 0.0, "engine": "easyocr", "metadata": {}}
-            best_score = -1.0
+            tracker = _BestTracker('easyocr', bias=0.25)
 
             # Try multiple OCR passes with different preprocessing and scaling.
-            for v in variants:
-                results = self.reader.readtext(
-                    v.image,
-                    detail=1,
-                    paragraph=False,
-                    decoder="beamsearch",
-                    text_threshold=Config.EASYOCR_TEXT_THRESHOLD,
-                    low_text=Config.EASYOCR_LOW_TEXT,
-                    link_threshold=Config.EASYOCR_LINK_THRESHOLD,
-                    canvas_size=Config.EASYOCR_CANVAS_SIZE,
-                    mag_ratio=Config.EASYOCR_MAG_RATIO,
-                )
-            
+            # The leading variant runs alone so a confident first pass skips the batched rest.
+            def _passes():
+                it = iter(variants)
+                first = list(itertools.islice(it, 1))
+                yield from zip(first, self._readtext_variants(first))
+                rest = list(it)
+                yield from zip(rest, self._readtext_variants(rest))
+
+            for v, results in _passes():
                 # Extract text and bounding boxes
-                full_text = []
+                full_text = [text for _, text, _ in results]
+                confidences = [float(confidence) for _, _, confidence in results]
                 word_boxes = []
-                confidences = []
-
-                for (bbox, text, confidence) in results:
-                    x_coords = [point[0] for point in bbox]
-                    y_coords = [point[1] for point in bbox]
-
-                    x = min(x_coords) / float(v.scale)
-                    y = min(y_coords) / float(v.scale)
-                    width = (max(x_coords) - min(x_coords)) / float(v.scale)
-                    height = (max(y_coords) - min(y_coords)) / float(v.scale)
-
-                    word_boxes.append({
-                        'text': text,
-                        'x': float(x),
-                        'y': float(y),
-                        'width': float(width),
-                        'height': float(height),
-                        'confidence': float(confidence)
-                    })
-
-                    full_text.append(text)
-                    confidences.append(confidence)
+                if results:
+                    inv_scale = 1.0 / float(v.scale)
+                    quads = np.asarray([bbox for bbox, _, _ in results], dtype=np.float64) * inv_scale
+                    mins = quads.min(axis=1)
+                    sizes = quads.max(axis=1) - mins
+                    word_boxes = [
+                        {
+                            'text': text,
+                            'x': x,
+                            'y': y,
+                            'width': width,
+                            'height': height,
+                            'confidence': confidence
+                        }
+                        for text, confidence, (x, y), (width, height)
+                        in zip(full_text, confidences, mins.tolist(), sizes.tolist())
+                    ]
 
                 combined_text = ' '.join(full_text).strip()
-                avg_confidence = float(np.mean(confidences)) if confidences else 0.0
+                avg_confidence = sum(confidences) / len(confidences) if confidences else 0.0
 
-                # Score prefers longer text, with a boost for confidence.
-                score = (len(combined_text) + 1) * (0.25 + avg_confidence)
-                if combined_text and score > best_score:
-                    best_score = score
-                    best = {
-                        'text': combined_text, 
-                        'word_boxes': word_boxes, 
-                        'confidence': avg_confidence,
-                        'engine': 'easyocr',
-                        'metadata': {'variant': v.name}
-                    }
+                tracker.offer({
+                    'text': combined_text, 
+                    'word_boxes': word_boxes, 
+                    'confidence': avg_confidence,
+                    'engine': 'easyocr',
+                    'metadata': {'variant': v.name}
+                })
+                if _is_confident(combined_text, avg_confidence):
+                    break
 
-            return best
+            return tracker.best
             
         except Exception as e:
             logger.exception(f"Error in EasyOCR extraction for {image_path}: {e}")
@@ -376,80 +809,179 @@ class EasyOCREngine(OCREngine):
 
 
 class TesseractEngine(OCREngine):
-    """Tesseract-based OCR engine."""
+    """
+    Tesseract-based OCR engine.
+    
+    Uses tesserocr (libtesseract in-process, persistent handles with traineddata loaded once)
+    when it's installed; otherwise pytesseract, which starts a tesseract subprocess per call.
+    """
     
     def __init__(self, languages: str = 'eng'):
         self.languages = languages
+        # Idle PyTessBaseAPI handles; a handle isn't thread-safe, so concurrent runs each borrow one
+        self._apis: "queue.LifoQueue" = queue.LifoQueue()
+        # Runs the psm modes of a variant side by side; created once per engine, not per variant
+        self._psm_executor: Optional[ThreadPoolExecutor] = None
+        try:
+            import tesserocr
+            self.tesserocr = tesserocr
+        except ImportError:
+            self.tesserocr = None
         try:
             import pytesseract
             self.pytesseract = pytesseract
         except ImportError:
-            raise ImportError("pytesseract not installed. Install with: pip install pytesseract")
+            if self.tesserocr is None:
+                raise ImportError("pytesseract not installed. Install with: pip install pytesseract")
+            self.pytesseract = None
     
-    def extract_text(self, image_path: Path) -> Dict:
-        """Extract text using Tesseract."""
+    def _tess_input(self, img: np.ndarray):
+        """
+        The variant in the form the backend reads cheapest, built once and shared by the psm runs.
+        
+        tesserocr takes the raw pixel buffer (no encode at all). pytesseract has to write a temp
+        file; tagging the image PPM makes that an uncompressed dump instead of a PNG encode.
+        """
+        if self.tesserocr is not None:
+            return np.ascontiguousarray(img)
+        pil = Image.fromarray(img)  # single-channel variants are written as PGM
+        pil.format = "PPM"
+        return pil
+    
+    def _image_to_data(self, image, psm: str) -> Optional[Dict[str, list]]:
+        """Word-level TSV columns (text, conf, left, top, width, height); None if the run timed out."""
+        if self.tesserocr is not None:
+            return self._tesserocr_data(image, psm)
         try:
-            image = Image.open(image_path).convert("RGB")
-            base_img = np.array(image)
-            variants = (
-                build_ocr_variants(base_img, scales=Config.OCR_SCALES, deskew=Config.OCR_DESKEW)
-                if Config.OCR_PREPROCESS
-                else [OCRVariant(name="rgb", image=base_img, scale=1.0)]
+            return self.pytesseract.image_to_data(
+                image,
+                lang=self.languages,
+                config=f"--oem 3 --psm {psm}",
+                output_type=self.pytesseract.Output.DICT,
+                timeout=Config.TESSERACT_TIMEOUT,
             )
+        except RuntimeError as e:
+            # pytesseract kills the subprocess and raises RuntimeError on timeout
+            logger.warning(f"Tesseract psm {psm} gave up after {Config.TESSERACT_TIMEOUT}s: {e}")
+            return None
+    
+    def _tesserocr_data(self, pixels: np.ndarray, psm: str) -> Dict[str, list]:
+        tesserocr = self.tesserocr
+        try:
+            api = self._apis.get_nowait()
+        except queue.Empty:
+            api = tesserocr.PyTessBaseAPI(lang=self.languages.replace(",", "+"), oem=tesserocr.OEM.DEFAULT)
+        try:
+            api.SetPageSegMode(int(psm))
+            height, width = pixels.shape[:2]
+            channels = 1 if pixels.ndim == 2 else pixels.shape[2]
+            api.SetImageBytes(pixels.tobytes(), width, height, channels, width * channels)
+            api.Recognize()
+            data = {k: [] for k in ('text', 'conf', 'left', 'top', 'width', 'height')}
+            iterator = api.GetIterator()
+            if iterator is None:
+                return data
+            level = tesserocr.RIL.WORD
+            for word in tesserocr.iterate_level(iterator, level):
+                bbox = word.BoundingBox(level)
+                if bbox is None:
+                    continue
+                x1, y1, x2, y2 = bbox
+                data['text'].append(word.GetUTF8Text(level))
+                data['conf'].append(word.Confidence(level))
+                data['left'].append(x1)
+                data['top'].append(y1)
+                data['width'].append(x2 - x1)
+                data['height'].append(y2 - y1)
+            return data
+        finally:
+            self._apis.put(api)
+    
+    @cached
+    def extract_text(self, image_path: Path, base_img: Optional[np.ndarray] = None,
+                     variants: Optional[List[OCRVariant]] = None) -> Dict:
+        """Extract text using Tesseract."""
+        try:
+            if variants is None:
+                if base_img is None:
+                    base_img = _load_rgb(image_path)
+                # Lazy and already in _order_variants order, as for EasyOCR
+                variants = (
+                    iter_ocr_variants(base_img, scales=Config.OCR_SCALES, deskew=Config.OCR_DESKEW,
+                                      denoise_quality=Config.OCR_DENOISE_QUALITY)
+                    if Config.OCR_PREPROCESS
+                    else [OCRVariant(name="rgb", image=base_img, scale=1.0)]
+                )
+            else:
+                variants = _order_variants(variants)
 
-            best = {"text": "", "word_boxes": [], "confidence": 0.0, "engine": "tesseract", "metadata": {}}
-            best_score = -1.0
+            tracker = _BestTracker('tesseract', bias=0.25)
 
             # Try a couple of psm modes for robustness
             psm_modes = [Config.TESSERACT_PSM, "11"] if Config.TESSERACT_PSM != "11" else ["11", "6"]
 
+            if self._psm_executor is None:
+                self._psm_executor = ThreadPoolExecutor(max_workers=len(psm_modes), thread_name_prefix="tesseract")
+
+            done = False
             for v in variants:
-                pil = Image.fromarray(v.image)
-                for psm in psm_modes:
-                    cfg = f"--oem 3 --psm {psm}"
-                    data = self.pytesseract.image_to_data(
-                        pil,
-                        lang=self.languages,
-                        config=cfg,
-                        output_type=self.pytesseract.Output.DICT
-                    )
-
-                    word_boxes = []
-                    texts = []
-                    confidences = []
-
-                    n_boxes = len(data['text'])
-                    for i in range(n_boxes):
-                        text = (data['text'][i] or "").strip()
-                        if not text:
-                            continue
-                        conf = float(data['conf'][i]) if data['conf'][i] != -1 else 0.0
-                        word_boxes.append({
+                if done:
+                    break
+                image = self._tess_input(v.image)
+                inv_scale = 1.0 / float(v.scale)
+                # The psm runs are independent (subprocess / GIL-free libtesseract), so run them side by
+                # side, but judge them in psm_modes order so the result doesn't depend on which finishes first
+                futures = [self._psm_executor.submit(self._image_to_data, image, psm) for psm in psm_modes]
+                try:
+                    results = [(psm, future.result()) for psm, future in zip(psm_modes, futures)]
+                finally:
+                    # Never leave a tesseract run going in the background (e.g. if one raised)
+                    for future in futures:
+                        future.cancel()
+                    wait(futures)
+                for psm, data in results:
+                    if data is None:
+                        continue
+
+                    # Column arrays scaled once; rows with empty text are dropped by index
+                    texts = [(t or "").strip() for t in data['text']]
+                    keep = [i for i, t in enumerate(texts) if t]
+                    texts = [texts[i] for i in keep]
+                    conf_arr = np.asarray(data['conf'], dtype=np.float64)[keep]
+                    conf_arr[conf_arr == -1] = 0.0
+                    geom = np.stack([
+                        np.asarray(data[k], dtype=np.float64)[keep]
+                        for k in ('left', 'top', 'width', 'height')
+                    ], axis=1) * inv_scale
+
+                    word_boxes = [
+                        {
                             'text': text,
-                            'x': float(data['left'][i]) / float(v.scale),
-                            'y': float(data['top'][i]) / float(v.scale),
-                            'width': float(data['width'][i]) / float(v.scale),
-                            'height': float(data['height'][i]) / float(v.scale),
+                            'x': x,
+                            'y': y,
+                            'width': width,
+                            'height': height,
                             'confidence': conf
-                        })
-                        texts.append(text)
-                        if conf > 0:
-                            confidences.append(conf)
+                        }
+                        for text, conf, (x, y, width, height) in zip(texts, conf_arr.tolist(), geom.tolist())
+                    ]
+                    confidences = conf_arr[conf_arr > 0]
 
                     combined_text = ' '.join(texts).strip()
-                    avg_confidence = float(np.mean(confidences)) if confidences else 0.0
-                    score = (len(combined_text) + 1) * (0.25 + (avg_confidence / 100.0))
-                    if combined_text and score > best_score:
-                        best_score = score
-                        best = {
-                            'text': combined_text, 
-                            'word_boxes': word_boxes, 
-                            'confidence': avg_confidence,
-                            'engine': 'tesseract',
-                            'metadata': {'variant': v.name, 'psm': psm}
-                        }
+                    avg_confidence = float(confidences.mean()) if confidences.size else 0.0
+                    # Tesseract confidences are 0-100
+                    tracker.offer({
+                        'text': combined_text, 
+                        'word_boxes': word_boxes, 
+                        'confidence': avg_confidence,
+                        'engine': 'tesseract',
+                        'metadata': {'variant': v.name, 'psm': psm}
+                    }, conf=avg_confidence / 100.0)
+                    if _is_confident(combined_text, avg_confidence / 100.0):
+                        done = True
+                        break
 
-            return best
+            return tracker.best
             
         except Exception as e:
             logger.exception(f"Error in Tesseract extraction for {image_path}: {e}")
@@ -473,70 +1005,91 @@ class EnsembleOCREngine(OCREngine):
     def __init__(self, engines: List[OCREngine] = None):
         self.engines = engines or []
     
-    def extract_text(self, image_path: Path) -> Dict:
-        """Run all engines and return best result."""
-        best = {
-            'text': '',
-            'word_boxes': [],
-            'confidence': 0.0,
-            'engine': 'ensemble',
-            'metadata': {}
-        }
-        best_score = -1.0
+    @cached
+    def extract_text(self, image_path: Path, base_img: Optional[np.ndarray] = None,
+                     variants: Optional[List[OCRVariant]] = None) -> Dict:
+        """Run all engines on one decoded, preprocessed copy of the page and return best result."""
+        tracker = _BestTracker('ensemble')
+        
+        if variants is None:
+            try:
+                if base_img is None:
+                    base_img = _load_rgb(image_path)
+                variants = self._shared_variants(base_img)
+            except Exception as e:
+                logger.exception(f"Error preparing {image_path} for ensemble OCR: {e}")
+                return tracker.best
         
-        for engine in self.engines:
+        def _try_engine(engine: OCREngine) -> Optional[Dict]:
             try:
-                result = engine.extract_text(image_path)
-                text_len = len(result.get('text', ''))
-                conf = result.get('confidence', 0.0)
-                score = (text_len + 1) * (0.3 + conf)
-                
-                if text_len > 0 and score > best_score:
-                    best_score = score
-                    best = result
-                    best['metadata']['selected_engine'] = result.get('engine', 'unknown')
-                    
+                return engine.extract_text(image_path, base_img=base_img, variants=variants)
             except Exception as e:
                 logger.warning(f"Engine {engine.__class__.__name__} failed: {e}")
+                return None
+        
+        # Engines hold separate models, so they can run side by side
+        workers = len(self.engines) if Config.OCR_VARIANT_WORKERS > 1 else 1
+        for engine, result in _imap_unordered(_try_engine, self.engines, workers):
+            if result is None:
                 continue
+            # Engine results always carry text/confidence/engine/metadata
+            if tracker.offer(result):
+                result['metadata']['selected_engine'] = result['engine']
         
-        return best
+        return tracker.best
+    
+    def _shared_variants(self, base_img: np.ndarray) -> Optional[List[OCRVariant]]:
+        """Variants built once for every engine (None: each engine uses its own no-preprocess fallback)."""
+        if not Config.OCR_PREPROCESS:
+            return None
+        return build_ocr_variants(base_img, scales=Config.OCR_SCALES, deskew=Config.OCR_DESKEW,
+                                  denoise_quality=Config.OCR_DENOISE_QUALITY)
+    
+    def _prepare_page(self, image_path: Path) -> Tuple[np.ndarray, Optional[List[OCRVariant]]]:
+        base_img = _load_rgb(image_path)
+        return base_img, self._shared_variants(base_img)
+    
+    def _extract_prepared(self, image_path: Path, prepared) -> Dict:
+        base_img, variants = prepared
+        return self.extract_text(image_path, base_img=base_img, variants=variants)
 
 
 def get_ocr_engine() -> OCREngine:
-    """Factory function to get the configured OCR engine."""
-    engine_name = Config.OCR_ENGINE.lower()
-    
+    """Factory function to get the configured OCR engine (shared per configuration)."""
+    return _build_engine(
+        Config.OCR_ENGINE.lower(),
+        tuple(Config.OCR_LANGUAGES),
+        Config.OCR_GPU,
+        Config.PADDLE_USE_ANGLE_CLS,
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _build_engine(engine_name: str, languages: Tuple[str, ...], gpu: bool, angle_cls: bool) -> OCREngine:
+    """Build an engine once per (name, languages, gpu, angle_cls); model weights load lazily on first use."""
     if engine_name == 'textract':
         # AWS Textract - high accuracy cloud OCR
         from ocr.textract import TextractEngine
         return TextractEngine()
     elif engine_name == 'paddleocr':
         return PaddleOCREngine(
-            languages=Config.OCR_LANGUAGES,
-            use_gpu=Config.OCR_GPU,
-            use_angle_cls=Config.PADDLE_USE_ANGLE_CLS
+            languages=list(languages),
+            use_gpu=gpu,
+            use_angle_cls=angle_cls
         )
     elif engine_name == 'easyocr':
         return EasyOCREngine(
-            languages=Config.OCR_LANGUAGES,
-            gpu=Config.OCR_GPU
+            languages=list(languages),
+            gpu=gpu
         )
     elif engine_name == 'tesseract':
-        return TesseractEngine(languages=','.join(Config.OCR_LANGUAGES))
+        return TesseractEngine(languages=','.join(languages))
     elif engine_name == 'ensemble':
-        # Use all engines and pick best result
+        # Use all engines and pick best result (sub-engines share models with the standalone ones)
         engines = [
-            PaddleOCREngine(
-                languages=Config.OCR_LANGUAGES,
-                use_gpu=Config.OCR_GPU,
-                use_angle_cls=Config.PADDLE_USE_ANGLE_CLS
-            ),
-            EasyOCREngine(
-                languages=Config.OCR_LANGUAGES,
-                gpu=Config.OCR_GPU
-            ),
+            _build_engine('paddleocr', languages, gpu, angle_cls),
+            _build_engine('easyocr', languages, gpu, angle_cls),
         ]
         return EnsembleOCREngine(engines=engines)
     else:
-        raise ValueError(f"Unknown OCR engine: {Config.OCR_ENGINE}")
+        raise ValueError(f"Unknown OCR engine: {engine_name}")
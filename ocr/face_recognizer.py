@@ -0,0 +1,182 @@
+"""Local celebrity recognition: ArcFace embeddings matched against a gallery of known identities.
+
+For bulk runs where Rekognition's per-account TPS quota is the ceiling. Faces are detected and
+aligned per image with InsightFace, embedded in batches with its ArcFace model (ONNX Runtime,
+CUDA when FACE_GPU is on) and matched by cosine similarity against FACE_GALLERY_PATH.
+
+The gallery is an .npz with `names` (N,) and L2-normalized `embeddings` (N, D); build one with
+scripts/build_face_gallery.py.
+"""
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Check if insightface is available
+try:
+    from insightface.app import FaceAnalysis
+    from insightface.utils import face_align
+    INSIGHTFACE_AVAILABLE = True
+except ImportError:
+    INSIGHTFACE_AVAILABLE = False
+
+# FAISS is optional; a plain matrix product is fine for galleries of a few thousand identities
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+
+class LocalFaceRecognizer:
+    """Detects faces and names them from the gallery, in the same format as Rekognition results."""
+
+    def __init__(self, gallery_path: Optional[Path] = None):
+        self.gallery_path = Path(gallery_path or Config.FACE_GALLERY_PATH)
+        self.match_threshold = Config.FACE_MATCH_THRESHOLD
+        self.fallback_threshold = Config.FACE_FALLBACK_THRESHOLD
+        self.batch_size = max(1, Config.FACE_BATCH_SIZE)
+        self._app = None
+        self._names = None
+        self._gallery = None
+        self._index = None
+        self._load_lock = threading.Lock()
+        self.enabled = self._check_enabled()
+
+    def _check_enabled(self) -> bool:
+        return INSIGHTFACE_AVAILABLE and self.gallery_path.is_file()
+
+    @property
+    def app(self):
+        """Lazy load the detection + recognition models (once per process)."""
+        if self._app is None:
+            with self._load_lock:
+                if self._app is None:
+                    providers = ['CPUExecutionProvider']
+                    if Config.FACE_GPU:
+                        providers.insert(0, 'CUDAExecutionProvider')
+                    app = FaceAnalysis(
+                        name=Config.FACE_MODEL,
+                        allowed_modules=['detection', 'recognition'],
+                        providers=providers,
+                    )
+                    app.prepare(ctx_id=0 if Config.FACE_GPU else -1,
+                                det_size=(Config.FACE_DET_SIZE, Config.FACE_DET_SIZE))
+                    self._app = app
+        return self._app
+
+    def _load_gallery(self):
+        with self._load_lock:
+            if self._gallery is not None:
+                return
+            data = np.load(self.gallery_path, allow_pickle=False)
+            self._names = [str(name) for name in data['names']]
+            gallery = np.ascontiguousarray(data['embeddings'], dtype=np.float32)
+            if faiss is not None:
+                self._index = faiss.IndexFlatIP(gallery.shape[1])
+                self._index.add(gallery)
+            self._gallery = gallery
+        logger.info(f"Loaded face gallery: {len(self._names)} identities from {self.gallery_path}")
+
+    def detect_faces(self, image: np.ndarray) -> Tuple[np.ndarray, List[np.ndarray]]:
+        """Face boxes (N, 5: x1, y1, x2, y2, score) and their aligned 112x112 crops, for a BGR image."""
+        bboxes, kpss = self.app.det_model.detect(image, max_num=0, metric='default')
+        if kpss is None or len(bboxes) == 0:
+            return np.zeros((0, 5), dtype=np.float32), []
+        return bboxes, [face_align.norm_crop(image, landmark=kps) for kps in kpss]
+
+    def embed(self, crops: Sequence[np.ndarray]) -> np.ndarray:
+        """L2-normalized ArcFace embeddings for aligned crops, FACE_BATCH_SIZE crops per inference call."""
+        rec_model = self.app.models['recognition']
+        feats = [
+            rec_model.get_feat(list(crops[start:start + self.batch_size]))
+            for start in range(0, len(crops), self.batch_size)
+        ]
+        feats = np.concatenate(feats).astype(np.float32, copy=False)
+        return feats / np.maximum(np.linalg.norm(feats, axis=1, keepdims=True), 1e-12)
+
+    def _nearest(self, embeddings: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        if self._gallery is None:
+            self._load_gallery()
+        if self._index is not None:
+            sims, idx = self._index.search(embeddings, 1)
+            return sims[:, 0], idx[:, 0]
+        sims = embeddings @ self._gallery.T
+        idx = sims.argmax(axis=1)
+        return sims[np.arange(len(idx)), idx], idx
+
+    def _confidence(self, similarity: float) -> float:
+        # Rekognition-style 0-100 score: FACE_MATCH_THRESHOLD maps to 90 (the default min_confidence
+        # used by callers), an identical embedding to 100
+        span = max(1.0 - self.match_threshold, 1e-6)
+        return float(min(100.0, 90.0 + 10.0 * (similarity - self.match_threshold) / span))
+
+    def recognize_batch(self, image_paths: Sequence[Path]) -> List[Tuple[List[Dict], bool]]:
+        """
+        Recognize celebrities in several images, embedding all of their faces together.
+
+        Returns:
+            One (celebrities, uncertain) pair per image. `uncertain` is True when a face's best
+            match falls between FACE_FALLBACK_THRESHOLD and FACE_MATCH_THRESHOLD, i.e. the caller
+            should ask Rekognition instead.
+        """
+        faces = []  # (image index, normalized bbox)
+        crops = []
+        for i, image_path in enumerate(image_paths):
+            image = cv2.imread(str(image_path), cv2.IMREAD_COLOR)
+            if image is None:
+                logger.error(f"Could not read image: {image_path}")
+                continue
+            height, width = image.shape[:2]
+            bboxes, image_crops = self.detect_faces(image)
+            for (x1, y1, x2, y2, _), crop in zip(bboxes, image_crops):
+                faces.append((i, {
+                    'left': max(0.0, float(x1) / width),
+                    'top': max(0.0, float(y1) / height),
+                    'width': float(x2 - x1) / width,
+                    'height': float(y2 - y1) / height
+                }))
+                crops.append(crop)
+
+        results = [([], False) for _ in image_paths]
+        if not crops:
+            return results
+
+        sims, idx = self._nearest(self.embed(crops))
+        for (i, bbox), similarity, gallery_idx in zip(faces, sims.tolist(), idx.tolist()):
+            celebrities, uncertain = results[i]
+            if similarity >= self.match_threshold:
+                celebrities.append({
+                    'name': self._names[gallery_idx],
+                    'confidence': self._confidence(similarity),
+                    'urls': [],
+                    'bbox': bbox
+                })
+            elif similarity >= self.fallback_threshold:
+                results[i] = (celebrities, True)
+        return results
+
+
+_recognizer: Optional[LocalFaceRecognizer] = None
+_recognizer_lock = threading.Lock()
+
+
+def get_face_recognizer() -> Optional[LocalFaceRecognizer]:
+    """Process-wide local recognizer (the models are loaded once), or None when it can't run."""
+    global _recognizer
+    if _recognizer is None:
+        with _recognizer_lock:
+            if _recognizer is None:
+                _recognizer = LocalFaceRecognizer()
+                if not INSIGHTFACE_AVAILABLE:
+                    logger.warning("insightface not installed. Local celebrity recognition disabled.")
+                elif not _recognizer.enabled:
+                    logger.warning(f"Face gallery not found: {_recognizer.gallery_path}. "
+                                   f"Local celebrity recognition disabled.")
+    return _recognizer if _recognizer.enabled else None
@@ -14,12 +14,21 @@ Bounding box coordinates are preserved/transformed correctly.
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Tuple, Optional
+from typing import Iterator, List, Tuple, Optional
 import math
+import os
+import threading
 
 import cv2
 import numpy as np
 
+from config import Config
+
+# Container images often leave OpenCV's pool at one thread; its resize/warpAffine/filter
+# kernels split rows across the pool themselves when it's sized.
+cv2.setUseOptimized(True)
+cv2.setNumThreads(Config.OCV_THREADS or os.cpu_count() or 1)
+
 
 @dataclass(frozen=True)
 class OCRVariant:
@@ -28,6 +37,11 @@ class OCRVariant:
     image: np.ndarray  # HxWxC or HxW
     scale: float = 1.0  # If variant was upscaled, boxes should be divided by this.
     rotation_angle: float = 0.0  # Degrees rotated (for coordinate transform)
+    
+    @property
+    def channels(self) -> int:
+        """1 for single-channel (HxW) variants, which engines take as-is, else 3."""
+        return 1 if self.image.ndim == 2 else self.image.shape[2]
 
 
 @dataclass
@@ -54,33 +68,65 @@ def _ensure_rgb(img: np.ndarray) -> np.ndarray:
     return img
 
 
+def _as_u8_contiguous(img: np.ndarray) -> np.ndarray:
+    """
+    The image as a C-contiguous uint8 array (no copy when it already is one).
+    
+    OpenCV copies strided/negative-stride inputs on every call, and non-8U data drops
+    it off the 8UC1/8UC3 SIMD kernels.
+    """
+    return np.ascontiguousarray(img, dtype=np.uint8)
+
+
+# CLAHE objects keep their working buffers between apply() calls and aren't safe to share
+# across threads (pages are preprocessed on prefetch threads), so each thread keeps its own.
+_clahe_local = threading.local()
+
+
 def _clahe(gray: np.ndarray, clip_limit: float = 2.0, tile_size: int = 8) -> np.ndarray:
     """Apply CLAHE (Contrast Limited Adaptive Histogram Equalization)."""
-    clahe = cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=(tile_size, tile_size))
+    cache = getattr(_clahe_local, "cache", None)
+    if cache is None:
+        cache = _clahe_local.cache = {}
+    key = (clip_limit, tile_size)
+    clahe = cache.get(key)
+    if clahe is None:
+        clahe = cache[key] = cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=(tile_size, tile_size))
     return clahe.apply(gray)
 
 
-def _sharpen(img: np.ndarray) -> np.ndarray:
-    """Apply unsharp masking for text sharpening."""
-    if img.ndim == 2:
-        # Grayscale sharpening
-        blurred = cv2.GaussianBlur(img, (0, 0), 3)
-        sharpened = cv2.addWeighted(img, 1.5, blurred, -0.5, 0)
-        return sharpened
-    else:
-        # RGB sharpening
-        kernel = np.array([[0, -1, 0], [-1, 5, -1], [0, -1, 0]], dtype=np.float32)
-        return cv2.filter2D(img, -1, kernel)
+def _sharpen(img: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Apply unsharp masking for text sharpening; returns a grayscale image.
+    
+    Color input is converted to gray first: every OCR variant ends up gray anyway, and
+    one channel is a third of the work of a per-channel kernel. `out` (a same-shape
+    scratch buffer the caller no longer needs, never `img` itself) receives the result
+    instead of a newly allocated array.
+    """
+    gray = _to_gray(img)
+    # Blur into the output buffer, then blend in place
+    blurred = cv2.GaussianBlur(gray, (0, 0), 3, dst=out)
+    return cv2.addWeighted(gray, 1.5, blurred, -0.5, 0, dst=blurred, dtype=-1)  # stay 8U
 
 
-def _denoise(gray: np.ndarray, h: int = 10) -> np.ndarray:
-    """Apply non-local means denoising."""
-    return cv2.fastNlMeansDenoising(gray, h=h)
+def _denoise(gray: np.ndarray, h: int = 10, quality: str = "fast") -> np.ndarray:
+    """
+    Denoise a grayscale image.
+    
+    "fast" is a small bilateral filter (edge-preserving, many times cheaper); "high" is
+    non-local means. `h` is the NL-means filter strength and maps to the bilateral sigmaColor.
+    """
+    if quality == "high":
+        return cv2.fastNlMeansDenoising(gray, h=h)
+    return cv2.bilateralFilter(gray, 5, h * 2.5, 5)
 
 
-def _denoise_color(rgb: np.ndarray, h: int = 10) -> np.ndarray:
-    """Apply non-local means denoising to color image."""
-    return cv2.fastNlMeansDenoisingColored(rgb, h=h, hColor=h)
+def _denoise_color(rgb: np.ndarray, h: int = 10, quality: str = "fast") -> np.ndarray:
+    """Denoise a color image (see _denoise for `quality`)."""
+    if quality == "high":
+        return cv2.fastNlMeansDenoisingColored(rgb, h=h, hColor=h)
+    return cv2.bilateralFilter(rgb, 5, h * 2.5, 5)
 
 
 def _adaptive_thresh(gray: np.ndarray, block_size: int = 35, c: int = 11) -> np.ndarray:
@@ -95,20 +141,29 @@ def _adaptive_thresh(gray: np.ndarray, block_size: int = 35, c: int = 11) -> np.
     )
 
 
-def _otsu_thresh(gray: np.ndarray) -> np.ndarray:
-    """Apply Otsu's thresholding."""
-    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-    return binary
+# Longest side of the downsampled copy deskew_image measures the skew angle on
+_SKEW_DETECT_MAX_DIM = 1024
+
+
+def skew_edges(gray: np.ndarray) -> np.ndarray:
+    """Canny edge map detect_skew_angle works on."""
+    return cv2.Canny(gray, 50, 150, apertureSize=3)
 
 
-def detect_skew_angle(gray: np.ndarray, max_angle: float = 15.0) -> float:
+def detect_skew_angle(gray: np.ndarray, max_angle: float = 15.0,
+                      edges: Optional[np.ndarray] = None) -> float:
     """
-    Detect skew angle of text in image using projection profile or Hough lines.
+    Detect skew angle of text in image using Hough lines (probabilistic, then standard).
+    
+    Both methods share one edge map; callers that already computed skew_edges(gray)
+    for other line-based work can pass it as `edges` to skip the Canny pass.
     
     Returns angle in degrees to rotate image to deskew it.
     """
+    if edges is None:
+        edges = skew_edges(gray)
+    
     # Method 1: Use Hough lines to detect dominant text line angle
-    edges = cv2.Canny(gray, 50, 150, apertureSize=3)
     lines = cv2.HoughLinesP(
         edges, 1, np.pi / 180, threshold=100,
         minLineLength=gray.shape[1] // 8,
@@ -116,34 +171,33 @@ def detect_skew_angle(gray: np.ndarray, max_angle: float = 15.0) -> float:
     )
     
     if lines is not None and len(lines) > 0:
-        angles = []
-        for line in lines:
-            x1, y1, x2, y2 = line[0]
-            if x2 - x1 != 0:
-                angle = math.degrees(math.atan2(y2 - y1, x2 - x1))
-                # Only consider near-horizontal lines (text lines)
-                if abs(angle) < max_angle:
-                    angles.append(angle)
+        segs = lines.reshape(-1, 4).astype(np.float32)
+        dx = segs[:, 2] - segs[:, 0]
+        dy = segs[:, 3] - segs[:, 1]
+        valid = dx != 0
+        angles = np.degrees(np.arctan2(dy[valid], dx[valid]))
+        # Only consider near-horizontal lines (text lines)
+        angles = angles[np.abs(angles) < max_angle]
         
-        if angles:
+        if angles.size:
             # Use median to be robust to outliers
             return float(np.median(angles))
     
-    # Method 2: Projection profile analysis (fallback)
-    # Try different angles and find the one with maximum variance
-    best_angle = 0.0
-    best_var = 0.0
-    
-    for angle in np.linspace(-max_angle, max_angle, 31):
-        rotated = rotate_image(gray, angle)
-        # Calculate horizontal projection profile
-        profile = np.sum(rotated, axis=1)
-        var = np.var(profile)
-        if var > best_var:
-            best_var = var
-            best_angle = angle
+    # Method 2: Standard Hough transform over the same edge map (fallback)
+    # One accumulator pass, restricted to near-horizontal normals at 0.1 degree resolution,
+    # instead of rotating the whole page once per candidate angle.
+    max_theta = math.radians(max_angle)
+    lines = cv2.HoughLines(
+        edges, 1, np.pi / 1800, threshold=max(50, gray.shape[1] // 10),
+        min_theta=np.pi / 2 - max_theta,
+        max_theta=np.pi / 2 + max_theta
+    )
+    if lines is None or len(lines) == 0:
+        return 0.0
     
-    return best_angle
+    # Lines come back strongest first; a normal at 90 degrees is a horizontal line
+    theta = float(lines[0][0][1])
+    return math.degrees(theta) - 90.0
 
 
 def rotate_image(img: np.ndarray, angle: float, 
@@ -193,6 +247,11 @@ def deskew_image(img: np.ndarray, max_angle: float = 15.0) -> DeskewResult:
     Returns deskewed image and the angle that was corrected.
     """
     gray = _to_gray(img)
+    # The angle is scale-invariant, so detect it on a small copy; Canny/Hough cost goes
+    # with pixel count and ~1k px across is plenty for line angles.
+    scale = min(1.0, _SKEW_DETECT_MAX_DIM / max(gray.shape[:2]))
+    if scale < 1.0:
+        gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
     angle = detect_skew_angle(gray, max_angle)
     
     if abs(angle) < 0.1:
@@ -202,7 +261,9 @@ def deskew_image(img: np.ndarray, max_angle: float = 15.0) -> DeskewResult:
     return DeskewResult(image=rotated, angle=-angle)
 
 
-def enhance_for_ocr(rgb_img: np.ndarray, denoise: bool = True) -> np.ndarray:
+def enhance_for_ocr(rgb_img: np.ndarray, denoise: bool = True,
+                    denoise_quality: str = "fast", *,
+                    precomputed: Optional[dict] = None) -> np.ndarray:
     """
     Apply best-practice preprocessing for OCR accuracy.
     
@@ -212,48 +273,105 @@ def enhance_for_ocr(rgb_img: np.ndarray, denoise: bool = True) -> np.ndarray:
     3. CLAHE contrast normalization
     4. Sharpen
     5. Convert back to RGB for OCR engines that expect it
+    
+    `precomputed` may hold grayscale intermediates the caller already has for this
+    image ("clahe" and/or "sharp"); the stages they cover are skipped.
     """
-    rgb = _ensure_rgb(rgb_img)
+    precomputed = precomputed or {}
+    if "sharp" in precomputed:
+        return _ensure_rgb(precomputed["sharp"])
+    if "clahe" in precomputed:
+        return _ensure_rgb(_sharpen(precomputed["clahe"]))
+    
+    rgb = _ensure_rgb(_as_u8_contiguous(rgb_img))
     
     # Denoise color image
     if denoise:
-        rgb = _denoise_color(rgb, h=8)
+        rgb = _denoise_color(rgb, h=8, quality=denoise_quality)
     
-    # Convert to grayscale for processing
+    # Convert to grayscale for processing; the gray and CLAHE buffers are the only
+    # page-sized intermediates (the sharpened result goes back into the gray one).
     gray = _to_gray(rgb)
     
     # CLAHE for contrast normalization
-    gray = _clahe(gray, clip_limit=2.0, tile_size=8)
+    contrast = _clahe(gray, clip_limit=2.0, tile_size=8)
     
     # Sharpen
-    gray = _sharpen(gray)
+    gray = _sharpen(contrast, out=gray)
     
     # Convert back to RGB
     return _ensure_rgb(gray)
 
 
+def _ahash(img: np.ndarray, hash_size: int = 16) -> int:
+    """Average hash: downsampled grayscale thresholded at its mean, as a hash_size**2-bit int."""
+    small = cv2.resize(_to_gray(img), (hash_size, hash_size), interpolation=cv2.INTER_AREA)
+    return int.from_bytes(np.packbits(small > small.mean()).tobytes(), "big")
+
+
+def dedupe_variants(variants: List[Tuple[str, np.ndarray]],
+                    max_distance: int = 4) -> List[Tuple[str, np.ndarray]]:
+    """
+    Drop (name, image) variants that look the same as an earlier one.
+    
+    Two variants count as duplicates when their average hashes differ in at most
+    `max_distance` bits. Every variant that survives costs a full OCR pass, so this
+    check pays for itself. Order is preserved, and the first of each group is kept.
+    """
+    kept: List[Tuple[str, np.ndarray]] = []
+    hashes: List[int] = []
+    for name, img in variants:
+        h = _ahash(img)
+        if any(bin(h ^ other).count("1") <= max_distance for other in hashes):
+            continue
+        kept.append((name, img))
+        hashes.append(h)
+    return kept
+
+
 def build_ocr_variants(rgb_img: np.ndarray, 
                        scales: List[float],
                        deskew: bool = True,
-                       max_variants: int = 8) -> List[OCRVariant]:
+                       max_variants: int = 8,
+                       denoise_quality: str = "fast") -> List[OCRVariant]:
     """
     Build a set of OCR variants for aggressive text recovery.
     
     Creates multiple preprocessing variants and scales to maximize
-    text detection on difficult/noisy scans.
+    text detection on difficult/noisy scans. Eager form of iter_ocr_variants,
+    for callers that share the variants or need them all up front.
     
     Args:
         rgb_img: Input RGB image
         scales: List of scale factors (e.g., [1.0, 2.0])
         deskew: Whether to apply deskewing
         max_variants: Maximum number of variants to generate
+        denoise_quality: "fast" (bilateral) or "high" (non-local means) denoising
         
     Returns:
         List of OCRVariant objects ready for OCR
     """
-    variants: List[OCRVariant] = []
+    return list(iter_ocr_variants(rgb_img, scales, deskew, max_variants, denoise_quality))
+
+
+def iter_ocr_variants(rgb_img: np.ndarray, 
+                      scales: List[float],
+                      deskew: bool = True,
+                      max_variants: int = 8,
+                      denoise_quality: str = "fast") -> Iterator[OCRVariant]:
+    """
+    Yield OCR variants lazily: 1x variants ("enhanced" first), then upscales.
+    
+    The 1x variants share intermediates and are deduplicated against each other, so
+    they are built up front. Each upscaled copy (4x the pixels at 2x) is only rendered
+    when the consumer asks for it: a caller that stops after a confident pass never
+    pays for them, and a streaming caller holds one at a time.
     
-    rgb_img = _ensure_rgb(rgb_img)
+    Args are as for build_ocr_variants.
+    """
+    # One copy here (e.g. of _load_rgb's channel-reversed view) instead of an implicit one
+    # in every OpenCV call below that reads the page.
+    rgb_img = _ensure_rgb(_as_u8_contiguous(rgb_img))
     rotation_angle = 0.0
     
     # Apply deskewing if enabled
@@ -266,99 +384,118 @@ def build_ocr_variants(rgb_img: np.ndarray,
     gray = _to_gray(rgb_img)
     
     # Build preprocessing variants
-    denoised = _denoise(gray, h=10)
+    denoised = _denoise(gray, h=10, quality=denoise_quality)
     clahe_img = _clahe(denoised, clip_limit=2.0)
-    sharp = _sharpen(clahe_img)
+    sharp = _sharpen(clahe_img, out=denoised)  # denoised isn't needed past CLAHE
     adaptive_bin = _adaptive_thresh(clahe_img, block_size=35, c=11)
-    otsu_bin = _otsu_thresh(clahe_img)
-    
-    # Enhanced color variant
-    enhanced_rgb = enhance_for_ocr(rgb_img, denoise=True)
     
+    # Derived variants stay single-channel (HxW): expanding them to RGB triples their
+    # size only for the engines to convert back to gray. "enhanced" is enhance_for_ocr's
+    # denoise -> CLAHE -> sharpen chain, i.e. the sharpened image (there's no separate
+    # "sharp" pass; it would be the same pixels).
     base_variants = [
         ("original", rgb_img),
-        ("enhanced", enhanced_rgb),
-        ("clahe", _ensure_rgb(clahe_img)),
-        ("sharp", _ensure_rgb(sharp)),
-        ("adaptive_bin", _ensure_rgb(adaptive_bin)),
+        ("enhanced", sharp),
+        ("clahe", clahe_img),
+        ("adaptive_bin", adaptive_bin),
     ]
-    
-    # Add variants at scale 1.0
-    for name, img in base_variants:
-        if len(variants) >= max_variants:
-            break
-        variants.append(OCRVariant(
+    # Clean pages make several of these near-identical; each would be a wasted pass (and
+    # upscaled copy), so only visually distinct ones go on.
+    base_variants = dedupe_variants(base_variants)
+    
+    # Variants at scale 1.0; "enhanced" is usually the best single pass, so it leads
+    emitted = 0
+    for name, img in sorted(base_variants, key=lambda item: item[0] != "enhanced"):
+        if emitted >= max_variants:
+            return
+        emitted += 1
+        yield OCRVariant(
             name=name, 
             image=img, 
             scale=1.0,
             rotation_angle=rotation_angle
-        ))
+        )
     
-    # Add scaled variants for small text
+    # Scaled variants for small text, rendered on demand
     h, w = rgb_img.shape[:2]
     for s in scales:
         if s <= 1.0:
             continue
         for name, img in base_variants[:3]:  # Only scale top 3 variants
-            if len(variants) >= max_variants:
-                break
+            if emitted >= max_variants:
+                return
+            # Bilinear: a fraction of bicubic's kernel work, and the sharpened/contrast-
+            # normalized sources keep glyph edges crisp enough for the recognizers.
             scaled = cv2.resize(
                 img, 
                 (int(w * s), int(h * s)), 
-                interpolation=cv2.INTER_CUBIC
+                interpolation=cv2.INTER_LINEAR
             )
-            variants.append(OCRVariant(
+            emitted += 1
+            yield OCRVariant(
                 name=f"{name}_x{int(s)}",
                 image=scaled,
                 scale=s,
                 rotation_angle=rotation_angle
-            ))
-    
-    return variants
+            )
 
 
-def transform_bbox_for_deskew(bbox: Tuple[float, float, float, float],
-                               angle: float,
-                               original_size: Tuple[int, int],
-                               new_size: Tuple[int, int]) -> Tuple[float, float, float, float]:
+def transform_bboxes_for_deskew(bboxes: np.ndarray,
+                                 angle: float,
+                                 original_size: Tuple[int, int],
+                                 new_size: Tuple[int, int]) -> np.ndarray:
     """
-    Transform bounding box coordinates from deskewed image back to original.
+    Transform a batch of bounding boxes from deskewed image back to original.
     
     Args:
-        bbox: (x, y, width, height) in deskewed image
+        bboxes: (N, 4) array of (x, y, width, height) in deskewed image
         angle: Rotation angle that was applied (degrees)
         original_size: (width, height) of original image
         new_size: (width, height) of deskewed image
         
     Returns:
-        (x, y, width, height) in original image coordinates
+        (N, 4) float64 array of (x, y, width, height) in original image coordinates
     """
+    bboxes = np.asarray(bboxes, dtype=np.float64).reshape(-1, 4)
     if abs(angle) < 0.01:
-        return bbox
+        return bboxes
     
-    x, y, w, h = bbox
     orig_w, orig_h = original_size
     new_w, new_h = new_size
+    sizes = bboxes[:, 2:]
     
-    # Calculate center points in deskewed image
-    cx = x + w / 2
-    cy = y + h / 2
+    # Box centers, relative to the center of the deskewed image
+    centers = bboxes[:, :2] + sizes / 2 - (new_w / 2, new_h / 2)
     
-    # Translate to center of deskewed image
-    cx -= new_w / 2
-    cy -= new_h / 2
-    
-    # Rotate back (negative angle)
+    # Rotate back (negative angle) and translate to original image center
     angle_rad = math.radians(-angle)
     cos_a = math.cos(angle_rad)
     sin_a = math.sin(angle_rad)
+    rot = np.array([[cos_a, -sin_a], [sin_a, cos_a]])
+    centers = centers @ rot.T + (orig_w / 2, orig_h / 2)
     
-    new_cx = cx * cos_a - cy * sin_a
-    new_cy = cx * sin_a + cy * cos_a
+    # Width/height don't change much for small angles
+    return np.column_stack([centers - sizes / 2, sizes])
+
+
+def transform_bbox_for_deskew(bbox: Tuple[float, float, float, float],
+                               angle: float,
+                               original_size: Tuple[int, int],
+                               new_size: Tuple[int, int]) -> Tuple[float, float, float, float]:
+    """
+    Transform bounding box coordinates from deskewed image back to original.
     
-    # Translate to original image center
-    new_cx += orig_w / 2
-    new_cy += orig_h / 2
+    Single-box form of transform_bboxes_for_deskew.
     
-    # Return bbox (note: width/height don't change much for small angles)
-    return (new_cx - w / 2, new_cy - h / 2, w, h)
+    Args:
+        bbox: (x, y, width, height) in deskewed image
+        angle: Rotation angle that was applied (degrees)
+        original_size: (width, height) of original image
+        new_size: (width, height) of deskewed image
+        
+    Returns:
+        (x, y, width, height) in original image coordinates
+    """
+    if abs(angle) < 0.01:
+        return bbox
+    return tuple(transform_bboxes_for_deskew(bbox, angle, original_size, new_size)[0].tolist())
@@ -1,9 +1,11 @@
 """OCR processing pipeline."""
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Optional
 import logging
 from datetime import datetime
+import numpy as np
 from database import get_db
 from models import OCRText, ImagePage
 from ocr.engine import get_ocr_engine, OCREngine
@@ -20,12 +22,17 @@ class OCRProcessor:
         # Otherwise, use the globally configured engine.
         self.ocr_engine = ocr_engine or get_ocr_engine()
     
-    def process_image_page(self, page_id: str) -> Optional[str]:
+    def process_image_page(self, page_id: str, image_bytes: Optional[bytes] = None,
+                           ocr_result: Optional[Dict] = None) -> Optional[str]:
         """
         Process an image page through OCR.
         
         Args:
             page_id: Image page ID
+            image_bytes: Optional encoded page image already in memory. Used instead of
+                reading the page from disk when the engine supports it (Textract).
+            ocr_result: Optional engine result already computed for this page (batched runs);
+                stored as-is instead of running the engine again.
             
         Returns:
             OCR text ID if successful, None otherwise
@@ -46,13 +53,18 @@ class OCRProcessor:
                 return existing.id if existing else None
             
             # Perform OCR
-            image_path = Path(page.image_path)
-            if not image_path.exists():
-                logger.error(f"Image file not found: {image_path}")
-                return None
-            
-            logger.info(f"Processing OCR for {page_id}")
-            ocr_result = self.ocr_engine.extract_text(image_path)
+            if ocr_result is None:
+                image_path = Path(page.image_path)
+                from_bytes = image_bytes is not None and hasattr(self.ocr_engine, "extract_text_from_bytes")
+                if not from_bytes and not image_path.exists():
+                    logger.error(f"Image file not found: {image_path}")
+                    return None
+                
+                logger.info(f"Processing OCR for {page_id}")
+                if from_bytes:
+                    ocr_result = self.ocr_engine.extract_text_from_bytes(image_bytes, image_path)
+                else:
+                    ocr_result = self.ocr_engine.extract_text(image_path)
             
             if not ocr_result['text']:
                 logger.warning(f"No text extracted from {page_id}")
@@ -63,10 +75,13 @@ class OCRProcessor:
             
             # Calculate overall bounding box
             if ocr_result['word_boxes']:
-                min_x = min(box['x'] for box in ocr_result['word_boxes'])
-                min_y = min(box['y'] for box in ocr_result['word_boxes'])
-                max_x = max(box['x'] + box['width'] for box in ocr_result['word_boxes'])
-                max_y = max(box['y'] + box['height'] for box in ocr_result['word_boxes'])
+                # One (N, 4) array instead of four passes over the word dicts
+                boxes = np.array(
+                    [(box['x'], box['y'], box['width'], box['height']) for box in ocr_result['word_boxes']],
+                    dtype=np.float64
+                )
+                min_x, min_y = boxes[:, :2].min(axis=0).tolist()
+                max_x, max_y = (boxes[:, :2] + boxes[:, 2:]).max(axis=0).tolist()
             else:
                 min_x = min_y = max_x = max_y = 0.0
             
@@ -110,17 +125,47 @@ class OCRProcessor:
         # IMPORTANT: don't return ORM instances outside the session context
         # (can cause DetachedInstanceError when accessing attributes later).
         with get_db() as db:
-            page_ids = [
-                row[0]
-                for row in db.query(ImagePage.id)
+            pages = [
+                (row[0], row[1], row[2])
+                for row in db.query(ImagePage.id, ImagePage.image_path, ImagePage.ocr_processed)
                 .filter(ImagePage.document_id == document_id)
                 .all()
             ]
+            # Pages already OCR'd count when they have text (what process_image_page would
+            # report for them); one query here instead of two per page.
+            with_text = {
+                row[0]
+                for row in db.query(OCRText.image_page_id)
+                .filter(OCRText.document_id == document_id)
+                .all()
+            }
+
+        processed = sum(1 for page_id, _, done in pages if done and page_id in with_text)
+        pages = [page for page in pages if not page[2]]
+
+        if hasattr(self.ocr_engine, "iter_extract_text"):
+            # Local engines: stream the document's pending pages so the next page is decoded and
+            # preprocessed while this one is on the model.
+            batch = [(page_id, Path(path)) for page_id, path, _ in pages if Path(path).exists()]
+            batched_ids = {page_id for page_id, _ in batch}
+            results = self.ocr_engine.iter_extract_text([path for _, path in batch])
+            for (page_id, _), (_, ocr_result) in zip(batch, results):
+                logger.info(f"Processing OCR for {page_id}")
+                if self.process_image_page(page_id, ocr_result=ocr_result):
+                    processed += 1
+            pages = [page for page in pages if page[0] not in batched_ids]
 
-        processed = 0
-        for page_id in page_ids:
-            if self.process_image_page(page_id):
-                processed += 1
+        # Remaining pages (Textract): each page is a network round-trip, so keep several in
+        # flight. Every call opens its own DB session.
+        page_ids = [page_id for page_id, _, _ in pages]
+        workers = min(Config.OCR_CONCURRENCY, len(page_ids))
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ocr-page") as executor:
+                processed += sum(1 for ocr_id in executor.map(self.process_image_page, page_ids) if ocr_id)
+        else:
+            for page_id in page_ids:
+                if self.process_image_page(page_id):
+                    processed += 1
 
         return processed
 
@@ -1,13 +1,20 @@
 """AWS Rekognition integration for image label detection."""
 import os
 import io
+import time
+import hashlib
 import uuid
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Dict, List, Optional
 from datetime import datetime
 from PIL import Image
 
+from config import Config
+from ocr.textract import mapped_file, use_orjson_for_botocore
+
 # Load .env file for AWS credentials
 try:
     from dotenv import load_dotenv
@@ -20,19 +27,111 @@ logger = logging.getLogger(__name__)
 # Check if boto3 is available
 try:
     import boto3
+    from botocore.config import Config as BotoConfig
     from botocore.exceptions import ClientError, NoCredentialsError
     BOTO3_AVAILABLE = True
 except ImportError:
     BOTO3_AVAILABLE = False
     logger.warning("boto3 not installed. AWS Rekognition features disabled.")
 
+# Rekognition's limit for images passed inline as Bytes
+_MAX_IMAGE_BYTES = 5000000
+
+# One client (and HTTPS connection pool) per credentials/region for the whole process, shared by
+# every RekognitionProcessor and worker thread.
+_clients: Dict[tuple, object] = {}
+_clients_lock = threading.Lock()
+
+
+def _get_client(access_key: Optional[str], secret_key: Optional[str], region: str):
+    key = (access_key, secret_key, region)
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                if Config.AWS_ORJSON_PARSER:
+                    use_orjson_for_botocore()
+                client = _clients[key] = boto3.client(
+                    'rekognition',
+                    aws_access_key_id=access_key,
+                    aws_secret_access_key=secret_key,
+                    region_name=region,
+                    # Default pool is 10 connections; concurrent page workers would queue on it.
+                    # Adaptive retries absorb ProvisionedThroughputExceeded / throttling.
+                    config=BotoConfig(
+                        max_pool_connections=64,
+                        tcp_keepalive=True,
+                        connect_timeout=3,
+                        read_timeout=30,
+                        retries={'mode': 'adaptive', 'max_attempts': 10},
+                    ),
+                )
+    return client
+
+
+def _content_sha256(image_path: Path) -> str:
+    """SHA-256 of an image file, hashed straight from its memory map."""
+    with mapped_file(image_path) as data:
+        return hashlib.sha256(data).hexdigest()
+
+
+class _RateLimiter:
+    """Token bucket shared by threads: acquire() blocks until a call is allowed (rate <= 0: no limit)."""
+    
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._tokens = rate
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+# One token bucket for the whole process: every RekognitionProcessor (one per API request, plus
+# any a script builds) and all their worker threads draw on the same REKOGNITION_MAX_TPS.
+_rate_limiter: Optional[_RateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def _get_rate_limiter() -> _RateLimiter:
+    global _rate_limiter
+    if _rate_limiter is None:
+        with _rate_limiter_lock:
+            if _rate_limiter is None:
+                _rate_limiter = _RateLimiter(Config.REKOGNITION_MAX_TPS)
+    return _rate_limiter
+
 
 class RekognitionProcessor:
     """Processes images through AWS Rekognition for label detection."""
     
-    def __init__(self):
+    def __init__(self, recognizer=None):
+        """
+        Args:
+            recognizer: Optional local celebrity recognizer (see ocr.face_recognizer). Defaults to
+                the shared local recognizer when CELEBRITY_BACKEND=local, else Rekognition only.
+        """
         self._client = None
         self.enabled = self._check_enabled()
+        if recognizer is None and Config.CELEBRITY_BACKEND == "local":
+            from ocr.face_recognizer import get_face_recognizer
+            recognizer = get_face_recognizer()
+        self.recognizer = recognizer
+        # Celebrity recognition also works without AWS credentials when running locally
+        self.celebrities_enabled = self.enabled or self.recognizer is not None
     
     def _check_enabled(self) -> bool:
         """Check if Rekognition is available and configured."""
@@ -51,54 +150,82 @@ class RekognitionProcessor:
     
     @property
     def client(self):
-        """Lazy load Rekognition client."""
+        """Lazy load Rekognition client (shared by worker threads; boto3 clients are thread-safe)."""
         if self._client is None and self.enabled:
-            self._client = boto3.client(
-                'rekognition',
-                aws_access_key_id=os.environ.get('AWS_ACCESS_KEY_ID'),
-                aws_secret_access_key=os.environ.get('AWS_SECRET_ACCESS_KEY'),
-                region_name=os.environ.get('AWS_DEFAULT_REGION', 'us-east-1')
+            self._client = _get_client(
+                os.environ.get('AWS_ACCESS_KEY_ID'),
+                os.environ.get('AWS_SECRET_ACCESS_KEY'),
+                os.environ.get('AWS_DEFAULT_REGION', 'us-east-1')
             )
         return self._client
     
-    def _resize_image_for_rekognition(self, image_path: Path, max_bytes: int = 5000000) -> bytes:
+    def _resize_image_for_rekognition(self, image_path: Path, max_bytes: int = _MAX_IMAGE_BYTES) -> bytes:
         """
         Resize image to fit within Rekognition's 5MB limit.
         Returns JPEG bytes that are under the size limit.
+        
+        The first encode uses a quality estimated from how far over the limit the file is;
+        if that's still too big, a short binary search finds the highest quality that fits.
+        Dimensions are only reduced when no quality in range fits.
         """
-        with open(image_path, 'rb') as f:
-            original_bytes = f.read()
+        size = image_path.stat().st_size
         
         # If already under limit, return as-is
-        if len(original_bytes) <= max_bytes:
-            return original_bytes
+        if size <= max_bytes:
+            with open(image_path, 'rb') as f:
+                return f.read()
         
-        logger.info(f"Resizing large image: {image_path.name} ({len(original_bytes)/1024/1024:.1f}MB)")
+        logger.info(f"Resizing large image: {image_path.name} ({size/1024/1024:.1f}MB)")
         
         img = Image.open(image_path)
         
-        # Convert to RGB if necessary (for PNG with alpha)
-        if img.mode in ('RGBA', 'P'):
+        # Convert to RGB if necessary (for PNG with alpha, palette, 16-bit, ...)
+        if img.mode not in ('RGB', 'L'):
             img = img.convert('RGB')
         
-        # Try reducing quality first
-        for quality in [85, 75, 65, 55, 45]:
+        def encode(image: Image.Image, quality: int) -> bytes:
             buffer = io.BytesIO()
-            img.save(buffer, format='JPEG', quality=quality)
-            if buffer.tell() <= max_bytes:
-                logger.info(f"Resized to {buffer.tell()/1024/1024:.1f}MB with quality={quality}")
-                return buffer.getvalue()
+            # Optimized Huffman tables, progressive scan and 4:2:0 chroma: smaller at the same quality
+            image.save(buffer, format='JPEG', quality=quality, optimize=True, progressive=True, subsampling=2)
+            return buffer.getvalue()
         
-        # If still too big, reduce dimensions
-        while True:
-            img = img.resize((int(img.width * 0.75), int(img.height * 0.75)), Image.Resampling.LANCZOS)
-            buffer = io.BytesIO()
-            img.save(buffer, format='JPEG', quality=50)
-            if buffer.tell() <= max_bytes or img.width < 200:
-                logger.info(f"Resized to {buffer.tell()/1024/1024:.1f}MB at {img.width}x{img.height}")
-                return buffer.getvalue()
+        quality = int(min(90, max(30, 90 * (max_bytes / size) ** 0.5)))
+        data = encode(img, quality)
+        if len(data) <= max_bytes:
+            logger.info(f"Resized to {len(data)/1024/1024:.1f}MB with quality={quality}")
+            return data
+        
+        # Highest quality below the first guess that fits (3 encodes at most)
+        low, high, best = 30, quality - 1, None
+        for _ in range(3):
+            if low > high:
+                break
+            mid = (low + high) // 2
+            data = encode(img, mid)
+            if len(data) <= max_bytes:
+                best, quality, low = data, mid, mid + 1
+            else:
+                high = mid - 1
+        if best is not None:
+            logger.info(f"Resized to {len(best)/1024/1024:.1f}MB with quality={quality}")
+            return best
         
-        return buffer.getvalue()
+        # If still too big, reduce dimensions. Encoded size tracks pixel count, so start from the
+        # estimated fitting size instead of stepping down from full resolution.
+        scale = min(0.75, 0.9 * (max_bytes / len(data)) ** 0.5)
+        while True:
+            target = (max(1, int(img.width * scale)), max(1, int(img.height * scale)))
+            with Image.open(image_path) as source:
+                # JPEG sources are decoded directly at 1/2, 1/4 or 1/8 scale when that's still >= target
+                source.draft(img.mode, target)
+                small = source if source.mode == img.mode else source.convert(img.mode)
+                # Integer box-reduce first, then bilinear (this copy only feeds recognition)
+                small = small.resize(target, Image.Resampling.BILINEAR, reducing_gap=2.0)
+            data = encode(small, 50)
+            if len(data) <= max_bytes or small.width < 200:
+                logger.info(f"Resized to {len(data)/1024/1024:.1f}MB at {small.width}x{small.height}")
+                return data
+            scale *= 0.75
     
     def detect_labels(self, image_path: Path, max_labels: int = 20, 
                       min_confidence: float = 70.0) -> List[Dict]:
@@ -117,14 +244,13 @@ class RekognitionProcessor:
             return []
         
         try:
-            with open(image_path, 'rb') as f:
-                image_bytes = f.read()
-            
-            response = self.client.detect_labels(
-                Image={'Bytes': image_bytes},
-                MaxLabels=max_labels,
-                MinConfidence=min_confidence
-            )
+            _get_rate_limiter().acquire()
+            with mapped_file(image_path) as image_bytes:
+                response = self.client.detect_labels(
+                    Image={'Bytes': image_bytes},
+                    MaxLabels=max_labels,
+                    MinConfidence=min_confidence
+                )
             
             labels = []
             for label in response.get('Labels', []):
@@ -169,13 +295,12 @@ class RekognitionProcessor:
             return []
         
         try:
-            with open(image_path, 'rb') as f:
-                image_bytes = f.read()
-            
-            response = self.client.detect_faces(
-                Image={'Bytes': image_bytes},
-                Attributes=['ALL']
-            )
+            _get_rate_limiter().acquire()
+            with mapped_file(image_path) as image_bytes:
+                response = self.client.detect_faces(
+                    Image={'Bytes': image_bytes},
+                    Attributes=['ALL']
+                )
             
             faces = []
             for face in response.get('FaceDetails', []):
@@ -206,16 +331,30 @@ class RekognitionProcessor:
     
     def recognize_celebrities(self, image_path: Path) -> List[Dict]:
         """Recognize celebrities in an image. Auto-resizes large images."""
+        if self.recognizer is not None:
+            try:
+                celebrities, uncertain = self.recognizer.recognize_batch([image_path])[0]
+            except Exception as e:
+                logger.error(f"Error recognizing celebrities locally for {image_path}: {e}")
+                celebrities, uncertain = [], True
+            if not (uncertain and self.enabled):
+                return celebrities
+        return self._rekognition_celebrities(image_path)
+    
+    def _rekognition_celebrities(self, image_path: Path) -> List[Dict]:
         if not self.enabled:
             return []
         
         try:
-            # Auto-resize if needed to fit within 5MB limit
-            image_bytes = self._resize_image_for_rekognition(Path(image_path))
-            
-            response = self.client.recognize_celebrities(
-                Image={'Bytes': image_bytes}
-            )
+            image_path = Path(image_path)
+            _get_rate_limiter().acquire()
+            if image_path.stat().st_size <= _MAX_IMAGE_BYTES:
+                with mapped_file(image_path) as image_bytes:
+                    response = self.client.recognize_celebrities(Image={'Bytes': image_bytes})
+            else:
+                # Auto-resize to fit within the 5MB limit
+                image_bytes = self._resize_image_for_rekognition(image_path)
+                response = self.client.recognize_celebrities(Image={'Bytes': image_bytes})
             
             celebrities = []
             for celeb in response.get('CelebrityFaces', []):
@@ -238,6 +377,65 @@ class RekognitionProcessor:
             logger.error(f"Error recognizing celebrities for {image_path}: {e}")
             return []
     
+    def _copy_cached_results(self, model, page_id: str, content_sha256: str, overrides: Dict,
+                             min_confidence: Optional[float] = None) -> Optional[int]:
+        """
+        Copy `model` rows (labels or celebrities) stored for another page with the same image
+        content, so duplicate images skip the API call.
+        
+        With min_confidence (celebrities), the source must have been recognized with a threshold
+        no higher than it - its rows were already cut there - and counts even if it found nobody.
+        The copied rows are cut at min_confidence, which is then recorded for page_id as well.
+        
+        Returns:
+            Number of rows stored for page_id, or None when no identical page has usable results yet
+        """
+        from database import bulk_store, get_db
+        from models import ImagePage
+        
+        columns = [c for c in model.__table__.columns if c.name not in ("id", "detected_at", *overrides)]
+        with get_db() as db:
+            if min_confidence is None:
+                source = db.query(model.image_page_id).join(
+                    ImagePage, ImagePage.id == model.image_page_id
+                ).filter(
+                    ImagePage.content_sha256 == content_sha256,
+                    ImagePage.id != page_id
+                ).first()
+            else:
+                source = db.query(ImagePage.id).filter(
+                    ImagePage.content_sha256 == content_sha256,
+                    ImagePage.id != page_id,
+                    ImagePage.celebrity_min_confidence <= min_confidence
+                ).first()
+            if source is None:
+                return None
+            
+            rows = [
+                {**row._asdict(), **overrides, "id": str(uuid.uuid4())}
+                for row in db.query(*columns).filter(model.image_page_id == source[0]).all()
+                if min_confidence is None or row.confidence >= min_confidence
+            ]
+            count = bulk_store(db, model, rows) if rows else 0
+            if min_confidence is not None:
+                self._update_page(db, page_id, {ImagePage.celebrity_min_confidence: min_confidence})
+            db.commit()
+        return count
+    
+    @staticmethod
+    def _update_page(db, page_id: str, values: Dict):
+        """Set ImagePage columns (content hash, celebrity threshold) for one page."""
+        from models import ImagePage
+        db.query(ImagePage).filter(ImagePage.id == page_id).update(values, synchronize_session=False)
+    
+    def _save_content_hash(self, page_id: str, content_sha256: str):
+        """Record a page's hash as soon as it's computed (results or not), so it's never hashed again."""
+        from database import get_db
+        from models import ImagePage
+        with get_db() as db:
+            self._update_page(db, page_id, {ImagePage.content_sha256: content_sha256})
+            db.commit()
+    
     def process_image_page(self, page_id: str) -> int:
         """
         Process an image page through Rekognition and store labels.
@@ -252,70 +450,139 @@ class RekognitionProcessor:
         from models import ImagePage, ImageLabel
         
         with get_db() as db:
-            page = db.query(ImagePage).filter(ImagePage.id == page_id).first()
+            page = db.query(
+                ImagePage.id, ImagePage.document_id, ImagePage.image_path, ImagePage.content_sha256
+            ).filter(ImagePage.id == page_id).first()
             if not page:
                 logger.error(f"Image page {page_id} not found")
                 return 0
             
             # Check if already processed (has labels)
-            existing = db.query(ImageLabel).filter(
+            existing = db.query(ImageLabel.id).filter(
                 ImageLabel.image_page_id == page_id
             ).first()
             if existing:
                 logger.debug(f"Page {page_id} already has labels")
                 return 0
+        
+        return self._process_labels_for_page(tuple(page))
+    
+    def _process_labels_for_page(self, page: tuple) -> int:
+        """
+        Detect and store labels for a page known to be unlabelled.
+        
+        `page` is (id, document_id, image_path, content_sha256); as for celebrities, the API call
+        runs outside any DB transaction.
+        """
+        from database import bulk_store, get_db
+        from models import ImageLabel
+        
+        page_id, document_id, image_path, content_sha256 = page
+        image_path = Path(image_path)
+        if not image_path.exists():
+            logger.error(f"Image not found: {image_path}")
+            return 0
+        
+        if content_sha256 is None:
+            content_sha256 = _content_sha256(image_path)
+            self._save_content_hash(page_id, content_sha256)
+        cached = self._copy_cached_results(
+            ImageLabel, page_id, content_sha256, {"image_page_id": page_id, "document_id": document_id}
+        )
+        if cached is not None:
+            logger.info(f"Copied {cached} labels for {page_id} from an identical image")
+            return cached
+        
+        # Detect labels
+        logger.info(f"Detecting labels for {page_id}")
+        labels = self.detect_labels(image_path, max_labels=20, min_confidence=70.0)
+        
+        # Store labels
+        rows = []
+        for label_data in labels:
+            base = {
+                "image_page_id": page_id,
+                "document_id": document_id,
+                "label_name": label_data['name'],
+                "parent_labels": label_data['parents'],
+                "categories": label_data['categories'],
+            }
+            # Store main label
+            rows.append({
+                **base,
+                "id": str(uuid.uuid4()),
+                "confidence": label_data['confidence'],
+                "has_bbox": False,
+            })
             
-            image_path = Path(page.image_path)
-            if not image_path.exists():
-                logger.error(f"Image not found: {image_path}")
-                return 0
-            
-            # Detect labels
-            logger.info(f"Detecting labels for {page_id}")
-            labels = self.detect_labels(image_path, max_labels=20, min_confidence=70.0)
-            
-            # Store labels
-            count = 0
-            for label_data in labels:
-                # Store main label
-                label = ImageLabel(
-                    id=str(uuid.uuid4()),
-                    image_page_id=page_id,
-                    document_id=page.document_id,
-                    label_name=label_data['name'],
-                    label_name_lower=label_data['name'].lower(),
-                    confidence=label_data['confidence'],
-                    parent_labels=label_data['parents'],
-                    categories=label_data['categories'],
-                    has_bbox=False
-                )
-                db.add(label)
-                count += 1
-                
-                # Store instances with bounding boxes
-                for instance in label_data.get('instances', []):
-                    bbox = instance['bbox']
-                    instance_label = ImageLabel(
-                        id=str(uuid.uuid4()),
-                        image_page_id=page_id,
-                        document_id=page.document_id,
-                        label_name=label_data['name'],
-                        label_name_lower=label_data['name'].lower(),
-                        confidence=instance['confidence'],
-                        parent_labels=label_data['parents'],
-                        categories=label_data['categories'],
-                        has_bbox=True,
-                        bbox_left=bbox['left'],
-                        bbox_top=bbox['top'],
-                        bbox_width=bbox['width'],
-                        bbox_height=bbox['height']
-                    )
-                    db.add(instance_label)
-                    count += 1
-            
+            # Store instances with bounding boxes
+            for instance in label_data.get('instances', []):
+                bbox = instance['bbox']
+                rows.append({
+                    **base,
+                    "id": str(uuid.uuid4()),
+                    "confidence": instance['confidence'],
+                    "has_bbox": True,
+                    "bbox_left": bbox['left'],
+                    "bbox_top": bbox['top'],
+                    "bbox_width": bbox['width'],
+                    "bbox_height": bbox['height'],
+                })
+        if not rows:
+            return 0
+        
+        with get_db() as db:
+            count = bulk_store(db, ImageLabel, rows)
             db.commit()
-            logger.info(f"Stored {count} labels for {page_id}")
-            return count
+        
+        logger.info(f"Stored {count} labels for {page_id}")
+        return count
+    
+    def process_all_for_labels(self, limit: int = 100) -> Dict:
+        """
+        Process unlabelled image pages through label detection.
+        
+        Returns:
+            Dict with processing statistics
+        """
+        if not self.enabled:
+            return {'error': 'Rekognition not enabled', 'processed': 0, 'labels_added': 0}
+        
+        from sqlalchemy import exists
+        from database import get_db
+        from models import ImagePage, ImageLabel
+        
+        with get_db() as db:
+            pages = [
+                tuple(row)
+                for row in db.query(
+                    ImagePage.id, ImagePage.document_id, ImagePage.image_path, ImagePage.content_sha256
+                )
+                .filter(~exists().where(ImageLabel.image_page_id == ImagePage.id))
+                .limit(limit)
+                .all()
+            ]
+        
+        total_labels = 0
+        processed = 0
+        
+        # Same shape as process_all_for_celebrities: the calls are network-bound, so threads sharing
+        # one client and the token bucket keep REKOGNITION_CONCURRENCY calls in flight under the TPS cap
+        workers = max(1, min(Config.REKOGNITION_CONCURRENCY, len(pages)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rekognition") as executor:
+            futures = {executor.submit(self._process_labels_for_page, page): page[0] for page in pages}
+            for future in as_completed(futures):
+                try:
+                    total_labels += future.result()
+                except Exception as e:
+                    logger.error(f"Error processing labels for {futures[future]}: {e}")
+                processed += 1
+        
+        return {
+            'processed': processed,
+            'labels_added': total_labels,
+            'remaining': len(pages) - processed if len(pages) > processed else 0
+        }
     
     def process_celebrities(self, page_id: str, min_confidence: float = 90.0) -> int:
         """
@@ -328,65 +595,96 @@ class RekognitionProcessor:
         Returns:
             Number of celebrities detected and stored
         """
-        if not self.enabled:
+        if not self.celebrities_enabled:
             return 0
         
         from database import get_db
         from models import ImagePage, Celebrity
         
         with get_db() as db:
-            page = db.query(ImagePage).filter(ImagePage.id == page_id).first()
+            page = db.query(
+                ImagePage.id, ImagePage.document_id, ImagePage.page_number, ImagePage.image_path,
+                ImagePage.content_sha256
+            ).filter(ImagePage.id == page_id).first()
             if not page:
                 logger.error(f"Image page {page_id} not found")
                 return 0
             
             # Check if already processed for celebrities
-            existing = db.query(Celebrity).filter(
+            existing = db.query(Celebrity.id).filter(
                 Celebrity.image_page_id == page_id
             ).first()
             if existing:
                 logger.debug(f"Page {page_id} already processed for celebrities")
                 return 0
-            
-            image_path = Path(page.image_path)
-            if not image_path.exists():
-                logger.error(f"Image not found: {image_path}")
-                return 0
-            
-            # Recognize celebrities
+        
+        return self._process_celebrities_for_page(tuple(page), min_confidence)
+    
+    def _process_celebrities_for_page(self, page: tuple, min_confidence: float,
+                                      celebrities: Optional[List[Dict]] = None, recognize=None) -> int:
+        """
+        Recognize and store celebrities for a page known to be unprocessed.
+        
+        `page` is (id, document_id, page_number, image_path, content_sha256), as selected by the
+        callers; the API call runs outside any DB transaction and the rows go in with one INSERT.
+        `celebrities` skips recognition when the caller already has the page's results;
+        `recognize` replaces recognize_celebrities otherwise.
+        """
+        from database import bulk_store, get_db
+        from models import Celebrity, ImagePage
+        
+        page_id, document_id, page_number, image_path, content_sha256 = page
+        image_path = Path(image_path)
+        if not image_path.exists():
+            logger.error(f"Image not found: {image_path}")
+            return 0
+        
+        if content_sha256 is None:
+            content_sha256 = _content_sha256(image_path)
+            self._save_content_hash(page_id, content_sha256)
+        
+        # Recognize celebrities
+        if celebrities is None:
+            cached = self._copy_cached_results(
+                Celebrity, page_id, content_sha256,
+                {"image_page_id": page_id, "document_id": document_id, "page_number": page_number},
+                min_confidence=min_confidence
+            )
+            if cached is not None:
+                logger.info(f"Copied {cached} celebrities for {page_id} from an identical image")
+                return cached
             logger.info(f"Recognizing celebrities for {page_id}")
-            celebrities = self.recognize_celebrities(image_path)
-            
-            # Store celebrities above confidence threshold
-            count = 0
-            for celeb_data in celebrities:
-                if celeb_data['confidence'] < min_confidence:
-                    continue
-                    
-                bbox = celeb_data.get('bbox', {})
-                celebrity = Celebrity(
-                    id=str(uuid.uuid4()),
-                    image_page_id=page_id,
-                    document_id=page.document_id,
-                    page_number=page.page_number,
-                    name=celeb_data['name'],
-                    name_lower=celeb_data['name'].lower(),
-                    confidence=celeb_data['confidence'],
-                    urls=celeb_data.get('urls', []),
-                    bbox_left=bbox.get('left', 0),
-                    bbox_top=bbox.get('top', 0),
-                    bbox_width=bbox.get('width', 0),
-                    bbox_height=bbox.get('height', 0)
-                )
-                db.add(celebrity)
-                count += 1
-                logger.info(f"Found celebrity: {celeb_data['name']} ({celeb_data['confidence']:.1f}%)")
-            
+            celebrities = (recognize or self.recognize_celebrities)(image_path)
+        
+        # Store celebrities above confidence threshold
+        rows = []
+        for celeb_data in celebrities:
+            if celeb_data['confidence'] < min_confidence:
+                continue
+                
+            bbox = celeb_data.get('bbox', {})
+            rows.append({
+                "id": str(uuid.uuid4()),
+                "image_page_id": page_id,
+                "document_id": document_id,
+                "page_number": page_number,
+                "name": celeb_data['name'],
+                "confidence": celeb_data['confidence'],
+                "urls": celeb_data.get('urls', []),
+                "bbox_left": bbox.get('left', 0),
+                "bbox_top": bbox.get('top', 0),
+                "bbox_width": bbox.get('width', 0),
+                "bbox_height": bbox.get('height', 0),
+            })
+            logger.info(f"Found celebrity: {celeb_data['name']} ({celeb_data['confidence']:.1f}%)")
+        # The threshold is recorded even when nobody was found, so identical pages reuse that too
+        with get_db() as db:
+            count = bulk_store(db, Celebrity, rows) if rows else 0
+            self._update_page(db, page_id, {ImagePage.celebrity_min_confidence: min_confidence})
             db.commit()
-            
-            if count > 0:
-                logger.info(f"Stored {count} celebrities for {page_id}")
-            return count
+        
+        logger.info(f"Stored {count} celebrities for {page_id}")
+        return count
     
     def process_all_for_celebrities(self, limit: int = 1000, min_confidence: float = 90.0) -> Dict:
         """
@@ -395,29 +693,78 @@ class RekognitionProcessor:
         Returns:
             Dict with processing statistics
         """
-        if not self.enabled:
+        if not self.celebrities_enabled:
             return {'error': 'Rekognition not enabled', 'processed': 0, 'celebrities_found': 0}
         
+        from sqlalchemy import exists
         from database import get_db
         from models import ImagePage, Celebrity
         
         with get_db() as db:
-            # Find pages not yet processed for celebrities
-            processed_page_ids = db.query(Celebrity.image_page_id).distinct().subquery()
-            
-            unprocessed = db.query(ImagePage.id).filter(
-                ~ImagePage.id.in_(processed_page_ids)
-            ).limit(limit).all()
-            
-            page_ids = [row[0] for row in unprocessed]
+            # Find pages not yet processed for celebrities, with everything the workers need,
+            # so no page is looked up (or checked) again
+            pages = [
+                tuple(row)
+                for row in db.query(
+                    ImagePage.id, ImagePage.document_id, ImagePage.page_number, ImagePage.image_path,
+                ImagePage.content_sha256
+                )
+                .filter(~exists().where(Celebrity.image_page_id == ImagePage.id))
+                .limit(limit)
+                .all()
+            ]
+            page_ids = [page[0] for page in pages]
         
         total_celebrities = 0
         processed = 0
+        recognize = None
+        
+        if self.recognizer is not None:
+            # Local model: the faces of a chunk of pages are embedded together; only pages with an
+            # uncertain match go to Rekognition (below), and only when it's configured
+            remote = []
+            batch = self.recognizer.batch_size
+            for start in range(0, len(pages), batch):
+                chunk = []
+                for page in pages[start:start + batch]:
+                    if Path(page[3]).exists():
+                        chunk.append(page)
+                    else:
+                        logger.error(f"Image not found: {page[3]}")
+                        processed += 1
+                try:
+                    results = self.recognizer.recognize_batch([Path(page[3]) for page in chunk])
+                except Exception as e:
+                    logger.error(f"Error recognizing celebrities locally: {e}")
+                    results = [([], True)] * len(chunk)
+                for page, (celebrities, uncertain) in zip(chunk, results):
+                    if uncertain and self.enabled:
+                        remote.append(page)
+                        continue
+                    try:
+                        total_celebrities += self._process_celebrities_for_page(page, min_confidence, celebrities)
+                    except Exception as e:
+                        logger.error(f"Error processing celebrities for {page[0]}: {e}")
+                    processed += 1
+            pages = remote
+            recognize = self._rekognition_celebrities
         
-        for page_id in page_ids:
-            celebrities_found = self.process_celebrities(page_id, min_confidence)
-            total_celebrities += celebrities_found
-            processed += 1
+        # Each page is an HTTPS round-trip; keep several in flight (the rate limiter keeps the
+        # combined call rate under REKOGNITION_MAX_TPS). Results are tallied on this thread.
+        workers = max(1, min(Config.REKOGNITION_CONCURRENCY, len(pages)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rekognition") as executor:
+            futures = {
+                executor.submit(
+                    self._process_celebrities_for_page, page, min_confidence, recognize=recognize
+                ): page[0]
+                for page in pages
+            }
+            for future in as_completed(futures):
+                try:
+                    total_celebrities += future.result()
+                except Exception as e:
+                    logger.error(f"Error processing celebrities for {futures[future]}: {e}")
+                processed += 1
         
         return {
             'processed': processed,
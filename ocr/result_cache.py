@@ -0,0 +1,136 @@
+"""On-disk cache of OCR results, keyed by image content + OCR settings.
+
+Re-running the pipeline over the same pages (re-indexing, parameter sweeps) turns
+each repeat page into a small file read instead of a full multi-variant OCR run.
+
+Entries live at OCR_CACHE_DIR/<key[:2]>/<key[2:]>.json.zst (or .json.gz without
+zstandard) and are written atomically, so concurrent workers can share the dir.
+"""
+import functools
+import gzip
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+try:
+    from blake3 import blake3 as _hasher
+except ImportError:  # stdlib fallback; still much faster than sha256
+    import hashlib
+    _hasher = functools.partial(hashlib.blake2b, digest_size=32)
+
+try:
+    import zstandard
+    _EXT = ".json.zst"
+    _compress = zstandard.ZstdCompressor(level=3).compress
+    _decompress = zstandard.ZstdDecompressor().decompress
+except ImportError:
+    zstandard = None
+    _EXT = ".json.gz"
+    _compress = functools.partial(gzip.compress, compresslevel=3)
+    _decompress = gzip.decompress
+
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+    _dumps = lambda obj: json.dumps(obj, separators=(",", ":")).encode("utf-8")
+    _loads = json.loads
+
+# Settings that change OCR output are part of the key; purely performance knobs are not,
+# so tuning workers/batching doesn't invalidate the cache.
+_KEY_PREFIXES = ("OCR_", "PADDLE_", "EASYOCR_", "TESSERACT_")
+_NOT_IN_KEY = {
+    "OCR_CACHE", "OCR_CACHE_DIR", "OCR_VARIANT_WORKERS", "OCR_CONCURRENCY", "OCR_BATCH_SIZE", "OCR_GPU",
+    "OCR_TRT_CACHE_DIR", "PADDLE_ENABLE_HPI", "PADDLE_HPI_BACKEND", "TESSERACT_TIMEOUT",
+}
+
+
+def _settings() -> Dict:
+    return {
+        name: str(value) if isinstance(value, Path) else value
+        for name, value in sorted(vars(Config).items())
+        if name.startswith(_KEY_PREFIXES) and name not in _NOT_IN_KEY
+    }
+
+
+def cache_key(image_path: Path, engine) -> str:
+    h = _hasher()
+    with open(image_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    params = {
+        "engine": engine.__class__.__name__,
+        "languages": getattr(engine, "languages", None),
+        "settings": _settings(),
+    }
+    h.update(json.dumps(params, sort_keys=True, default=str).encode("utf-8"))
+    return h.hexdigest()
+
+
+def _entry_path(key: str) -> Path:
+    return Config.OCR_CACHE_DIR / key[:2] / f"{key[2:]}{_EXT}"
+
+
+def load(key: str) -> Optional[Dict]:
+    path = _entry_path(key)
+    try:
+        return _loads(_decompress(path.read_bytes()))
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable OCR cache entry {path}: {e}")
+        return None
+
+
+def store(key: str, result: Dict) -> None:
+    path = _entry_path(key)
+    tmp = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(_compress(_dumps(result)))
+        os.replace(tmp, path)
+    except Exception as e:
+        logger.warning(f"Could not write OCR cache entry {path}: {e}")
+        if tmp and os.path.exists(tmp):
+            os.unlink(tmp)
+
+
+def lookup(engine, image_path: Path) -> Tuple[Optional[str], Optional[Dict]]:
+    """(key, cached result or None); key is None when caching is off or the file can't be read."""
+    if not Config.OCR_CACHE:
+        return None, None
+    try:
+        key = cache_key(image_path, engine)
+    except OSError:
+        return None, None
+    return key, load(key)
+
+
+def remember(key: Optional[str], result: Dict) -> None:
+    # Failures may be transient; only cache real runs.
+    if key and "error" not in (result.get("metadata") or {}):
+        store(key, result)
+
+
+def cached(extract_text: Callable) -> Callable:
+    """Wrap an engine's extract_text(image_path, base_img=None) with the result cache."""
+    @functools.wraps(extract_text)
+    def wrapper(self, image_path: Path, *args, **kwargs) -> Dict:
+        key, hit = lookup(self, image_path)
+        if hit is not None:
+            return hit
+        result = extract_text(self, image_path, *args, **kwargs)
+        remember(key, result)
+        return result
+    return wrapper
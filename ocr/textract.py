@@ -1,9 +1,15 @@
 """AWS Textract OCR engine for high-accuracy text extraction."""
 import os
+import mmap
 import logging
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Dict, List, Optional
 
+from config import Config
+
 # Load .env file for AWS credentials
 try:
     from dotenv import load_dotenv
@@ -16,12 +22,107 @@ logger = logging.getLogger(__name__)
 # Check if boto3 is available
 try:
     import boto3
+    from botocore.config import Config as BotoConfig
     from botocore.exceptions import ClientError, NoCredentialsError
     BOTO3_AVAILABLE = True
 except ImportError:
     BOTO3_AVAILABLE = False
     logger.warning("boto3 not installed. AWS Textract features disabled.")
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def use_orjson_for_botocore():
+    """
+    Decode JSON-protocol responses (Textract, Rekognition) with orjson instead of the stdlib.
+
+    A multi-thousand-block Textract page is several MB of JSON; orjson decodes it from bytes in a
+    fraction of the time. Anything orjson rejects goes through botocore's own decoder unchanged.
+    The patch is process-wide, so it is only applied when AWS_ORJSON_PARSER is on (see _get_client).
+    """
+    if orjson is None:
+        return
+    from botocore import parsers
+    
+    original = getattr(parsers.BaseJSONParser, '_parse_body_as_json', None)
+    if original is None or getattr(original, '_orjson', False):
+        return
+    
+    def _parse_body_as_json(self, body_contents):
+        if not body_contents:
+            return {}
+        try:
+            return orjson.loads(body_contents)
+        except orjson.JSONDecodeError:
+            return original(self, body_contents)
+    
+    _parse_body_as_json._orjson = True
+    parsers.BaseJSONParser._parse_body_as_json = _parse_body_as_json
+
+
+# Shared read-only stand-in for a block's missing Geometry / BoundingBox
+_EMPTY: Dict = {}
+
+# Outcome of the IAM-role credential probe (an STS call), reused across engine instances
+_ROLE_CHECK_TTL = 300  # seconds
+_role_check = {'checked_at': 0.0, 'value': None}
+_role_check_lock = threading.Lock()
+
+# One client (and HTTPS connection pool) per credentials/region for the whole process, shared by
+# every TextractEngine and page worker thread.
+_clients: Dict[tuple, object] = {}
+_clients_lock = threading.Lock()
+
+
+def _get_client(access_key: Optional[str], secret_key: Optional[str], region: str):
+    key = (access_key, secret_key, region)
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                if Config.AWS_ORJSON_PARSER:
+                    use_orjson_for_botocore()
+                # No explicit keys: boto3 falls back to the IAM (ECS task) role
+                credentials = (
+                    dict(aws_access_key_id=access_key, aws_secret_access_key=secret_key)
+                    if access_key and secret_key else {}
+                )
+                client = _clients[key] = boto3.client(
+                    'textract',
+                    region_name=region,
+                    # Default pool is 10 connections; concurrent page workers would queue on it.
+                    config=BotoConfig(
+                        max_pool_connections=64,
+                        tcp_keepalive=True,
+                        connect_timeout=3,
+                        read_timeout=60,
+                        retries={'mode': 'adaptive', 'max_attempts': 8},
+                    ),
+                    **credentials,
+                )
+    return client
+
+
+@contextmanager
+def mapped_file(path: Path):
+    """
+    A file's contents as a read-only buffer for an AWS API call's Bytes parameter.
+    
+    The file is memory-mapped rather than read into a bytes object; botocore base64-encodes
+    straight from the mapping, so the raw image is never copied onto the Python heap.
+    The buffer is only valid inside the `with` block.
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''  # empty files can't be mapped
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
 
 class TextractEngine:
     """
@@ -56,12 +157,18 @@ class TextractEngine:
             return True
         
         # Otherwise, try to use IAM role credentials (for ECS Fargate)
-        # boto3 will automatically use the task role if available
+        # boto3 will automatically use the task role if available.
+        # The STS round-trip result is shared by every engine built in the next few minutes.
+        with _role_check_lock:
+            now = time.monotonic()
+            if _role_check['value'] is None or now - _role_check['checked_at'] >= _ROLE_CHECK_TTL:
+                _role_check['value'] = self._check_role_credentials()
+                _role_check['checked_at'] = now
+            return _role_check['value']
+    
+    def _check_role_credentials(self) -> bool:
         # We need to actually try to create a client to test if credentials work
         try:
-            import boto3
-            from botocore.exceptions import NoCredentialsError, ClientError
-            
             # Try to create a client and make a lightweight API call to verify credentials
             # Use STS get-caller-identity as it's a simple, fast call
             sts_client = boto3.client('sts', region_name=os.environ.get('AWS_DEFAULT_REGION', 'us-east-1'))
@@ -79,26 +186,14 @@ class TextractEngine:
     
     @property
     def client(self):
-        """Lazy load Textract client."""
+        """Lazy load Textract client (shared process-wide; boto3 clients are thread-safe)."""
         if self._client is None and self.enabled:
             # Use explicit credentials if provided, otherwise use IAM role (for ECS)
-            access_key = os.environ.get('AWS_ACCESS_KEY_ID')
-            secret_key = os.environ.get('AWS_SECRET_ACCESS_KEY')
-            
-            if access_key and secret_key:
-                # Explicit credentials provided
-                self._client = boto3.client(
-                    'textract',
-                    aws_access_key_id=access_key,
-                    aws_secret_access_key=secret_key,
-                    region_name=os.environ.get('AWS_DEFAULT_REGION', 'us-east-1')
-                )
-            else:
-                # Use IAM role credentials (boto3 will automatically use task role)
-                self._client = boto3.client(
-                    'textract',
-                    region_name=os.environ.get('AWS_DEFAULT_REGION', 'us-east-1')
-                )
+            self._client = _get_client(
+                os.environ.get('AWS_ACCESS_KEY_ID'),
+                os.environ.get('AWS_SECRET_ACCESS_KEY'),
+                os.environ.get('AWS_DEFAULT_REGION', 'us-east-1')
+            )
         return self._client
     
     def extract_text(self, image_path: Path) -> Dict:
@@ -128,10 +223,25 @@ class TextractEngine:
             }
         
         try:
-            # Read image bytes
-            with open(image_path, 'rb') as f:
-                image_bytes = f.read()
-            
+            # Map image bytes (extract_text_from_bytes handles its own API errors)
+            with mapped_file(image_path) as image_bytes:
+                return self.extract_text_from_bytes(image_bytes, image_path)
+        except Exception as e:
+            logger.exception(f"Error reading {image_path} for Textract: {e}")
+            return self._error_result(str(e))
+    
+    def extract_text_from_bytes(self, image_bytes: bytes, image_path: Path) -> Dict:
+        """
+        Extract text from already-encoded image bytes (PNG/JPEG).
+        
+        Lets callers that render pages in memory skip the disk round-trip.
+        image_path is only used for logging/metadata.
+        """
+        if not self.enabled:
+            logger.error("Textract not enabled - missing credentials or boto3")
+            return self._error_result("Textract not configured")
+        
+        try:
             # Call Textract DetectDocumentText API
             logger.info(f"Calling Textract for {image_path.name}")
             response = self.client.detect_document_text(
@@ -160,44 +270,46 @@ class TextractEngine:
         # Separate lines and words
         lines = []
         word_boxes = []
-        confidences = []
+        append_word = word_boxes.append
+        confidence_sum = 0.0
         
         # Get image dimensions for coordinate conversion
         # Textract returns normalized coordinates (0-1)
         # We'll store them as-is and let the frontend handle scaling
         
+        # One pass; each block's Geometry/BoundingBox is looked up once (pages can hold thousands of words)
         for block in blocks:
             block_type = block.get('BlockType')
+            if block_type != 'WORD':
+                if block_type == 'LINE':
+                    text = block.get('Text')
+                    if text:
+                        lines.append(text)
+                continue
             
-            if block_type == 'LINE':
-                text = block.get('Text', '')
-                if text:
-                    lines.append(text)
+            text = block.get('Text')
+            if not text:
+                continue
+            confidence = block.get('Confidence', 0.0) / 100.0  # Convert to 0-1
+            confidence_sum += confidence
             
-            elif block_type == 'WORD':
-                text = block.get('Text', '')
-                confidence = block.get('Confidence', 0.0) / 100.0  # Convert to 0-1
-                
-                if text:
-                    # Get bounding box (normalized 0-1 coordinates)
-                    bbox = block.get('Geometry', {}).get('BoundingBox', {})
-                    
-                    word_boxes.append({
-                        'text': text,
-                        'x': bbox.get('Left', 0),
-                        'y': bbox.get('Top', 0),
-                        'width': bbox.get('Width', 0),
-                        'height': bbox.get('Height', 0),
-                        'confidence': confidence,
-                        # Store polygon for precise highlighting
-                        'polygon': block.get('Geometry', {}).get('Polygon', [])
-                    })
-                    
-                    confidences.append(confidence)
+            # Get bounding box (normalized 0-1 coordinates)
+            geometry = block.get('Geometry') or _EMPTY
+            bbox = geometry.get('BoundingBox') or _EMPTY
+            append_word({
+                'text': text,
+                'x': bbox.get('Left', 0),
+                'y': bbox.get('Top', 0),
+                'width': bbox.get('Width', 0),
+                'height': bbox.get('Height', 0),
+                'confidence': confidence,
+                # Store polygon for precise highlighting
+                'polygon': geometry.get('Polygon', [])
+            })
         
         # Combine lines into full text
         full_text = ' '.join(lines)
-        avg_confidence = sum(confidences) / len(confidences) if confidences else 0.0
+        avg_confidence = confidence_sum / len(word_boxes) if word_boxes else 0.0
         
         logger.info(f"Textract extracted {len(word_boxes)} words, "
                    f"{len(lines)} lines, confidence: {avg_confidence:.2f}")
@@ -242,13 +354,11 @@ class TextractEngine:
             feature_types = ['TABLES', 'FORMS']
         
         try:
-            with open(image_path, 'rb') as f:
-                image_bytes = f.read()
-            
-            response = self.client.analyze_document(
-                Document={'Bytes': image_bytes},
-                FeatureTypes=feature_types
-            )
+            with mapped_file(image_path) as image_bytes:
+                response = self.client.analyze_document(
+                    Document={'Bytes': image_bytes},
+                    FeatureTypes=feature_types
+                )
             
             # Parse basic text
             result = self._parse_response(response, image_path)
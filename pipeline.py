@@ -4,7 +4,6 @@ import logging
 from pathlib import Path
 from typing import List
 from tqdm import tqdm
-from PIL import Image
 
 from config import Config
 from database import init_db, get_db
@@ -76,13 +75,7 @@ class IngestionPipeline:
                     image_paths = [file_path]
                 
                 # Step 4: Store image pages
-                for page_num, image_path in enumerate(image_paths, start=1):
-                    img = Image.open(image_path)
-                    width, height = img.size
-                    
-                    page_id = self.storage.store_image_page(
-                        doc_id, page_num, image_path, width, height
-                    )
+                self.storage.store_image_pages(doc_id, image_paths)
                 
                 # Step 5: Process OCR for all pages
                 logger.info(f"Processing OCR for document {doc_id}")
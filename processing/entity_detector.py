@@ -6,7 +6,7 @@ from datetime import datetime
 import logging
 from dateutil import parser as date_parser
 from config import Config
-from database import get_db
+from database import bulk_store, get_db
 from models import Entity, OCRText
 
 logger = logging.getLogger(__name__)
@@ -197,25 +197,24 @@ class EntityDetector:
                 logger.error(f"OCR text {ocr_text_id} not found")
                 return 0
             
-            saved = 0
-            for entity_data in entities:
-                entity_id = str(uuid.uuid4())
-                entity = Entity(
-                    id=entity_id,
-                    ocr_text_id=ocr_text_id,
-                    document_id=ocr_text.document_id,
-                    page_number=ocr_text.page_number,
-                    entity_type=entity_data['type'],
-                    entity_value=entity_data['value'],
-                    normalized_value=entity_data.get('normalized_value', entity_data['value']),
-                    bbox_x=entity_data.get('bbox_x', 0.0),
-                    bbox_y=entity_data.get('bbox_y', 0.0),
-                    bbox_width=entity_data.get('bbox_width', 0.0),
-                    bbox_height=entity_data.get('bbox_height', 0.0),
-                    confidence=1.0  # Rule-based detection
-                )
-                db.add(entity)
-                saved += 1
+            rows = [
+                {
+                    "id": str(uuid.uuid4()),
+                    "ocr_text_id": ocr_text_id,
+                    "document_id": ocr_text.document_id,
+                    "page_number": ocr_text.page_number,
+                    "entity_type": entity_data['type'],
+                    "entity_value": entity_data['value'],
+                    "normalized_value": entity_data.get('normalized_value', entity_data['value']),
+                    "bbox_x": entity_data.get('bbox_x', 0.0),
+                    "bbox_y": entity_data.get('bbox_y', 0.0),
+                    "bbox_width": entity_data.get('bbox_width', 0.0),
+                    "bbox_height": entity_data.get('bbox_height', 0.0),
+                    "confidence": 1.0,  # Rule-based detection
+                }
+                for entity_data in entities
+            ]
+            saved = bulk_store(db, Entity, rows)
             
             db.commit()
             logger.info(f"Saved {saved} entities for OCR text {ocr_text_id}")
@@ -0,0 +1,95 @@
+"""Build the face gallery used by local celebrity recognition (CELEBRITY_BACKEND=local).
+
+Expects one directory per identity, named after the person, holding reference photos:
+
+    gallery/
+        Jane Doe/
+            1.jpg
+            2.jpg
+        John Roe/
+            portrait.png
+
+The largest face in each photo is embedded with the configured InsightFace model; an identity's
+embeddings are averaged and L2-normalized, then written to FACE_GALLERY_PATH (or --out).
+
+Usage:
+    python scripts/build_face_gallery.py path/to/gallery [--out data/face_gallery.npz]
+"""
+import argparse
+import sys
+from pathlib import Path
+import logging
+
+# Allow running as a script from /app/scripts without requiring PYTHONPATH=/app
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import cv2
+import numpy as np
+
+from config import Config
+from ocr.face_recognizer import INSIGHTFACE_AVAILABLE, LocalFaceRecognizer
+
+logging.basicConfig(level=getattr(logging, Config.LOG_LEVEL))
+logger = logging.getLogger(__name__)
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".webp", ".bmp"}
+
+
+def _largest_face_crop(recognizer: LocalFaceRecognizer, image_path: Path):
+    image = cv2.imread(str(image_path), cv2.IMREAD_COLOR)
+    if image is None:
+        logger.warning(f"Could not read {image_path}")
+        return None
+    bboxes, crops = recognizer.detect_faces(image)
+    if not crops:
+        logger.warning(f"No face found in {image_path}")
+        return None
+    areas = (bboxes[:, 2] - bboxes[:, 0]) * (bboxes[:, 3] - bboxes[:, 1])
+    return crops[int(areas.argmax())]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("gallery_dir", type=Path)
+    parser.add_argument("--out", type=Path, default=Config.FACE_GALLERY_PATH)
+    args = parser.parse_args()
+
+    if not INSIGHTFACE_AVAILABLE:
+        logger.error("insightface is not installed (pip install insightface onnxruntime-gpu)")
+        return 1
+
+    # Only detection and embedding are used here, so the (not yet written) gallery isn't loaded
+    recognizer = LocalFaceRecognizer(gallery_path=args.out)
+
+    names, embeddings = [], []
+    for person_dir in sorted(p for p in args.gallery_dir.iterdir() if p.is_dir()):
+        crops = [
+            crop for crop in (
+                _largest_face_crop(recognizer, path)
+                for path in sorted(person_dir.iterdir())
+                if path.suffix.lower() in IMAGE_SUFFIXES
+            )
+            if crop is not None
+        ]
+        if not crops:
+            logger.warning(f"Skipping {person_dir.name}: no usable photos")
+            continue
+        mean = recognizer.embed(crops).mean(axis=0)
+        names.append(person_dir.name)
+        embeddings.append(mean / max(np.linalg.norm(mean), 1e-12))
+        logger.info(f"{person_dir.name}: {len(crops)} faces")
+
+    if not names:
+        logger.error(f"No identities found under {args.gallery_dir}")
+        return 1
+
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    np.savez(args.out, names=np.array(names), embeddings=np.stack(embeddings).astype(np.float32))
+    logger.info(f"Wrote {len(names)} identities to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
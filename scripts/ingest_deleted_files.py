@@ -34,7 +34,6 @@ from ingestion.pdf_converter import pdf_to_images, is_pdf
 from ocr.processor import OCRProcessor
 from processing.text_processor import TextProcessor
 from search.indexer import SearchIndexer
-from PIL import Image
 from tqdm import tqdm
 
 logging.basicConfig(
@@ -165,13 +164,7 @@ def ingest_deleted_files(directory: Path, skip_existing: bool = True, with_ocr:
             
             # Store image pages
             logger.info(f"  Storing {len(image_paths)} image pages...")
-            for page_num, image_path in enumerate(image_paths, start=1):
-                img = Image.open(image_path)
-                width, height = img.size
-                
-                page_id = storage.store_image_page(
-                    doc_id, page_num, image_path, width, height
-                )
+            storage.store_image_pages(doc_id, image_paths)
             
             if with_ocr:
                 # Process OCR using configured OCR engine
@@ -119,12 +119,7 @@ def ingest(bucket: str, prefix: str, *, collection: str = "deleted", skip_existi
             else:
                 image_paths = [local_path]
 
-            from PIL import Image
-
-            for page_num, image_path in enumerate(image_paths, start=1):
-                img = Image.open(image_path)
-                width, height = img.size
-                storage.store_image_page(doc_id, page_num, image_path, width, height)
+            storage.store_image_pages(doc_id, image_paths)
 
             counts["processed"] += 1
         except Exception as e:
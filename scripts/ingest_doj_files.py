@@ -34,7 +34,6 @@ from ingestion.pdf_converter import pdf_to_images, is_pdf
 from ocr.processor import OCRProcessor
 from processing.text_processor import TextProcessor
 from search.indexer import SearchIndexer
-from PIL import Image
 from tqdm import tqdm
 
 logging.basicConfig(
@@ -143,7 +142,8 @@ async def ingest_files(skip_existing: bool = True):
             if is_pdf(file_path):
                 logger.info(f"  Converting PDF to images...")
                 images_dir = temp_dir / f"{doc_id}_images"
-                image_paths = pdf_to_images(file_path, images_dir)
+                # Textract's internal resolution is ~200 DPI; rendering at 300 only adds bytes.
+                image_paths = pdf_to_images(file_path, images_dir, dpi=200)
                 logger.info(f"  Generated {len(image_paths)} page images")
             else:
                 # Single image file
@@ -151,13 +151,7 @@ async def ingest_files(skip_existing: bool = True):
             
             # Store image pages
             logger.info(f"  Storing {len(image_paths)} image pages...")
-            for page_num, image_path in enumerate(image_paths, start=1):
-                img = Image.open(image_path)
-                width, height = img.size
-                
-                page_id = storage.store_image_page(
-                    doc_id, page_num, image_path, width, height
-                )
+            storage.store_image_pages(doc_id, image_paths)
             
             # Process OCR using AWS Textract
             logger.info(f"  Running AWS Textract OCR...")
@@ -3,10 +3,12 @@
 Process all images for celebrity detection.
 """
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from config import Config
 from database import get_db
 from models import ImagePage, Celebrity, ImageLabel
 from ocr.rekognition import RekognitionProcessor
@@ -17,7 +19,7 @@ def process_all_celebrities(min_confidence=90.0):
     
     processor = RekognitionProcessor()
     
-    if not processor.enabled:
+    if not processor.celebrities_enabled:
         print("❌ AWS Rekognition not configured!")
         print("Add AWS credentials to .env:")
         print("  AWS_ACCESS_KEY_ID=your_key")
@@ -64,19 +66,26 @@ def process_all_celebrities(min_confidence=90.0):
     processed_count = 0
     errors = []
     
-    for page_id in tqdm(unprocessed, desc="Processing images"):
-        try:
-            count = processor.process_celebrities(page_id, min_confidence)
-            total_celebrities += count
-            processed_count += 1
+    # Several pages in flight at once; the processor's rate limiter keeps calls under REKOGNITION_MAX_TPS
+    with ThreadPoolExecutor(max_workers=max(1, Config.REKOGNITION_CONCURRENCY)) as executor:
+        futures = {
+            executor.submit(processor.process_celebrities, page_id, min_confidence): page_id
+            for page_id in unprocessed
+        }
+        for future in tqdm(as_completed(futures), total=len(futures), desc="Processing images"):
+            page_id = futures[future]
+            try:
+                count = future.result()
+                total_celebrities += count
+                processed_count += 1
+                
+                if count > 0:
+                    tqdm.write(f"  ✓ {page_id}: Found {count} celebrities")
             
-            if count > 0:
-                tqdm.write(f"  ✓ {page_id}: Found {count} celebrities")
-        
-        except Exception as e:
-            error_msg = f"Error processing {page_id}: {str(e)}"
-            errors.append(error_msg)
-            tqdm.write(f"  ✗ {error_msg}")
+            except Exception as e:
+                error_msg = f"Error processing {page_id}: {str(e)}"
+                errors.append(error_msg)
+                tqdm.write(f"  ✗ {error_msg}")
     
     # Summary
     print(f"\n{'='*80}")
@@ -16,6 +16,8 @@ that already have *some* celebrity rows but still have unprocessed pages.
 """
 
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import List, Optional, Tuple
 
@@ -23,7 +25,7 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 import logging
 from tqdm import tqdm
-from sqlalchemy import func, select
+from sqlalchemy import exists, func, select
 
 from database import init_db, get_db
 from models import Document, ImagePage, Celebrity
@@ -58,16 +60,10 @@ def _get_unprocessed_volume2_page_ids(limit: int | None = None) -> List[str]:
 
         vol2_pages = select(ImagePage.id).where(ImagePage.document_id.in_(vol2_doc_ids))
 
-        processed_page_ids = (
-            select(Celebrity.image_page_id)
-            .where(Celebrity.image_page_id.in_(vol2_pages))
-            .distinct()
-        )
-
         q = (
             db.query(ImagePage.id)
             .filter(ImagePage.id.in_(vol2_pages))
-            .filter(~ImagePage.id.in_(processed_page_ids))
+            .filter(~exists().where(Celebrity.image_page_id == ImagePage.id))
             .order_by(ImagePage.id.asc())
         )
 
@@ -173,7 +169,7 @@ def main(min_confidence: float = 90.0, limit: int | None = None) -> int:
     init_db()
 
     processor = RekognitionProcessor()
-    if not processor.enabled:
+    if not processor.celebrities_enabled:
         logger.error(
             "AWS Rekognition not configured/enabled. "
             "Set AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY (and AWS_DEFAULT_REGION) and retry."
@@ -190,14 +186,23 @@ def main(min_confidence: float = 90.0, limit: int | None = None) -> int:
     total_found = 0
     errors = 0
 
-    for page_id in tqdm(page_ids, desc="Rekognition celebrities (VOL00002)"):
-        try:
+    # PyMuPDF isn't thread-safe, so page images are regenerated one at a time
+    render_lock = threading.Lock()
+
+    def process_page(page_id: str) -> int:
+        with render_lock:
             _ensure_page_image_exists(page_id)
-            found = processor.process_celebrities(page_id, min_confidence=min_confidence)
-            total_found += int(found or 0)
-        except Exception as e:
-            errors += 1
-            logger.error(f"Failed processing {page_id}: {e}")
+        return processor.process_celebrities(page_id, min_confidence=min_confidence)
+
+    # Several pages in flight at once; the processor's rate limiter keeps calls under REKOGNITION_MAX_TPS
+    with ThreadPoolExecutor(max_workers=max(1, Config.REKOGNITION_CONCURRENCY)) as executor:
+        futures = {executor.submit(process_page, page_id): page_id for page_id in page_ids}
+        for future in tqdm(as_completed(futures), total=len(futures), desc="Rekognition celebrities (VOL00002)"):
+            try:
+                total_found += int(future.result() or 0)
+            except Exception as e:
+                errors += 1
+                logger.error(f"Failed processing {futures[future]}: {e}")
 
     logger.info(
         f"Done. Pages processed={len(page_ids)} celebs_found={total_found} errors={errors}"
@@ -64,17 +64,24 @@ def run_loop():
 
     batch_size = _env_int("SUMMARIES_WORKER_BATCH_SIZE", 1)
     poll_seconds = _env_int("SUMMARIES_WORKER_POLL_SECONDS", 10)
+    # When nothing is due, back off exponentially (up to this cap) instead of
+    # hitting the DB every poll_seconds; reset as soon as work shows up.
+    max_idle_seconds = max(_env_int("SUMMARIES_WORKER_MAX_IDLE_SECONDS", 120), poll_seconds)
 
     logger.info(
-        f"Summaries worker starting (batch_size={batch_size}, poll_seconds={poll_seconds})"
+        f"Summaries worker starting (batch_size={batch_size}, poll_seconds={poll_seconds}, "
+        f"max_idle_seconds={max_idle_seconds})"
     )
 
+    idle_seconds = poll_seconds
     while True:
         try:
             doc_ids = get_next_document_ids(batch_size)
             if not doc_ids:
-                time.sleep(poll_seconds)
+                time.sleep(idle_seconds)
+                idle_seconds = min(idle_seconds * 2, max_idle_seconds)
                 continue
+            idle_seconds = poll_seconds
 
             for doc_id in doc_ids:
                 logger.info(f"Summarizing+tagging document_id={doc_id}")
@@ -0,0 +1,50 @@
+"""Which settings are part of the OCR result cache key."""
+import pytest
+
+from config import Config
+from ocr import result_cache
+
+# Performance knobs: changing them must not invalidate cached results
+PERFORMANCE_SETTINGS = {
+    "OCR_CACHE", "OCR_CACHE_DIR", "OCR_VARIANT_WORKERS", "OCR_CONCURRENCY", "OCR_BATCH_SIZE", "OCR_GPU",
+    "OCR_TRT_CACHE_DIR", "PADDLE_ENABLE_HPI", "PADDLE_HPI_BACKEND", "TESSERACT_TIMEOUT",
+}
+
+
+class _Engine:
+    languages = ["en"]
+
+
+@pytest.fixture
+def image(tmp_path):
+    path = tmp_path / "page.png"
+    path.write_bytes(b"\x89PNG not really")
+    return path
+
+
+def test_exclusion_list_is_pinned():
+    assert result_cache._NOT_IN_KEY == PERFORMANCE_SETTINGS
+
+
+def test_excluded_settings_exist():
+    # A renamed setting would otherwise silently drop out of the list and into the key
+    assert PERFORMANCE_SETTINGS <= set(vars(Config))
+
+
+def test_settings_leave_out_performance_knobs():
+    settings = result_cache._settings()
+    assert not PERFORMANCE_SETTINGS & set(settings)
+    assert {"OCR_SCALES", "OCR_DENOISE_QUALITY", "PADDLE_DROP_SCORE", "TESSERACT_PSM"} <= set(settings)
+
+
+@pytest.mark.parametrize("name", sorted(PERFORMANCE_SETTINGS - {"OCR_CACHE_DIR", "OCR_TRT_CACHE_DIR"}))
+def test_performance_knob_keeps_key(monkeypatch, image, name):
+    before = result_cache.cache_key(image, _Engine())
+    monkeypatch.setattr(Config, name, "changed")
+    assert result_cache.cache_key(image, _Engine()) == before
+
+
+def test_output_setting_changes_key(monkeypatch, image):
+    before = result_cache.cache_key(image, _Engine())
+    monkeypatch.setattr(Config, "OCR_EARLY_EXIT_MIN_CONF", 0.5)
+    assert result_cache.cache_key(image, _Engine()) != before
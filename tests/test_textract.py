@@ -0,0 +1,91 @@
+"""botocore's JSON parser with the opt-in orjson decoder (AWS_ORJSON_PARSER)."""
+import json
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("botocore")
+orjson = pytest.importorskip("orjson")
+
+from botocore import parsers
+from botocore.session import get_session
+
+from ocr import textract
+
+
+@pytest.fixture
+def orjson_calls(monkeypatch):
+    """Apply the patch for one test (undone afterwards) and record the bodies orjson decodes."""
+    monkeypatch.setattr(parsers.BaseJSONParser, "_parse_body_as_json",
+                        parsers.BaseJSONParser._parse_body_as_json)
+    calls = []
+
+    def loads(body):
+        calls.append(body)
+        return orjson.loads(body)
+
+    monkeypatch.setattr(textract, "orjson", SimpleNamespace(loads=loads, JSONDecodeError=orjson.JSONDecodeError))
+    textract.use_orjson_for_botocore()
+    return calls
+
+
+def _response(body: dict, status_code: int = 200) -> dict:
+    return {
+        "body": json.dumps(body).encode("utf-8"),
+        "headers": {"x-amzn-requestid": "req-1"},
+        "status_code": status_code,
+    }
+
+
+def _output_shape(operation: str):
+    return get_session().get_service_model("textract").operation_model(operation).output_shape
+
+
+def test_patch_is_applied_once(orjson_calls):
+    patched = parsers.BaseJSONParser._parse_body_as_json
+    assert patched._orjson
+    textract.use_orjson_for_botocore()
+    assert parsers.BaseJSONParser._parse_body_as_json is patched
+
+
+def test_decodes_textract_response(orjson_calls):
+    body = {
+        "DocumentMetadata": {"Pages": 1},
+        "Blocks": [
+            {"BlockType": "PAGE", "Id": "p1", "Relationships": [{"Type": "CHILD", "Ids": ["l1"]}]},
+            {
+                "BlockType": "LINE", "Id": "l1", "Text": "Flight log", "Confidence": 99.1,
+                "Geometry": {"BoundingBox": {"Left": 0.1, "Top": 0.2, "Width": 0.3, "Height": 0.04}},
+            },
+        ],
+        "DetectDocumentTextModelVersion": "1.0",
+    }
+
+    parsed = parsers.JSONParser().parse(_response(body), _output_shape("DetectDocumentText"))
+
+    assert len(orjson_calls) == 1
+    assert parsed["DocumentMetadata"] == {"Pages": 1}
+    assert [b["BlockType"] for b in parsed["Blocks"]] == ["PAGE", "LINE"]
+    assert parsed["Blocks"][1]["Text"] == "Flight log"
+    assert parsed["Blocks"][1]["Geometry"]["BoundingBox"]["Width"] == 0.3
+    assert parsed["ResponseMetadata"]["RequestId"] == "req-1"
+
+
+def test_decodes_error_response(orjson_calls):
+    body = {"__type": "ThrottlingException", "message": "Rate exceeded"}
+
+    parsed = parsers.JSONParser().parse(_response(body, status_code=400), _output_shape("DetectDocumentText"))
+
+    assert len(orjson_calls) == 1
+    assert parsed["Error"]["Code"] == "ThrottlingException"
+    assert parsed["Error"]["Message"] == "Rate exceeded"
+
+
+def test_falls_back_to_botocore_for_bodies_orjson_rejects(orjson_calls):
+    # The stdlib accepts NaN; orjson doesn't
+    body = b'{"DocumentMetadata": {"Pages": 1}, "Blocks": [{"BlockType": "WORD", "Confidence": NaN}]}'
+
+    parsed = parsers.JSONParser()._parse_body_as_json(body)
+
+    assert len(orjson_calls) == 1
+    assert parsed["DocumentMetadata"] == {"Pages": 1}